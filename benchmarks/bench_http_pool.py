@@ -0,0 +1,78 @@
+"""
+Benchmark pooled vs. unpooled HTTP requests against a local HTTP stand-in.
+
+Usage: python benchmarks/bench_http_pool.py [--requests 500] [--threads 4]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from job_aggregator.session import create_session
+
+PAGE = b'<html><head><title>Job</title></head><body>' + b'x' * 2048 + b'</body></html>'
+
+class JobBoardHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+    
+    def log_message(self, format, *args):
+        pass
+
+def start_server():
+    """
+    Start the local job board stand-in on a free port.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JobBoardHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run(get, url, total, threads):
+    """
+    Issue `total` GET requests and return requests per second.
+    """
+    started = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda i: get(f'{url}/jobs/{i}').content, range(total)))
+    else:
+        for i in range(total):
+            get(f'{url}/jobs/{i}').content
+    return total / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=1)
+    args = parser.parse_args()
+    
+    server = start_server()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    # Measure pooling alone, without the per-domain rate limiter
+    session = create_session({'HTTP_POOL_SIZE': max(args.threads, 10), 'RATE_LIMIT_ENABLED': False})
+    
+    unpooled = run(requests.get, url, args.requests, args.threads)
+    pooled = run(session.get, url, args.requests, args.threads)
+    server.shutdown()
+    
+    print(f"Requests: {args.requests}, threads: {args.threads}")
+    print(f"Without pooling: {unpooled:8.1f} req/s")
+    print(f"With pooling:    {pooled:8.1f} req/s ({pooled / unpooled:.1f}x)")
+
+if __name__ == '__main__':
+    main()
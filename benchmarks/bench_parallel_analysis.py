@@ -0,0 +1,52 @@
+"""
+Benchmark batch skill analysis on a process pool for growing worker counts.
+
+Scores one resume against a synthetic batch with `SkillsAnalyzer.analyze_batch`
+and reports jobs per second and the speedup over a single process.
+Usage: python benchmarks/bench_parallel_analysis.py [--jobs 10000] [--workers 1,2,4,8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_skill_matcher import make_documents, make_taxonomy
+
+from skills_analysis.analyzer import SkillsAnalyzer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=10000)
+    parser.add_argument('--workers', default=','.join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)))
+    parser.add_argument('--skills', type=int, default=1000, help='taxonomy size')
+    parser.add_argument('--chunk-size', type=int, default=256)
+    args = parser.parse_args()
+    
+    base = SkillsAnalyzer({})
+    skills = make_taxonomy(args.skills, base.tech_skills)
+    documents = make_documents(args.jobs, skills)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        resume_path = os.path.join(tmp, 'resume.txt')
+        with open(resume_path, 'w') as f:
+            f.write('Experienced engineer: ' + ', '.join(skills[::7]))
+        
+        print(f"Jobs: {args.jobs}, skills: {args.skills}, CPUs: {os.cpu_count()}")
+        print(f"{'workers':>8} {'seconds':>9} {'jobs/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in [int(n) for n in args.workers.split(',')]:
+            analyzer = SkillsAnalyzer({'ANALYSIS_WORKERS': workers, 'ANALYSIS_CHUNK_SIZE': args.chunk_size,
+                                       'RESUME_CACHE_ENABLED': False})
+            analyzer.tech_skills = skills
+            started = time.perf_counter()
+            analyzer.analyze_batch(resume_path, documents)
+            elapsed = time.perf_counter() - started
+            analyzer.close()
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {args.jobs / elapsed:>10.1f} {baseline / elapsed:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark skill extraction throughput for growing taxonomy sizes.
+
+Compares the previous per-skill regex loop with the compiled SkillMatcher.
+Usage: python benchmarks/bench_skill_matcher.py [--docs 200] [--sizes 40,1000,10000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from skills_analysis.analyzer import SkillsAnalyzer
+from skills_analysis.matcher import SkillMatcher
+
+FILLER = ('we are looking for an engineer to join our team and build reliable services '
+          'with modern tooling you will collaborate with product and design on features').split()
+
+def make_taxonomy(size, base_skills):
+    """
+    Extend the built-in skills with synthetic names up to `size` entries.
+    """
+    rng = random.Random(size)
+    skills = list(base_skills[:size])
+    syllables = ['ka', 'to', 'ri', 'zen', 'lux', 'ora', 'vex', 'dyn', 'qu', 'mo', 'sol', 'tri']
+    seen = {skill.lower() for skill in skills}
+    while len(skills) < size:
+        name = ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.2:
+            name += ' ' + ''.join(rng.choice(syllables) for _ in range(2))
+        if name not in seen:
+            seen.add(name)
+            skills.append(name.title())
+    return skills
+
+def make_documents(count, skills, words=300):
+    """
+    Generate job descriptions that mention a handful of taxonomy skills.
+    """
+    rng = random.Random(count)
+    documents = []
+    for _ in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(words)]
+        for skill in rng.sample(skills, min(8, len(skills))):
+            tokens.insert(rng.randrange(len(tokens)), skill)
+        documents.append(' '.join(tokens))
+    return documents
+
+def legacy_extract(skills, text):
+    """
+    The original extraction loop: one regex search per skill.
+    """
+    found = []
+    text_lower = text.lower()
+    for skill in skills:
+        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+        if re.search(pattern, text_lower):
+            found.append(skill)
+    return found
+
+def throughput(func, documents, budget):
+    """
+    Return documents per second, stopping early once `budget` seconds pass.
+    """
+    started = time.perf_counter()
+    done = 0
+    for document in documents:
+        func(document)
+        done += 1
+        if time.perf_counter() - started > budget:
+            break
+    return done / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--sizes', default='40,1000,10000')
+    parser.add_argument('--budget', type=float, default=5.0,
+                        help='maximum seconds spent per measurement')
+    args = parser.parse_args()
+    
+    base_skills = SkillsAnalyzer({}).tech_skills
+    print(f"{'skills':>8} {'build (ms)':>11} {'legacy docs/s':>14} {'compiled docs/s':>16} {'speedup':>8}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        skills = make_taxonomy(size, base_skills)
+        documents = make_documents(args.docs, skills)
+        
+        started = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build_ms = (time.perf_counter() - started) * 1000
+        
+        legacy = throughput(lambda text: legacy_extract(skills, text), documents, args.budget)
+        compiled = throughput(matcher.find, documents, args.budget)
+        print(f"{size:>8} {build_ms:>11.1f} {legacy:>14.1f} {compiled:>16.1f} {compiled / legacy:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark analyzer import time and first-call latency with and without spaCy.
+
+Each measurement runs in a fresh interpreter so nothing is cached.
+Usage: python benchmarks/bench_startup.py [--runs 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+CHILD = '''
+import json, sys, time
+sys.path.insert(0, {src!r})
+started = time.perf_counter()
+from skills_analysis.analyzer import SkillsAnalyzer
+imported = time.perf_counter()
+analyzer = SkillsAnalyzer({{'USE_SPACY': {use_spacy}}})
+analyzer._extract_skills("Senior Python developer with Docker and AWS experience")
+called = time.perf_counter()
+print(json.dumps({{'import': imported - started, 'first_call': called - imported,
+                  'spacy_loaded': 'spacy' in sys.modules}}))
+'''
+
+def measure(use_spacy):
+    """
+    Run one cold-start measurement in a subprocess.
+    """
+    code = CHILD.format(src=SRC, use_spacy=use_spacy)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"{'mode':<16} {'import (ms)':>12} {'first call (ms)':>16} {'spaCy loaded':>13}")
+    for use_spacy in (False, True):
+        runs = [measure(use_spacy) for _ in range(args.runs)]
+        best_import = min(run['import'] for run in runs) * 1000
+        best_call = min(run['first_call'] for run in runs) * 1000
+        mode = 'with spaCy' if use_spacy else 'keywords only'
+        print(f"{mode:<16} {best_import:>12.1f} {best_call:>16.1f} {str(runs[0]['spacy_loaded']):>13}")
+
+if __name__ == '__main__':
+    main()
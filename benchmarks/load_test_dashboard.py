@@ -0,0 +1,139 @@
+"""
+Load-test the dashboard API and report requests per second and latency percentiles.
+
+Without --url, seeds a temporary SQLite database and serves the app with
+the threaded Werkzeug server in this process. Point --url at a running
+dashboard (e.g. the gunicorn serve mode) to measure that instead.
+Usage: python benchmarks/load_test_dashboard.py [--rows 20000] [--concurrency 8] [--duration 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import requests
+
+ENDPOINTS = (
+    '/api/applications',
+    '/api/applications?status=interview&limit=100',
+    '/api/applications?company=Company%207&sort=date_applied&order=asc',
+    '/api/stats'
+)
+
+def start_server(rows, database_path):
+    """
+    Seed a database with synthetic applications and serve the app on a free port.
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from dashboard.app import create_app
+    from dashboard.models import db, JobApplication, rebuild_rollups
+    
+    app = create_app({'DATABASE_URL': f'sqlite:///{database_path}'})
+    statuses = ('applied', 'interview', 'rejected', 'offer')
+    sources = ('linkedin', 'indeed', 'stepstone')
+    started = datetime.now() - timedelta(minutes=rows)
+    with app.app_context():
+        db.session.execute(JobApplication.__table__.insert(), [{
+            'job_title': f'Job {n}',
+            'company': f'Company {n % 500}',
+            'status': statuses[n % len(statuses)],
+            'date_applied': started + timedelta(minutes=n),
+            'url': f'https://example.com/jobs/{n}',
+            'source': sources[n % len(sources)],
+            'skill_match': n % 100
+        } for n in range(rows)])
+        db.session.commit()
+        rebuild_rollups()
+    
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+    
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+def percentile(values, fraction):
+    """
+    Return the value at a fraction (0-1) of the sorted values.
+    """
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+def run(base_url, endpoints, concurrency, duration):
+    """
+    Hit the endpoints round-robin from `concurrency` threads for `duration` seconds.
+    """
+    latencies = {endpoint: [] for endpoint in endpoints}
+    errors = {endpoint: 0 for endpoint in endpoints}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def worker(offset):
+        session = requests.Session()
+        n = offset
+        while time.perf_counter() < deadline:
+            endpoint = endpoints[n % len(endpoints)]
+            n += 1
+            started = time.perf_counter()
+            try:
+                ok = session.get(base_url + endpoint, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    latencies[endpoint].append(elapsed)
+                else:
+                    errors[endpoint] += 1
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help="base URL of a running dashboard")
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+    
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            base_url = args.url.rstrip('/')
+        else:
+            server, base_url = start_server(args.rows, os.path.join(tmp, 'dashboard.db'))
+            print(f"Seeded {args.rows} applications")
+        
+        latencies, errors, elapsed = run(base_url, ENDPOINTS, args.concurrency, args.duration)
+        if server is not None:
+            server.shutdown()
+        
+        print(f"Concurrency: {args.concurrency}, duration: {elapsed:.1f}s")
+        print(f"{'endpoint':<66} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        all_latencies = []
+        for endpoint in ENDPOINTS:
+            values = latencies[endpoint]
+            all_latencies.extend(values)
+            if not values:
+                print(f"{endpoint:<66} {'-':>8} {'-':>8} {'-':>8} {errors[endpoint]:>7}")
+                continue
+            print(f"{endpoint:<66} {len(values) / elapsed:>8.1f} {percentile(values, 0.5) * 1000:>8.1f} "
+                  f"{percentile(values, 0.99) * 1000:>8.1f} {errors[endpoint]:>7}")
+        if all_latencies:
+            print(f"{'total':<66} {len(all_latencies) / elapsed:>8.1f} {percentile(all_latencies, 0.5) * 1000:>8.1f} "
+                  f"{percentile(all_latencies, 0.99) * 1000:>8.1f} {sum(errors.values()):>7}")
+
+if __name__ == '__main__':
+    main()
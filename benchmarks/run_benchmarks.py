@@ -0,0 +1,342 @@
+"""
+Benchmark every pipeline stage on a synthetic job corpus and flag regressions.
+
+Generates postings and resumes, then times aggregation against local stub
+sources, skill extraction, resume analysis, job store persistence and the
+dashboard API. Throughput, latency percentiles and peak traced memory of
+each stage are compared with a stored JSON baseline; the exit status is 1
+when a stage regressed by more than --threshold.
+Usage: python benchmarks/run_benchmarks.py [--jobs 1000] [--save-baseline] [--baseline benchmarks/baseline.json]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from load_test_dashboard import ENDPOINTS, percentile
+
+from job_aggregator.aggregator import JobAggregator
+from job_aggregator.connectors import Connector
+from skills_analysis.analyzer import SkillsAnalyzer
+from utils.helpers import save_job_data, load_job_data
+
+STAGES = ('aggregate', 'extract', 'analyze', 'persist', 'load', 'dashboard')
+SOURCES = ('linkedin', 'indeed', 'stepstone')
+TITLES = ('Python Developer', 'Data Engineer', 'Frontend Engineer', 'DevOps Engineer',
+          'Machine Learning Engineer', 'Backend Developer', 'Full Stack Developer')
+LOCATIONS = ('Berlin', 'Munich', 'Hamburg', 'Remote', 'London', 'Amsterdam')
+FILLER = ('we are looking for an engineer to join our team and build reliable services '
+          'with modern tooling you will collaborate with product and design on features').split()
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+def make_jobs(count, source, skills, words=80, seed=0):
+    """
+    Yield `count` synthetic postings for one source.
+    """
+    rng = random.Random(f'{source}-{seed}')
+    posted = datetime(2024, 1, 1)
+    for n in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(words)]
+        for skill in rng.sample(skills, 6):
+            tokens.insert(rng.randrange(len(tokens)), skill)
+        yield {
+            'title': rng.choice(TITLES),
+            'company': f'Company {rng.randrange(1000)}',
+            'location': rng.choice(LOCATIONS),
+            'url': f'https://{source}.example.com/jobs/{seed}-{n}',
+            'posted_at': (posted + timedelta(minutes=n)).isoformat(),
+            'description': ' '.join(tokens)
+        }
+
+def make_resumes(directory, count, skills):
+    """
+    Write `count` plain-text resumes and return their paths.
+    """
+    rng = random.Random(count)
+    paths = []
+    for n in range(count):
+        path = os.path.join(directory, f'resume_{n}.txt')
+        with open(path, 'w') as f:
+            f.write(f"Candidate {n}\nSoftware engineer with experience in "
+                    + ', '.join(rng.sample(skills, 10)) + '.\n' + ' '.join(rng.choice(FILLER) for _ in range(200)))
+        paths.append(path)
+    return paths
+
+class StubConnector(Connector):
+    """
+    Connector that serves generated postings instead of querying a job board.
+    """
+    def __init__(self, config, name, per_search, skills):
+        super().__init__(config)
+        self.name = name
+        self.per_search = per_search
+        self.skills = skills
+        self.searches = 0
+    
+    def search(self, title, location, radius, since=None):
+        return list(self.iter_search(title, location, radius))
+    
+    def iter_search(self, title, location, radius, since=None):
+        self.searches += 1
+        yield from make_jobs(self.per_search, self.name, self.skills, seed=self.searches)
+
+def timed(func, *args, **kwargs):
+    """
+    Call `func` and return its result and the elapsed seconds.
+    """
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+def run_stage(func, trace_memory):
+    """
+    Run one stage and summarize its throughput, latency and peak memory.
+    
+    `func` returns the number of items processed and one latency per
+    operation. Throughput counts only the timed operations, so setup such
+    as seeding the dashboard database is left out; peak memory covers the
+    whole stage.
+    """
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    items, latencies = func()
+    elapsed = sum(latencies)
+    peak = 0
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        'items': items,
+        'seconds': round(elapsed, 4),
+        'throughput': round(items / elapsed, 2) if elapsed else 0,
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'peak_mb': round(peak / (1024 * 1024), 2)
+    }
+
+class Corpus:
+    """
+    State shared by the stages of one benchmark run.
+    """
+    def __init__(self, args, directory):
+        self.args = args
+        self.directory = directory
+        self.config = {
+            'JOB_SOURCES': [],
+            'SEARCH_CONCURRENT': True,
+            'SOURCE_TIMEOUT': 3600,
+            'RATE_LIMIT_ENABLED': False,
+            'PAGE_CACHE_ENABLED': False,
+            'DEDUP_PATH': os.path.join(directory, 'dedup.db'),
+            'RESUME_CACHE_PATH': os.path.join(directory, 'resume_cache.db'),
+            'JOB_STORE_PATH': os.path.join(directory, 'jobs.db'),
+            'DATABASE_URL': f"sqlite:///{os.path.join(directory, 'dashboard.db')}"
+        }
+        self.analyzer = SkillsAnalyzer(self.config)
+        self.skills = self.analyzer.tech_skills
+        self.jobs = None
+    
+    def get_jobs(self):
+        """
+        Return the corpus, generating it when the aggregate stage was skipped.
+        """
+        if self.jobs is None:
+            per_source = -(-self.args.jobs // len(SOURCES))
+            self.jobs = [dict(job, source=source) for source in SOURCES
+                         for job in make_jobs(per_source, source, self.skills)][:self.args.jobs]
+        return self.jobs
+    
+    def aggregate(self):
+        args = self.args
+        per_search = max(-(-args.jobs // (args.searches * len(SOURCES))), 1)
+        aggregator = JobAggregator(self.config)
+        aggregator.sources = {name: StubConnector(self.config, name, per_search, self.skills)
+                              for name in SOURCES}
+        jobs = []
+        latencies = []
+        for n in range(args.searches):
+            # Keep the per-source progress lines out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                found, seconds = timed(aggregator.search_jobs, TITLES[n % len(TITLES)], 'Berlin', 25)
+            jobs.extend(found)
+            latencies.append(seconds)
+        self.jobs = jobs
+        return len(jobs), latencies
+    
+    def extract(self):
+        latencies = []
+        for job in self.get_jobs():
+            latencies.append(timed(self.analyzer._extract_skills, job['description'])[1])
+        return len(latencies), latencies
+    
+    def analyze(self):
+        resumes = make_resumes(self.directory, self.args.resumes, self.skills)
+        jobs = self.get_jobs()
+        latencies = []
+        for n in range(min(self.args.analyze, len(jobs))):
+            latencies.append(timed(self.analyzer.analyze_resume, resumes[n % len(resumes)],
+                                   jobs[n]['description'])[1])
+        return len(latencies), latencies
+    
+    def persist(self):
+        jobs = self.get_jobs()
+        path = self.config['JOB_STORE_PATH']
+        size = self.args.batch_size
+        latencies = [timed(save_job_data, jobs[start:start + size], path)[1]
+                     for start in range(0, len(jobs), size)]
+        return len(jobs), latencies
+    
+    def load(self):
+        path = self.config['JOB_STORE_PATH']
+        if not os.path.exists(path):
+            self.persist()
+        items = 0
+        latencies = []
+        for source in SOURCES:
+            loaded, seconds = timed(load_job_data, path, source=source)
+            items += len(loaded)
+            latencies.append(seconds)
+        return items, latencies
+    
+    def dashboard(self):
+        from dashboard.app import create_app
+        from dashboard.models import db, JobApplication, rebuild_rollups
+        
+        statuses = ('applied', 'interview', 'rejected', 'offer')
+        jobs = self.get_jobs()[:self.args.applications]
+        started = datetime.now() - timedelta(minutes=len(jobs))
+        app = create_app(self.config)
+        with app.app_context():
+            db.session.execute(JobApplication.__table__.insert(), [{
+                'job_title': job['title'],
+                'company': job['company'],
+                'status': statuses[n % len(statuses)],
+                'date_applied': started + timedelta(minutes=n),
+                'url': job['url'],
+                'source': job['source'],
+                'skill_match': n % 100
+            } for n, job in enumerate(jobs)])
+            db.session.commit()
+            rebuild_rollups()
+        
+        client = app.test_client()
+        latencies = []
+        for n in range(self.args.requests):
+            response, seconds = timed(client.get, ENDPOINTS[n % len(ENDPOINTS)])
+            if response.status_code != 200:
+                raise RuntimeError(f"{ENDPOINTS[n % len(ENDPOINTS)]} returned {response.status_code}")
+            latencies.append(seconds)
+        with app.app_context():
+            db.engine.dispose()
+        return len(latencies), latencies
+
+def compare(results, baseline, threshold):
+    """
+    Return regressions of `results` against `baseline` as readable strings.
+    
+    A stage regresses when its throughput drops, or its p95 latency or
+    peak memory grows, by more than `threshold` (a fraction).
+    """
+    regressions = []
+    for stage, current in results['stages'].items():
+        previous = baseline['stages'].get(stage)
+        if not previous:
+            continue
+        if previous['throughput'] and current['throughput'] < previous['throughput'] * (1 - threshold):
+            regressions.append(f"{stage}: throughput {current['throughput']:.1f}/s "
+                               f"vs {previous['throughput']:.1f}/s")
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append(f"{stage}: p95 {current['p95_ms']:.2f} ms vs {previous['p95_ms']:.2f} ms")
+        if previous['peak_mb'] and current['peak_mb'] > previous['peak_mb'] * (1 + threshold):
+            regressions.append(f"{stage}: peak memory {current['peak_mb']:.1f} MB vs {previous['peak_mb']:.1f} MB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=1000, help='corpus size, e.g. 1000 to 1000000')
+    parser.add_argument('--stages', default=','.join(STAGES))
+    parser.add_argument('--searches', type=int, default=10, help='aggregator searches the corpus is split into')
+    parser.add_argument('--resumes', type=int, default=5)
+    parser.add_argument('--analyze', type=int, default=500, help='resume/job pairs analyzed')
+    parser.add_argument('--batch-size', type=int, default=1000, help='jobs per save_job_data call')
+    parser.add_argument('--applications', type=int, default=20000, help='dashboard rows seeded')
+    parser.add_argument('--requests', type=int, default=400, help='dashboard requests issued')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (lower overhead)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='tolerated slowdown, as a fraction')
+    args = parser.parse_args()
+    
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    
+    results = {
+        'meta': {
+            'jobs': args.jobs,
+            'traced_memory': not args.no_memory,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': datetime.now().isoformat(timespec='seconds')
+        },
+        'stages': {}
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Corpus(args, tmp)
+        print(f"Corpus: {args.jobs} jobs")
+        print(f"{'stage':<10} {'items':>9} {'seconds':>9} {'items/s':>11} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'p99 ms':>9} {'peak MB':>8}")
+        for stage in STAGES:
+            if stage not in stages:
+                continue
+            summary = run_stage(getattr(corpus, stage), not args.no_memory)
+            results['stages'][stage] = summary
+            print(f"{stage:<10} {summary['items']:>9} {summary['seconds']:>9.2f} {summary['throughput']:>11.1f} "
+                  f"{summary['p50_ms']:>9.3f} {summary['p95_ms']:>9.3f} {summary['p99_ms']:>9.3f} "
+                  f"{summary['peak_mb']:>8.1f}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        meta = baseline['meta']
+        if (meta['jobs'], meta['traced_memory']) != (args.jobs, not args.no_memory):
+            print(f"Baseline {args.baseline} was recorded with --jobs {meta['jobs']} and "
+                  f"traced_memory={meta['traced_memory']}; not comparing")
+        else:
+            regressions = compare(results, baseline, args.threshold)
+            if regressions:
+                print(f"Regressions against {args.baseline} (threshold {args.threshold:.0%}):")
+                for regression in regressions:
+                    print(f"  {regression}")
+            else:
+                print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    else:
+        print(f"No baseline at {args.baseline}; record one with --save-baseline")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
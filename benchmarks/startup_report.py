@@ -0,0 +1,116 @@
+"""
+Report the cold-start import cost of the entry points, like `python -X importtime`.
+
+Each entry point is imported in a fresh interpreter under `-X importtime`.
+The report shows the wall time of the whole process, the time spent
+importing, the packages that cost the most, and which heavy dependencies
+(Selenium, spaCy, Flask, SQLAlchemy, bs4, ...) were loaded up front.
+With --check it exits with status 1 if a CLI entry point imports a heavy
+dependency at startup instead of on first use.
+Usage: python benchmarks/startup_report.py [--runs 3] [--top 5] [--check]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Modules imported by `python src/main.py`, scheduled jobs and the daemon workers
+ENTRY_POINTS = [
+    'config.settings', 'main', 'pipeline.daemon', 'application_bot.bot',
+    'job_aggregator.aggregator', 'skills_analysis.analyzer', 'utils.job_index', 'dashboard.app'
+]
+
+# Entry points that must start without any heavy dependency
+LAZY_ENTRY_POINTS = ['config.settings', 'main', 'pipeline.daemon', 'application_bot.bot', 'utils.job_index']
+
+HEAVY_PACKAGES = ['selenium', 'playwright', 'spacy', 'flask', 'sqlalchemy', 'bs4', 'numpy', 'scipy', 'requests']
+
+# Separates the interpreter's own startup imports from the ones measured
+MARKER = '-- startup report --'
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output after the marker into (module, self_us, cumulative_us, depth).
+    """
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    entries = []
+    for line in lines:
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def measure(module):
+    """
+    Import a module in a fresh interpreter and return its import profile.
+    """
+    code = f'import sys; print({MARKER!r}, file=sys.stderr, flush=True); import {module}'
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=SRC,
+                            capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if output.returncode != 0:
+        error = output.stderr.strip().splitlines()
+        raise RuntimeError(f"importing {module} failed: {error[-1] if error else output.returncode}")
+    
+    entries = parse_importtime(output.stderr)
+    packages = {}
+    for name, self_us, _, _ in entries:
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return {
+        'module': module,
+        'wall_ms': wall * 1000,
+        'import_ms': sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000,
+        'modules': len(entries),
+        'packages_ms': {package: us / 1000 for package, us in packages.items()},
+        'heavy': [package for package in HEAVY_PACKAGES if package in packages]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS, help='modules to import (default: entry points)')
+    parser.add_argument('--runs', type=int, default=3, help='keep the fastest of this many runs')
+    parser.add_argument('--top', type=int, default=5, help='most expensive packages to list')
+    parser.add_argument('--json', help='also write the report to this file')
+    parser.add_argument('--check', action='store_true',
+                        help='exit with status 1 if a CLI entry point loads a heavy dependency')
+    args = parser.parse_args()
+    
+    report = []
+    print(f"{'module':<28} {'wall (ms)':>10} {'import (ms)':>12} {'modules':>8}  heavy dependencies")
+    for module in args.modules:
+        try:
+            runs = [measure(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module:<28} error: {e}")
+            continue
+        result = min(runs, key=lambda run: run['wall_ms'])
+        report.append(result)
+        print(f"{module:<28} {result['wall_ms']:>10.1f} {result['import_ms']:>12.1f} {result['modules']:>8}  "
+              f"{', '.join(result['heavy']) or '-'}")
+        top = sorted(result['packages_ms'].items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(' ' * 30 + '  '.join(f"{package} {ms:.1f}" for package, ms in top))
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.check:
+        eager = [(result['module'], result['heavy']) for result in report
+                 if result['module'] in LAZY_ENTRY_POINTS and result['heavy']]
+        for module, heavy in eager:
+            print(f"{module} imports {', '.join(heavy)} at startup")
+        if eager:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,27 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 
+// Subscribes to the backend's application change stream; the browser
+// reconnects on its own and resumes from the last event id it received.
+const useApplicationEvents = (limit = 10) => {
+  const [events, setEvents] = useState([]);
+
+  useEffect(() => {
+    const source = new EventSource('/api/events');
+    const handle = (kind) => (message) => {
+      const data = JSON.parse(message.data);
+      setEvents((previous) => [{ eventId: message.lastEventId, kind, ...data }, ...previous].slice(0, limit));
+    };
+    ['created', 'updated', 'deleted'].forEach((kind) => source.addEventListener(kind, handle(kind)));
+    return () => source.close();
+  }, [limit]);
+
+  return events;
+};
+
 const Dashboard = () => {
+  const recentEvents = useApplicationEvents();
+
   // Sample data for charts
   const applicationData = [
     { name: 'Jan', applications: 12 },
@@ -78,6 +98,23 @@ const Dashboard = () => {
           </div>
         </div>
       </div>
+      
+      <div className="bg-white p-6 rounded-lg shadow mt-6">
+        <h3 className="text-lg font-semibold mb-4">Live Activity</h3>
+        {recentEvents.length === 0 ? (
+          <p className="text-gray-500">Waiting for application updates...</p>
+        ) : (
+          <ul className="divide-y">
+            {recentEvents.map((event) => (
+              <li key={event.eventId} className="py-2">
+                <span className="font-semibold capitalize">{event.kind}</span>{' '}
+                {event.job_title ? `${event.job_title} at ${event.company}` : `application #${event.id}`}
+                {event.status ? ` - ${event.status}` : ''}
+              </li>
+            ))}
+          </ul>
+        )}
+      </div>
     </div>
   );
 };
@@ -1,33 +1,49 @@
 """
 Application bot module for automatically filling and submitting job applications.
 """
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
+import os
+
+from utils import metrics
+from utils.rate_limit import domain_of, get_rate_limiter
+
+from .pool import NEEDS_CAPTCHA, SUBMITTED, SUCCESS_PATTERN
+from .strategies import get_strategy_cache, identify_site, field_values
+from .waits import get_waiter, site_of, document_ready, network_idle, text_present, upload_complete
 
 class ApplicationBot:
     def __init__(self, config):
         self.config = config
         self.driver = None
+        # Set once the submit button of the current application was clicked
+        self.submit_attempted = False
+        # Shared condition-based waits with per-site learned timeouts
+        self.waiter = get_waiter(config)
+        # Field selectors learned per site, reused across applications
+        self.strategies = get_strategy_cache(config)
+        # Per-domain request budget shared with the job aggregator
+        self.rate_limiter = get_rate_limiter(config)
     
     def apply_to_job(self, job_url, resume_path, cover_letter_path=None):
         """
         Automatically apply to a job using the provided resume and cover letter.
         """
+        site = site_of(job_url)
+        self.submit_attempted = False
         try:
             # Initialize web driver
             self._init_web_driver()
             
-            # Navigate to job posting
+            # Navigate to job posting once the domain's rate limit allows
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(domain_of(job_url))
             self.driver.get(job_url)
             
-            # Wait for page to load
-            time.sleep(3)
+            # Wait until the page has loaded and gone quiet, not a fixed time
+            self.waiter.wait_for(self.driver, site, 'page_load', document_ready)
+            self.waiter.wait_for(self.driver, site, 'network_idle', network_idle())
             
             # Fill application form (simplified implementation)
-            result = self._fill_application_form(resume_path, cover_letter_path)
+            result = self._fill_application_form(resume_path, cover_letter_path, site)
             
             return result
             
@@ -37,35 +53,106 @@ class ApplicationBot:
         finally:
             if self.driver:
                 self.driver.quit()
+                self.driver = None
+            self.waiter.save()
+            self.strategies.save()
+    
+    def apply_batch(self, jobs, resume_path, cover_letter_path=None, workers=None):
+        """
+        Apply to many jobs in parallel with a pool of headless browsers.
+
+        Jobs may be URLs or job dicts with a 'url'. Returns one result dict
+        per job, in input order.
+        """
+        from .pool import ApplicationWorkerPool
+        
+        applications = [{
+            'url': job['url'] if isinstance(job, dict) else job,
+            'resume_path': resume_path,
+            'cover_letter_path': cover_letter_path,
+            'fields': self._applicant_fields()
+        } for job in jobs]
+        
+        pool = ApplicationWorkerPool(self.config, workers=workers)
+        return pool.run(applications)
+    
+    def _applicant_fields(self):
+        """
+        Return the configured applicant details that are set.
+        """
+        fields = {
+            'full_name': self.config.get('APPLICANT_NAME', ''),
+            'email': self.config.get('APPLICANT_EMAIL', ''),
+            'phone': self.config.get('APPLICANT_PHONE', '')
+        }
+        return {name: value for name, value in fields.items() if value}
     
     def _init_web_driver(self):
         """
         Initialize the web driver for automation.
         """
-        # Placeholder implementation
-        # In a real implementation, you would configure the actual web driver
+        # Selenium takes a while to import, so load it when a browser is first needed
+        from selenium import webdriver
+        
         print("Initializing web driver...")
-        # self.driver = webdriver.Chrome()  # Example for Chrome
+        browser = self.config.get('WEB_DRIVER', 'chrome').lower()
+        with metrics.span('browser_start', browser=browser):
+            if browser == 'firefox':
+                options = webdriver.FirefoxOptions()
+                if self.config.get('HEADLESS', True):
+                    options.add_argument('-headless')
+                self.driver = webdriver.Firefox(options=options)
+            else:
+                options = webdriver.ChromeOptions()
+                if self.config.get('HEADLESS', True):
+                    options.add_argument('--headless=new')
+                self.driver = webdriver.Chrome(options=options)
     
-    def _fill_application_form(self, resume_path, cover_letter_path):
+    def _fill_application_form(self, resume_path, cover_letter_path, site):
         """
         Fill the job application form with provided information.
         """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        
         # This is a simplified implementation
         # A real implementation would need to handle various form types
         print(f"Filling application form with resume: {resume_path}")
-        if cover_letter_path:
+        self.waiter.wait_for(
+            self.driver, site, 'form_ready',
+            EC.presence_of_element_located((By.CSS_SELECTOR, "form"))
+        )
+        mapping = self.strategies.resolve(
+            self.driver, identify_site(self.driver.current_url, self.driver.page_source))
+        
+        if 'resume' in mapping:
+            file_input = self.driver.find_element(By.CSS_SELECTOR, mapping['resume'])
+            file_input.send_keys(os.path.abspath(resume_path))
+            self.waiter.wait_for(self.driver, site, 'resume_upload', upload_complete(file_input))
+        
+        if cover_letter_path and 'cover_letter' in mapping:
             print(f"Attaching cover letter: {cover_letter_path}")
+            cover_input = self.driver.find_element(By.CSS_SELECTOR, mapping['cover_letter'])
+            cover_input.send_keys(os.path.abspath(cover_letter_path))
+            self.waiter.wait_for(self.driver, site, 'cover_letter_upload', upload_complete(cover_input))
         
-        # Simulate form filling
-        time.sleep(2)
+        for field, value in field_values(self._applicant_fields()).items():
+            if field in mapping:
+                element = self.driver.find_element(By.CSS_SELECTOR, mapping[field])
+                element.clear()
+                element.send_keys(value)
         
-        # Try to find and click submit button
+        # Try to find and click submit button, then wait for the confirmation
         try:
-            # This is just a simulation - in reality, you'd need to identify
-            # the actual submit button on each job site
             print("Submitting application...")
-            time.sleep(1)
-            return "Application submitted successfully"
-        except:
-            return "Application submitted manually - please complete CAPTCHA"
\ No newline at end of file
+            submit = self.waiter.wait_for(
+                self.driver, site, 'submit_ready',
+                EC.element_to_be_clickable((By.CSS_SELECTOR, mapping['submit']))
+            )
+            self.submit_attempted = True
+            submit.click()
+            self.waiter.wait_for(self.driver, site, 'confirmation', text_present(SUCCESS_PATTERN))
+            return SUBMITTED
+        except TimeoutException:
+            return NEEDS_CAPTCHA
\ No newline at end of file
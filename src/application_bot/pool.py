@@ -0,0 +1,247 @@
+"""
+Worker pool that applies to many jobs with long-lived headless browsers.
+"""
+import re
+import threading
+import time
+from queue import Queue
+
+from utils import metrics
+from utils.rate_limit import THROTTLE_STATUSES, domain_of, get_rate_limiter, parse_retry_after
+
+from .strategies import get_strategy_cache, identify_site, field_values
+from .waits import get_waiter, site_of
+
+SUCCESS_PATTERN = re.compile(r'thank you|application (?:was )?(?:received|submitted)', re.IGNORECASE)
+CAPTCHA_SELECTOR = 'iframe[src*="captcha"], .g-recaptcha, .h-captcha'
+# Statuses of a form that was submitted, and of one left for the applicant to finish
+SUBMITTED = "Application submitted successfully"
+NEEDS_CAPTCHA = "Application submitted manually - please complete CAPTCHA"
+
+class PlaywrightSession:
+    """
+    One Playwright driver and headless browser, owned by a single thread.
+
+    Playwright objects are not thread-safe, so each pool worker starts its
+    own session. The browser is relaunched if it has crashed.
+    """
+    def __init__(self, config):
+        self.config = config
+        self._playwright = None
+        self.browser = None
+    
+    def start(self):
+        """
+        Start the Playwright driver and launch the browser.
+        """
+        from playwright.sync_api import sync_playwright
+        self._playwright = sync_playwright().start()
+        self._launch()
+    
+    def new_context(self):
+        """
+        Return a fresh browser context, relaunching a crashed browser first.
+        """
+        if self.browser is None or not self.browser.is_connected():
+            self._launch()
+        return self.browser.new_context()
+    
+    def stop(self):
+        """
+        Close the browser and stop the driver.
+        """
+        try:
+            if self.browser is not None and self.browser.is_connected():
+                self.browser.close()
+        finally:
+            if self._playwright is not None:
+                self._playwright.stop()
+            self._playwright = None
+            self.browser = None
+    
+    def _launch(self):
+        browser_type = getattr(self._playwright, self.config.get('PLAYWRIGHT_BROWSER', 'chromium'))
+        self.browser = browser_type.launch(headless=self.config.get('HEADLESS', True))
+
+UPLOAD_DONE_SCRIPT = """el => el.files.length > 0 && !Array.from(
+    document.querySelectorAll('progress, [role=progressbar]')).some(p => p.offsetParent !== null)"""
+
+def fill_application_form(page, application, config):
+    """
+    Fill and submit a generic application form in a Playwright page.
+
+    Every step waits on a page condition with the site's learned timeout
+    instead of sleeping for a fixed time. Fields are located through the
+    site's cached form strategy.
+    """
+    waiter = get_waiter(config)
+    site = site_of(application['url'])
+    
+    # Share the per-domain request budget with the job aggregator
+    limiter = get_rate_limiter(config)
+    domain = domain_of(application['url'])
+    if limiter is not None:
+        limiter.acquire(domain)
+    with waiter.measure(site, 'page_load') as timeout:
+        response = page.goto(application['url'], wait_until='domcontentloaded', timeout=timeout * 1000)
+    if limiter is not None and response is not None:
+        limiter.record(domain, response.status, parse_retry_after(response.headers.get('retry-after')))
+        if response.status in THROTTLE_STATUSES:
+            raise RuntimeError(f"Throttled by {domain} (HTTP {response.status})")
+    with waiter.measure(site, 'form_ready') as timeout:
+        page.wait_for_selector('form', timeout=timeout * 1000)
+    
+    # Reuse the selectors learned for this site; probe the form only on a miss
+    mapping = get_strategy_cache(config).resolve(
+        page, identify_site(application['url'], page.content()))
+    
+    uploads = []
+    if 'resume' in mapping:
+        page.set_input_files(mapping['resume'], application['resume_path'])
+        uploads.append(('resume_upload', mapping['resume']))
+    if application.get('cover_letter_path') and 'cover_letter' in mapping:
+        page.set_input_files(mapping['cover_letter'], application['cover_letter_path'])
+        uploads.append(('cover_letter_upload', mapping['cover_letter']))
+    for step, selector in uploads:
+        with waiter.measure(site, step) as timeout:
+            page.wait_for_function(UPLOAD_DONE_SCRIPT, arg=page.query_selector(selector),
+                                   timeout=timeout * 1000)
+    
+    for field, value in field_values(application.get('fields', {})).items():
+        if field in mapping:
+            page.fill(mapping[field], value)
+    
+    if page.query_selector(CAPTCHA_SELECTOR) is not None:
+        return NEEDS_CAPTCHA
+    
+    page.click(mapping['submit'])
+    with waiter.measure(site, 'network_idle') as timeout:
+        page.wait_for_load_state('networkidle', timeout=timeout * 1000)
+    with waiter.measure(site, 'confirmation') as timeout:
+        page.wait_for_function(
+            'pattern => new RegExp(pattern, "i").test(document.body.innerText)',
+            arg=SUCCESS_PATTERN.pattern,
+            timeout=timeout * 1000
+        )
+    return SUBMITTED
+
+class ApplicationWorkerPool:
+    """
+    Applies to queued jobs with N worker threads, each reusing one browser.
+
+    Every worker keeps a long-lived browser and opens a new context for
+    every `recycle_after` applications, or right after a failure, so a
+    crashed or polluted context is never reused.
+    """
+    def __init__(self, config, workers=None, recycle_after=None,
+                 session_factory=None, form_filler=None):
+        self.config = config
+        self.workers = workers or config.get('APPLY_WORKERS', 4)
+        self.recycle_after = recycle_after or config.get('APPLY_RECYCLE_AFTER', 25)
+        self.session_factory = session_factory or PlaywrightSession
+        self.form_filler = form_filler or fill_application_form
+        self.stats = {'contexts': 0, 'recycled': 0, 'crashes': 0}
+        self._stats_lock = threading.Lock()
+    
+    def run(self, applications):
+        """
+        Apply to every application and return the results in input order.
+
+        Each application is a dict with 'url' and 'resume_path', and
+        optionally 'cover_letter_path' and applicant 'fields'.
+        """
+        applications = list(applications)
+        results = [None] * len(applications)
+        # Browser start failures of this run only, reported for unhandled applications
+        start_errors = []
+        queue = Queue()
+        for position, application in enumerate(applications):
+            queue.put((position, application))
+        
+        threads = []
+        for worker_id in range(min(self.workers, len(applications))):
+            queue.put(None)
+            thread = threading.Thread(target=self._work, args=(queue, results, start_errors),
+                                      name=f'apply-worker-{worker_id}', daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        
+        for position, application in enumerate(applications):
+            if results[position] is None:
+                error = start_errors[0] if start_errors else 'worker stopped'
+                results[position] = {'url': application['url'], 'ok': False,
+                                     'status': f"Error starting browser: {error}", 'elapsed': 0.0}
+        get_waiter(self.config).save()
+        get_strategy_cache(self.config).save()
+        return results
+    
+    def _work(self, queue, results, start_errors):
+        """
+        Worker loop: pull applications until the stop marker arrives.
+        """
+        session = self.session_factory(self.config)
+        context = None
+        handled = 0
+        try:
+            session.start()
+            while True:
+                item = queue.get()
+                if item is None:
+                    break
+                position, application = item
+                
+                if context is not None and handled >= self.recycle_after:
+                    self._close(context)
+                    context = None
+                    self._count('recycled')
+                if context is None:
+                    context = session.new_context()
+                    handled = 0
+                    self._count('contexts')
+                
+                started = time.perf_counter()
+                page = None
+                try:
+                    page = context.new_page()
+                    status = self.form_filler(page, application, self.config)
+                    # A form left at a CAPTCHA is not an application yet
+                    outcome = 'ok' if status == SUBMITTED else 'manual'
+                except Exception as e:
+                    status = f"Error applying to job: {str(e)}"
+                    outcome = 'error'
+                    # Never reuse a context that failed mid-application
+                    self._close(context)
+                    context = None
+                    self._count('crashes')
+                finally:
+                    if page is not None and context is not None:
+                        self._close(page)
+                handled += 1
+                results[position] = {
+                    'url': application['url'],
+                    'ok': outcome == 'ok',
+                    'status': status,
+                    'elapsed': time.perf_counter() - started
+                }
+                metrics.observe('application_seconds', results[position]['elapsed'], outcome=outcome)
+        except Exception as e:
+            # This worker's browser could not start; the others keep draining
+            print(f"Application worker failed to start: {e}")
+            metrics.increment('browser_start_failures_total')
+            start_errors.append(str(e))
+        finally:
+            if context is not None:
+                self._close(context)
+            session.stop()
+    
+    def _close(self, resource):
+        try:
+            resource.close()
+        except Exception:
+            pass
+    
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
@@ -0,0 +1,238 @@
+"""
+Per-site form strategies: which selectors fill which application fields.
+
+The first application on a site probes the form and derives a field
+mapping; the mapping is persisted per site (ATS or domain) and reused on
+later applications after a single cheap selector check.
+"""
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+from utils.helpers import write_json_atomic
+
+# Applicant tracking systems recognized by host name or page markup
+ATS_HOSTS = {
+    'greenhouse': ('greenhouse.io',),
+    'lever': ('lever.co',),
+    'workday': ('myworkdayjobs.com', 'workday.com'),
+    'smartrecruiters': ('smartrecruiters.com',),
+    'ashby': ('ashbyhq.com',),
+    'workable': ('workable.com',),
+    'personio': ('personio.de', 'personio.com'),
+    'recruitee': ('recruitee.com',),
+    'linkedin': ('linkedin.com',),
+    'indeed': ('indeed.com',),
+    'stepstone': ('stepstone.com', 'stepstone.de')
+}
+ATS_MARKERS = {
+    'greenhouse': re.compile(r'greenhouse\.io|grnhse', re.IGNORECASE),
+    'lever': re.compile(r'lever\.co|lever-application', re.IGNORECASE),
+    'workday': re.compile(r'myworkdayjobs|data-automation-id', re.IGNORECASE),
+    'smartrecruiters': re.compile(r'smartrecruiters', re.IGNORECASE)
+}
+
+# Logical fields and the patterns that identify them in a control's name, id, label or placeholder
+FIELD_HINTS = {
+    'first_name': ('first_?name', 'first name', 'given'),
+    'last_name': ('last_?name', 'last name', 'surname', 'family'),
+    # A bare 'name' must be the whole attribute, so company_name or username don't match
+    'full_name': ('full_?name', 'full name', r'^(your )?name\W*$'),
+    'email': ('email', 'e-mail'),
+    # Short hints must stand alone, so hotel, intelligence or a card's cvv don't match
+    'phone': ('phone', r'(?<![a-z])tel(?![a-z])', 'mobile'),
+    'cover_letter': ('cover',),
+    'resume': ('resume', r'(?<![a-z])cv(?![a-z])', 'curriculum')
+}
+FIELD_PATTERNS = {name: re.compile('|'.join(hints)) for name, hints in FIELD_HINTS.items()}
+
+# Lists form controls with a stable selector and their descriptive text
+PROBE_SCRIPT = """() => Array.from(document.querySelectorAll(
+    'input, textarea, select, button[type=submit]')).map(el => {
+    let selector = null;
+    if (el.id) {
+        selector = '#' + CSS.escape(el.id);
+    } else if (el.name) {
+        selector = el.tagName.toLowerCase() + '[name="' + el.name + '"]';
+    }
+    const label = el.labels && el.labels.length ? el.labels[0].innerText : '';
+    return {selector: selector, tag: el.tagName.toLowerCase(), type: (el.type || '').toLowerCase(),
+            name: el.name || '', id: el.id || '', label: label,
+            placeholder: el.placeholder || '', text: el.innerText || el.value || ''};
+}).filter(field => field.selector)"""
+
+# Null if a selector in the list matches no element, else the probed controls none of them match
+VALIDATE_SCRIPT = f"""selectors => {{
+    if (!selectors.every(s => document.querySelector(s) !== null)) {{
+        return null;
+    }}
+    const covered = new Set(selectors.flatMap(s => Array.from(document.querySelectorAll(s))));
+    return ({PROBE_SCRIPT})().filter(field => !covered.has(document.querySelector(field.selector)));
+}}"""
+
+GENERIC_SUBMIT = 'button[type="submit"], input[type="submit"]'
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def identify_site(url, html=None):
+    """
+    Return the ATS or job board behind a URL, falling back to its domain.
+    """
+    host = urlparse(url).netloc.lower()
+    for ats, suffixes in ATS_HOSTS.items():
+        if any(host == suffix or host.endswith('.' + suffix) for suffix in suffixes):
+            return ats
+    if html:
+        for ats, marker in ATS_MARKERS.items():
+            if marker.search(html):
+                return ats
+    return host[4:] if host.startswith('www.') else host or 'local'
+
+def evaluate(page, script, arg=None):
+    """
+    Run a one-argument JavaScript function in a Playwright page or Selenium driver.
+    """
+    if hasattr(page, 'evaluate'):
+        return page.evaluate(script, arg)
+    return page.execute_script(f'return ({script})(arguments[0]);', arg)
+
+def discover_mapping(fields):
+    """
+    Derive a field -> selector mapping from probed form controls.
+    """
+    mapping = {}
+    file_inputs = []
+    for field in fields:
+        if field['type'] in ('hidden', 'checkbox', 'radio'):
+            continue
+        if field['type'] == 'submit' and 'submit' not in mapping:
+            mapping['submit'] = field['selector']
+            continue
+        texts = [field[key].strip().lower() for key in ('name', 'id', 'label', 'placeholder') if field[key]]
+        if field['type'] == 'file':
+            file_inputs.append((field['selector'], texts))
+            continue
+        for name, pattern in FIELD_PATTERNS.items():
+            if name in ('resume', 'cover_letter') or name in mapping:
+                continue
+            if any(pattern.search(text) for text in texts):
+                mapping[name] = field['selector']
+                break
+    
+    for selector, texts in file_inputs:
+        if 'cover_letter' not in mapping and any(FIELD_PATTERNS['cover_letter'].search(text) for text in texts):
+            mapping['cover_letter'] = selector
+        elif 'resume' not in mapping:
+            mapping['resume'] = selector
+    mapping.setdefault('submit', GENERIC_SUBMIT)
+    return mapping
+
+def uncovered_fields(mapping, fields):
+    """
+    Return the fields that probed controls would add to a cached mapping.
+    
+    `fields` are the controls no cached selector matches, e.g. a phone
+    input or resume upload that another company on the same ATS added.
+    """
+    return set(discover_mapping(fields)) - set(mapping) - {'submit'}
+
+def field_values(fields):
+    """
+    Expand applicant fields so split first/last name inputs can be filled too.
+    """
+    values = dict(fields)
+    if values.get('full_name') and ' ' in values['full_name']:
+        first, last = values['full_name'].split(' ', 1)
+        values.setdefault('first_name', first)
+        values.setdefault('last_name', last)
+    return values
+
+def get_strategy_cache(config):
+    """
+    Return the shared strategy cache for the configured path.
+    """
+    path = config.get('FORM_STRATEGY_PATH', os.path.join('output', 'form_strategies.json'))
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = FormStrategyCache(path)
+        return _caches[path]
+
+class FormStrategyCache:
+    """
+    Persisted per-site field mappings with hit/probe counters.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self._strategies = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path and os.path.exists(path):
+            self.load()
+    
+    def resolve(self, page, site):
+        """
+        Return the field mapping for the current page of a site.
+
+        A cached mapping is checked with one script call and reused if its
+        selectors still match and the form has no control it would leave
+        empty; otherwise the form is probed for a new mapping. Call `save`
+        to persist changes, e.g. once a batch of applications is done.
+        """
+        with self._lock:
+            strategy = self._strategies.get(site)
+        
+        if strategy:
+            unmatched = evaluate(page, VALIDATE_SCRIPT, list(strategy['mapping'].values()))
+            if unmatched is not None and not uncovered_fields(strategy['mapping'], unmatched):
+                with self._lock:
+                    strategy['hits'] += 1
+                    self._dirty = True
+                return strategy['mapping']
+        
+        mapping = discover_mapping(evaluate(page, PROBE_SCRIPT))
+        with self._lock:
+            previous = self._strategies.get(site, {})
+            self._strategies[site] = {
+                'mapping': mapping,
+                'hits': previous.get('hits', 0),
+                'probes': previous.get('probes', 0) + 1,
+                'updated_at': time.time()
+            }
+            self._dirty = True
+        return mapping
+    
+    def stats(self, site):
+        """
+        Return the hit and probe counts for a site.
+        """
+        with self._lock:
+            strategy = self._strategies.get(site, {})
+            return {'hits': strategy.get('hits', 0), 'probes': strategy.get('probes', 0)}
+    
+    def save(self):
+        """
+        Persist the strategies if they changed since the last save.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if self._dirty:
+                write_json_atomic(self.path, self._strategies)
+                self._dirty = False
+    
+    def load(self):
+        """
+        Load persisted strategies.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load form strategies from {self.path}: {e}")
+            return
+        with self._lock:
+            self._strategies = data
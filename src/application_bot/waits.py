@@ -0,0 +1,219 @@
+"""
+Condition-based waits with per-site adaptive timeouts and wait-time stats.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from utils import metrics
+from utils.helpers import write_json_atomic
+
+_waiters = {}
+_waiters_lock = threading.Lock()
+
+def timeout_errors():
+    """
+    Return the exception classes that mean a browser wait timed out.
+    
+    Selenium's TimeoutException and Playwright's TimeoutError are included
+    once their modules are loaded; an exception of either class can't be
+    raised before that, so timing a step never imports a browser library.
+    """
+    errors = [TimeoutError]
+    selenium = sys.modules.get('selenium.common.exceptions')
+    if selenium is not None:
+        errors.append(selenium.TimeoutException)
+    for name in ('playwright.sync_api', 'playwright.async_api'):
+        playwright = sys.modules.get(name)
+        if playwright is not None:
+            errors.append(playwright.TimeoutError)
+            break
+    return tuple(errors)
+
+def get_waiter(config):
+    """
+    Return the process-wide waiter for the configured stats file.
+    """
+    path = config.get('WAIT_STATS_PATH', os.path.join('output', 'wait_stats.json'))
+    with _waiters_lock:
+        if path not in _waiters:
+            _waiters[path] = AdaptiveWaiter(config, path)
+        return _waiters[path]
+
+def site_of(url):
+    """
+    Return the host name used to key per-site wait statistics.
+    """
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host or 'local'
+
+class AdaptiveWaiter:
+    """
+    Learns how long each step takes on each site and sizes timeouts to match.
+
+    Like TCP's retransmission timer, the timeout for a (site, step) pair is
+    the smoothed wait time plus four times its smoothed deviation, clamped
+    between WAIT_MIN_TIMEOUT and APPLY_STEP_TIMEOUT. Sites without history
+    get the maximum. Every wait is recorded, so `report()` shows where time
+    goes and which boards are slow.
+    """
+    def __init__(self, config, path=None):
+        self.min_timeout = config.get('WAIT_MIN_TIMEOUT', 2)
+        self.max_timeout = config.get('APPLY_STEP_TIMEOUT', 15)
+        self.poll_interval = config.get('WAIT_POLL_INTERVAL', 0.1)
+        self.path = path
+        self._stats = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+    
+    def timeout_for(self, site, step):
+        """
+        Return the timeout in seconds to use for a step on a site.
+        """
+        with self._lock:
+            stats = self._stats.get(site, {}).get(step)
+        if not stats:
+            return self.max_timeout
+        timeout = stats['mean'] + 4 * stats['deviation']
+        return max(self.min_timeout, min(self.max_timeout, timeout))
+    
+    def record(self, site, step, elapsed, timed_out=False):
+        """
+        Record how long a step waited and update its smoothed estimates.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(site, {}).setdefault(step, {
+                'count': 0, 'timeouts': 0, 'total_wait': 0.0,
+                'mean': elapsed, 'deviation': elapsed / 2
+            })
+            stats['count'] += 1
+            stats['total_wait'] += elapsed
+            if timed_out:
+                stats['timeouts'] += 1
+                # Back off so the next attempt gets more time
+                elapsed *= 2
+            stats['deviation'] = 0.75 * stats['deviation'] + 0.25 * abs(stats['mean'] - elapsed)
+            stats['mean'] = 0.875 * stats['mean'] + 0.125 * elapsed
+    
+    @contextmanager
+    def measure(self, site, step):
+        """
+        Time a block that performs its own wait and record the outcome.
+
+        The block receives the timeout to use; a TimeoutError, or the
+        Selenium or Playwright timeout exception, counts as a timed-out wait.
+        """
+        timeout = self.timeout_for(site, step)
+        started = time.perf_counter()
+        try:
+            yield timeout
+        except Exception as e:
+            timed_out = isinstance(e, timeout_errors())
+            elapsed = time.perf_counter() - started
+            self.record(site, step, elapsed, timed_out=timed_out)
+            metrics.observe('browser_step_seconds', elapsed, step=step, outcome='timeout' if timed_out else 'error')
+            raise
+        elapsed = time.perf_counter() - started
+        self.record(site, step, elapsed)
+        metrics.observe('browser_step_seconds', elapsed, step=step, outcome='ok')
+    
+    def wait_for(self, driver, site, step, condition):
+        """
+        Block until a Selenium condition holds, using the learned timeout.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        with self.measure(site, step) as timeout:
+            return WebDriverWait(driver, timeout, poll_frequency=self.poll_interval).until(condition)
+    
+    def report(self):
+        """
+        Return wait statistics per site and step.
+        """
+        report = {}
+        with self._lock:
+            for site, steps in self._stats.items():
+                report[site] = {}
+                for step, stats in steps.items():
+                    report[site][step] = {
+                        'count': stats['count'],
+                        'timeouts': stats['timeouts'],
+                        'total_wait': round(stats['total_wait'], 3),
+                        'average_wait': round(stats['total_wait'] / stats['count'], 3)
+                    }
+        return report
+    
+    def save(self):
+        """
+        Persist the learned statistics.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            write_json_atomic(self.path, self._stats)
+    
+    def load(self):
+        """
+        Load previously learned statistics.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load wait statistics from {self.path}: {e}")
+            return
+        with self._lock:
+            self._stats = data
+
+def document_ready(driver):
+    """
+    Selenium condition: the document has finished loading.
+    """
+    return driver.execute_script('return document.readyState') == 'complete'
+
+def network_idle(quiet_period=0.5):
+    """
+    Selenium condition factory: no new resource requests for `quiet_period`.
+    """
+    state = {'count': None, 'since': None}
+    
+    def condition(driver):
+        count = driver.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.perf_counter()
+        if count != state['count']:
+            state['count'] = count
+            state['since'] = now
+            return False
+        return now - state['since'] >= quiet_period
+    
+    return condition
+
+def upload_complete(element):
+    """
+    Selenium condition factory: a file input holds a file and no progress
+    indicator is visible on the page.
+    """
+    def condition(driver):
+        if not element.get_attribute('value'):
+            return False
+        progress = driver.execute_script(
+            "return Array.from(document.querySelectorAll('progress, [role=progressbar]'))"
+            ".some(el => el.offsetParent !== null)"
+        )
+        return not progress
+    
+    return condition
+
+def text_present(pattern):
+    """
+    Selenium condition factory: the visible page text matches a regex.
+    """
+    def condition(driver):
+        return bool(pattern.search(driver.execute_script('return document.body.innerText') or ''))
+    
+    return condition
@@ -2,37 +2,221 @@
 Configuration settings for the automated job search system.
 """
 import os
+import threading
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+_settings = None
+_settings_lock = threading.Lock()
+
+def _parse(spec, value):
+    """
+    Convert an environment variable to the type of its settings field.
+    """
+    if spec.type is bool:
+        return value.lower() == 'true'
+    if spec.type is tuple:
+        return tuple(item for item in value.split(',') if item)
+    if spec.type is MappingProxyType:
+        # 'key:value,key:value', e.g. RATE_LIMIT_OVERRIDES=api.example.com:0.5
+        cast = spec.metadata['cast']
+        pairs = (pair.split(':', 1) for pair in value.split(',') if pair.strip())
+        return MappingProxyType({key.strip(): cast(item.strip()) for key, item in pairs})
+    return spec.type(value)
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Typed configuration, parsed from the environment once per process.
+    
+    Every field is named after its environment variable and holds the
+    default used when the variable is unset. The instance is shared by the
+    whole process, so list settings are tuples and mappings are read-only.
+    """
+    # API Keys
+    OPENAI_API_KEY: str = ''
+    LINKEDIN_EMAIL: str = ''
+    LINKEDIN_PASSWORD: str = ''
+    
+    # Database settings
+    DATABASE_URL: str = 'sqlite:///jobs.db'
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    STATS_CACHE_TTL: float = 10.0
+    STATS_CACHE_SIZE: int = 32
+    
+    # Dashboard server settings
+    DASHBOARD_HOST: str = '0.0.0.0'
+    DASHBOARD_PORT: int = 5000
+    DASHBOARD_WORKERS: int = 4
+    DASHBOARD_THREADS: int = 4
+    DASHBOARD_WORKER_CLASS: str = 'gevent'
+    DASHBOARD_WORKER_CONNECTIONS: int = 1000
+    DASHBOARD_DEBUG: bool = False
+    SSE_POLL_INTERVAL: float = 1.0
+    SSE_HEARTBEAT: float = 15.0
+    SSE_QUEUE_SIZE: int = 1000
+    SSE_RETENTION_HOURS: float = 24.0
+    JOB_INDEX_REFRESH_INTERVAL: float = 60.0
+    
+    # Web driver settings
+    WEB_DRIVER: str = 'chrome'
+    HEADLESS: bool = True
+    PLAYWRIGHT_BROWSER: str = 'chromium'
+    APPLY_WORKERS: int = 4
+    APPLY_RECYCLE_AFTER: int = 25
+    APPLY_STEP_TIMEOUT: float = 15.0
+    WAIT_MIN_TIMEOUT: float = 2.0
+    WAIT_STATS_PATH: str = 'output/wait_stats.json'
+    FORM_STRATEGY_PATH: str = 'output/form_strategies.json'
+    
+    # File paths
+    RESUME_PATH: str = 'resumes/'
+    COVER_LETTER_PATH: str = 'cover_letters/'
+    OUTPUT_PATH: str = 'output/'
+    JOB_STORE_PATH: str = 'output/jobs.db'
+    
+    # Application settings
+    APPLICANT_NAME: str = ''
+    APPLICANT_EMAIL: str = ''
+    APPLICANT_PHONE: str = ''
+    DEFAULT_LOCATION: str = 'Remote'
+    DEFAULT_RADIUS: int = 50
+    
+    # Job search settings
+    SEARCH_CONCURRENT: bool = True
+    SEARCH_MAX_WORKERS: int = 8
+    SOURCE_TIMEOUT: float = 30.0
+    STREAM_BUFFER_SIZE: int = 1000
+    JOB_SOURCES: tuple = ('linkedin', 'indeed', 'stepstone')
+    
+    # Page cache and incremental crawl settings
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_PATH: str = 'output/page_cache.db'
+    PAGE_CACHE_MAX_MB: float = 256.0
+    INCREMENTAL_CRAWL: bool = False
+    
+    # Duplicate detection settings
+    DEDUP_ENABLED: bool = True
+    DEDUP_PATH: str = 'output/dedup.db'
+    DEDUP_MAX_DISTANCE: int = 3
+    DEDUP_RETENTION_DAYS: float = 90.0
+    
+    # HTTP connection pool settings
+    HTTP_POOL_HOSTS: int = 10
+    HTTP_POOL_SIZE: int = 10
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_BACKOFF: float = 0.5
+    HTTP_TIMEOUT: float = 15.0
+    
+    # Per-domain rate limit settings
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PATH: str = 'output/rate_limits.db'
+    RATE_LIMIT_PER_SECOND: float = 1.0
+    RATE_LIMIT_BURST: int = 5
+    RATE_LIMIT_MAX_BACKOFF: float = 300.0
+    RATE_LIMIT_OVERRIDES: MappingProxyType = field(
+        default_factory=lambda: MappingProxyType({}), metadata={'cast': float}
+    )
+    
+    # Skills analysis settings
+    SKILLS_THRESHOLD: float = 0.7
+    RESUME_CACHE_ENABLED: bool = True
+    RESUME_CACHE_PATH: str = 'output/resume_cache.db'
+    SEMANTIC_MATCHING: bool = False
+    SIMILARITY_INDEX_PATH: str = 'output/skill_index'
+    SIMILARITY_MIN_SCORE: float = 0.5
+    USE_SPACY: bool = False
+    SPACY_MODEL: str = 'en_core_web_sm'
+    SPACY_EXCLUDE: tuple = ('parser', 'ner')
+    SPACY_BATCH_SIZE: int = 64
+    ANALYSIS_WORKERS: int = 1
+    ANALYSIS_CHUNK_SIZE: int = 256
+    
+    # Pipeline daemon settings
+    PIPELINE_QUEUE_PATH: str = 'output/pipeline.db'
+    PIPELINE_WORKERS: MappingProxyType = field(
+        default_factory=lambda: MappingProxyType({'search': 2, 'dedup': 1, 'analyze': 4, 'apply': 2}),
+        metadata={'cast': int}
+    )
+    PIPELINE_MAX_ATTEMPTS: int = 5
+    PIPELINE_BACKOFF: float = 30.0
+    PIPELINE_LEASE_SECONDS: float = 600.0
+    PIPELINE_POLL_INTERVAL: float = 1.0
+    PIPELINE_RESUME: str = ''
+    PIPELINE_COVER_LETTER: str = ''
+    SEARCH_TITLES: tuple = ()
+    SEARCH_INTERVAL_MINUTES: int = 60
+    APPLY_MIN_MATCH: float = 70.0
+    AUTO_APPLY: bool = False
+    
+    # Metrics and profiling settings
+    METRICS_ENABLED: bool = False
+    METRICS_PATH: str = 'output/metrics.db'
+    METRICS_FLUSH_INTERVAL: float = 10.0
+    METRICS_RETENTION_HOURS: float = 24.0
+    PROFILER: str = ''
+    PROFILE_DIR: str = 'output/profiles'
+    
+    def __post_init__(self):
+        # Freeze list and dict values passed in by callers as well
+        for spec in fields(self):
+            value = getattr(self, spec.name)
+            if spec.type is tuple and not isinstance(value, tuple):
+                object.__setattr__(self, spec.name, tuple(value))
+            elif spec.type is MappingProxyType and not isinstance(value, MappingProxyType):
+                object.__setattr__(self, spec.name, MappingProxyType(dict(value)))
+    
+    @classmethod
+    def from_env(cls, environ=None):
+        """
+        Parse settings from environment variables, falling back to the defaults.
+        """
+        environ = os.environ if environ is None else environ
+        values = {}
+        for spec in fields(cls):
+            value = environ.get(spec.name)
+            if value is not None:
+                values[spec.name] = _parse(spec, value)
+        return cls(**values)
+    
+    def to_dict(self):
+        """
+        Return the settings as a new, freely mutable dict.
+        
+        Tuples become lists and read-only mappings become dicts.
+        """
+        values = {}
+        for spec in fields(self):
+            value = getattr(self, spec.name)
+            if isinstance(value, tuple):
+                value = list(value)
+            elif isinstance(value, MappingProxyType):
+                value = dict(value)
+            values[spec.name] = value
+        return values
+
+def get_settings(reload=False):
+    """
+    Return the settings of this process, parsing the environment on first use.
+    
+    Pass reload=True to pick up environment variables changed since then.
+    """
+    global _settings
+    with _settings_lock:
+        if _settings is None or reload:
+            _settings = Settings.from_env()
+        return _settings
+
 def load_config():
     """
     Load configuration from environment variables.
+    
+    Returns a copy of the cached settings as a dict, so callers may change it.
     """
-    return {
-        # API Keys
-        'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY', ''),
-        'LINKEDIN_EMAIL': os.getenv('LINKEDIN_EMAIL', ''),
-        'LINKEDIN_PASSWORD': os.getenv('LINKEDIN_PASSWORD', ''),
-        
-        # Database settings
-        'DATABASE_URL': os.getenv('DATABASE_URL', 'sqlite:///jobs.db'),
-        
-        # Web driver settings
-        'WEB_DRIVER': os.getenv('WEB_DRIVER', 'chrome'),
-        'HEADLESS': os.getenv('HEADLESS', 'True').lower() == 'true',
-        
-        # File paths
-        'RESUME_PATH': os.getenv('RESUME_PATH', 'resumes/'),
-        'COVER_LETTER_PATH': os.getenv('COVER_LETTER_PATH', 'cover_letters/'),
-        'OUTPUT_PATH': os.getenv('OUTPUT_PATH', 'output/'),
-        
-        # Application settings
-        'DEFAULT_LOCATION': os.getenv('DEFAULT_LOCATION', 'Remote'),
-        'DEFAULT_RADIUS': int(os.getenv('DEFAULT_RADIUS', '50')),
-        
-        # Skills analysis settings
-        'SKILLS_THRESHOLD': float(os.getenv('SKILLS_THRESHOLD', '0.7')),
-    }
\ No newline at end of file
+    return get_settings().to_dict()
\ No newline at end of file
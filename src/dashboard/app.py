@@ -1,65 +1,458 @@
 """
 Dashboard module for tracking job applications and viewing analytics.
 """
-from flask import Flask, render_template, jsonify
-from flask_sqlalchemy import SQLAlchemy
+import base64
+import hashlib
+import importlib.util
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
 
-def run_dashboard(config):
+from flask import Blueprint, Flask, Response, current_app, render_template, jsonify, request
+from sqlalchemy import event, inspect
+
+from utils import metrics
+from utils.job_index import get_job_index
+
+from .events import EventBroadcaster, stream
+from .models import db, JobApplication, ApplicationRollup, rebuild_rollups
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Sortable columns and the JSON type of their value in a cursor (dates as ISO strings)
+SORT_COLUMNS = {'date_applied': str, 'company': str, 'status': str, 'id': int}
+MAX_STATS_DAYS = 366
+
+bp = Blueprint('dashboard', __name__)
+
+def encode_cursor(values):
     """
-    Run the web-based dashboard for the job application system.
+    Encode the sort key of the last row on a page as an opaque cursor.
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by `encode_cursor`.
+    """
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+def parse_date(value):
+    """
+    Parse an ISO date or datetime query parameter.
+    """
+    return datetime.fromisoformat(value) if value else None
+
+class ResponseCache:
+    """
+    LRU cache of (expires, etag, body) responses shared by the request threads.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, now):
+        """
+        Return the entry for a key unless it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key, entry):
+        """
+        Store an entry, evicting the least recently used beyond `max_size`.
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """
+        Drop every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+def engine_options(config):
+    """
+    Return SQLAlchemy engine options for the configured database.
+    
+    SQLite connections are shared across request threads and run in WAL
+    mode, so readers never block the writer. Other databases (e.g.
+    PostgreSQL through psycopg2) get a sized, pre-pinged connection pool.
+    """
+    if config['DATABASE_URL'].startswith('sqlite'):
+        return {'connect_args': {'check_same_thread': False, 'timeout': 30}}
+    return {
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': True
+    }
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_started'] = time.perf_counter()
+
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started']
+    metrics.observe('db_query_seconds', elapsed, database='dashboard',
+                    operation=statement.lstrip().split(None, 1)[0].upper())
+
+def create_app(config):
+    """
+    Create the dashboard Flask app for a configuration dict.
     """
     app = Flask(__name__)
+    app.config['STATS_CACHE_TTL'] = config.get('STATS_CACHE_TTL', 10)
+    app.config['SSE_HEARTBEAT'] = config.get('SSE_HEARTBEAT', 15.0)
+    # Settings for the stored job search index and resume matching; the index is
+    # refreshed on a thread, so it must not fork an analysis pool from this server
+    app.extensions['job_search_config'] = dict(config, ANALYSIS_WORKERS=1)
+    # Cached /api/stats responses, cleared on commits that change the rollups
+    app.extensions['stats_cache'] = ResponseCache(config.get('STATS_CACHE_SIZE', 32))
+    app.extensions['event_broadcaster'] = EventBroadcaster(
+        app,
+        poll_interval=config.get('SSE_POLL_INTERVAL', 1.0),
+        queue_size=config.get('SSE_QUEUE_SIZE', 1000),
+        retention=config.get('SSE_RETENTION_HOURS', 24) * 3600
+    )
+    init_database(app, config)
+    app.register_blueprint(bp)
+    return app
+
+def init_database(app, config):
+    """
+    Bind an app to the dashboard database and bring its schema up to date.
+    """
     app.config['SQLALCHEMY_DATABASE_URI'] = config['DATABASE_URL']
-    db = SQLAlchemy(app)
-    
-    # Define models
-    class JobApplication(db.Model):
-        id = db.Column(db.Integer, primary_key=True)
-        job_title = db.Column(db.String(200), nullable=False)
-        company = db.Column(db.String(200), nullable=False)
-        status = db.Column(db.String(50), nullable=False)
-        date_applied = db.Column(db.DateTime, nullable=False)
-        url = db.Column(db.String(500), nullable=True)
-        
-        def to_dict(self):
-            return {
-                'id': self.id,
-                'job_title': self.job_title,
-                'company': self.company,
-                'status': self.status,
-                'date_applied': self.date_applied.isoformat() if self.date_applied else None,
-                'url': self.url
-            }
-    
-    # Create tables
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(config)
+    db.init_app(app)
     with app.app_context():
-        db.create_all()
+        if db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', _set_sqlite_pragmas)
+        # Time every query only while metrics are on
+        if metrics.configure(config) is not None:
+            event.listen(db.engine, 'before_cursor_execute', _start_query_timer)
+            event.listen(db.engine, 'after_cursor_execute', _record_query_time)
+        _create_schema()
+
+def _create_schema():
+    """
+    Create tables, and add columns and indexes missing from older databases.
+    """
+    db.create_all()
+    table = JobApplication.__table__
+    existing = {column['name'] for column in inspect(db.engine).get_columns(table.name)}
+    with db.engine.begin() as connection:
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(db.engine.dialect)
+                connection.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+    for index in table.indexes:
+        index.create(db.engine, checkfirst=True)
+    # Backfill rollups for applications recorded before they existed
+    if ApplicationRollup.query.first() is None and JobApplication.query.first() is not None:
+        rebuild_rollups()
+
+# Routes
+@bp.route('/')
+def index():
+    return render_template('index.html')
+
+@bp.route('/api/applications')
+def get_applications():
+    """
+    Return one page of applications, filtered and sorted in the database.
+    
+    Query parameters: status (comma-separated), company, date_from,
+    date_to, sort (date_applied, company, status or id), order (asc or
+    desc), limit and cursor. Pages are keyset-paginated on (sort, id):
+    pass the returned `next_cursor` to get the following page.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        sort = request.args.get('sort', 'date_applied')
+        descending = request.args.get('order', 'desc') != 'asc'
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"unknown sort column '{sort}'")
+        date_from = parse_date(request.args.get('date_from'))
+        date_to = parse_date(request.args.get('date_to'))
+        cursor = None
+        if request.args.get('cursor'):
+            values = decode_cursor(request.args['cursor'])
+            # type() rather than isinstance(), so JSON booleans don't pass for ints
+            if (not isinstance(values, list) or len(values) != 2 or type(values[1]) is not int
+                    or type(values[0]) is not SORT_COLUMNS[sort]):
+                raise ValueError("malformed cursor")
+            last_value, last_id = values
+            if sort == 'date_applied':
+                last_value = parse_date(last_value)
+            cursor = (last_value, last_id)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': f"Invalid query: {e}"}), 400
+    
+    columns = JobApplication.__table__.c
+    query = db.select(columns.id, columns.job_title, columns.company, columns.status,
+                      columns.date_applied, columns.url, columns.source, columns.skill_match)
+    if request.args.get('status'):
+        query = query.where(columns.status.in_(request.args['status'].split(',')))
+    if request.args.get('company'):
+        query = query.where(columns.company == request.args['company'])
+    if date_from:
+        query = query.where(columns.date_applied >= date_from)
+    if date_to:
+        query = query.where(columns.date_applied <= date_to)
+    
+    sort_column = columns[sort]
+    if cursor is not None:
+        key = db.tuple_(sort_column, columns.id)
+        query = query.where(key < cursor if descending else key > cursor)
+    if descending:
+        query = query.order_by(sort_column.desc(), columns.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), columns.id.asc())
+    
+    rows = db.session.execute(query.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]._mapping
+        value = last[sort].isoformat() if sort == 'date_applied' else last[sort]
+        next_cursor = encode_cursor([value, last['id']])
+    
+    def generate():
+        # Serialize row by row instead of building the whole body in memory
+        yield '{"items": ['
+        for position, row in enumerate(rows):
+            item = dict(row._mapping)
+            item['date_applied'] = item['date_applied'].isoformat() if item['date_applied'] else None
+            yield (',' if position else '') + json.dumps(item)
+        yield '], "next_cursor": ' + json.dumps(next_cursor) + '}'
+    
+    return Response(generate(), mimetype='application/json')
+
+@bp.route('/api/stats')
+def get_stats():
+    """
+    Return application totals from the daily rollups.
+    
+    `days` limits the daily series (1 to 366, default 30). Responses are
+    cached per `days` for STATS_CACHE_TTL seconds and carry an ETag, so
+    unchanged stats are answered with 304 Not Modified.
+    """
+    try:
+        days = int(request.args.get('days', 30))
+    except ValueError:
+        return jsonify({'error': "Invalid query: days must be an integer"}), 400
+    if not 1 <= days <= MAX_STATS_DAYS:
+        return jsonify({'error': f"Invalid query: days must be between 1 and {MAX_STATS_DAYS}"}), 400
+    
+    stats_cache = current_app.extensions['stats_cache']
+    stats_ttl = current_app.config['STATS_CACHE_TTL']
+    now = time.monotonic()
+    cached = stats_cache.get(days, now)
+    if cached is None:
+        body = json.dumps(compute_stats(days), sort_keys=True)
+        cached = (now + stats_ttl, hashlib.sha1(body.encode()).hexdigest(), body)
+        stats_cache.put(days, cached)
+    
+    response = Response(cached[2], mimetype='application/json')
+    response.set_etag(cached[1])
+    response.cache_control.max_age = int(stats_ttl)
+    return response.make_conditional(request)
+
+@bp.route('/api/events')
+def get_events():
+    """
+    Stream application changes as Server-Sent Events.
+
+    Each event is `created`, `updated` (changed fields only) or `deleted`.
+    A reconnecting client sends Last-Event-ID (or `last_event_id`) and
+    first receives the events it missed.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({'error': "Invalid query: Last-Event-ID must be an integer"}), 400
+    
+    broadcaster = current_app.extensions['event_broadcaster']
+    # Subscribe before reading the backlog so no event falls in between
+    subscriber = broadcaster.subscribe()
+    backlog = broadcaster.replay(last_event_id) if last_event_id is not None else []
+    response = Response(stream(broadcaster, subscriber, backlog, current_app.config['SSE_HEARTBEAT']),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@bp.route('/api/jobs/search')
+def search_jobs():
+    """
+    Search stored job postings through the full-text and skill index.
+    
+    Query parameters: q (title/description keywords), company, location,
+    source, skills (comma-separated, all required), match (true to rank
+    by the share of each job's skills covered by PIPELINE_RESUME),
+    min_match (percentage, default SKILLS_THRESHOLD), facets (true to
+    add the most requested skills) and limit. Requests only query the
+    index: new postings are indexed by the pipeline daemon and by a
+    background thread every JOB_INDEX_REFRESH_INTERVAL seconds (0 leaves
+    it to the daemon).
+    """
+    config = current_app.extensions['job_search_config']
+    try:
+        limit = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        min_match = request.args.get('min_match')
+        min_match = float(min_match) if min_match else config.get('SKILLS_THRESHOLD', 0.7) * 100
+    except ValueError as e:
+        return jsonify({'error': f"Invalid query: {e}"}), 400
+    
+    index = get_job_index(config)
+    if config.get('JOB_INDEX_REFRESH_INTERVAL', 60):
+        index.start_refresher(config['JOB_INDEX_REFRESH_INTERVAL'])
+    filters = {
+        'text': request.args.get('q'),
+        'company': request.args.get('company'),
+        'location': request.args.get('location'),
+        'source': request.args.get('source'),
+        'skills': [skill.strip() for skill in request.args.get('skills', '').split(',') if skill.strip()]
+    }
+    resume_skills = None
+    if request.args.get('match', 'false').lower() == 'true':
+        resume_path = config.get('PIPELINE_RESUME', '')
+        if not resume_path:
+            return jsonify({'error': "Matching needs PIPELINE_RESUME to point at your resume"}), 400
+        resume_skills = index.analyzer.extract_resume_skills(resume_path)
+    
+    body = {'items': index.search(resume_skills=resume_skills, min_match=min_match, limit=limit, **filters)}
+    if request.args.get('facets', 'false').lower() == 'true':
+        body['skill_facets'] = index.skill_facets(**filters)
+    return jsonify(body)
+
+@bp.route('/metrics')
+def get_metrics():
+    """
+    Export the metrics of the dashboard, pipeline and bot processes for Prometheus.
+    """
+    if metrics.get_registry() is None:
+        return jsonify({'error': "Metrics are disabled; set METRICS_ENABLED=True"}), 404
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def compute_stats(days):
+    """
+    Aggregate the rollup rows into dashboard totals.
+    """
+    columns = ApplicationRollup.__table__.c
+    total = db.func.sum(columns['count'])
+    
+    def totals(column):
+        rows = db.session.execute(
+            db.select(columns[column], total).group_by(columns[column]).having(total > 0)
+        )
+        return {row[0]: row[1] for row in rows}
     
-    # Routes
-    @app.route('/')
-    def index():
-        return render_template('index.html')
+    since = datetime.now().date() - timedelta(days=days - 1)
+    daily = db.session.execute(
+        db.select(columns.day, total).where(columns.day >= since)
+        .group_by(columns.day).having(total > 0).order_by(columns.day)
+    )
+    by_status = totals('status')
+    return {
+        'total_applications': sum(by_status.values()),
+        'by_status': by_status,
+        'by_company': totals('company'),
+        'by_source': totals('source'),
+        'by_skill_match': totals('match_bucket'),
+        'daily': [{'day': row[0].isoformat(), 'count': row[1]} for row in daily]
+    }
+
+def serve(config):
+    """
+    Serve the dashboard for production use.
     
-    @app.route('/api/applications')
-    def get_applications():
-        applications = JobApplication.query.all()
-        return jsonify([app.to_dict() for app in applications])
+    Uses gunicorn with DASHBOARD_WORKERS processes when it is installed
+    (Unix), and otherwise the threaded Werkzeug server in a single
+    process. Under gunicorn only the workers build an app, after they are
+    forked, so no database connections or event poller threads exist in
+    the master to be copied into them. Every open /api/events stream stays open for as long as the
+    client is connected, so the default gevent workers serve each request
+    on a greenlet, up to DASHBOARD_WORKER_CONNECTIONS at once. Without
+    gevent, gthread workers serve DASHBOARD_THREADS requests at a time.
+    """
+    host = config.get('DASHBOARD_HOST', '0.0.0.0')
+    port = config.get('DASHBOARD_PORT', 5000)
+    workers = config.get('DASHBOARD_WORKERS', 4)
+    threads = config.get('DASHBOARD_THREADS', 4)
+    connections = config.get('DASHBOARD_WORKER_CONNECTIONS', 1000)
+    worker_class = config.get('DASHBOARD_WORKER_CLASS', 'gevent')
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        from werkzeug.serving import run_simple
+        print(f"gunicorn not available, serving with threaded Werkzeug on {host}:{port}")
+        app = create_app(config)
+        try:
+            run_simple(host, port, app, threaded=True)
+        finally:
+            app.extensions['event_broadcaster'].close()
+        return
+    if worker_class == 'gevent' and importlib.util.find_spec('gevent') is None:
+        print("gevent not available, serving with gthread workers; each event stream holds a thread")
+        worker_class = 'gthread'
+    
+    class DashboardApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_connections', connections)
+            self.cfg.set('worker_class', worker_class)
+        
+        def load(self):
+            # Each worker process builds its own app and connection pool after the fork
+            return create_app(config)
     
-    @app.route('/api/stats')
-    def get_stats():
-        total_apps = JobApplication.query.count()
-        # Add more stats as needed
-        return jsonify({
-            'total_applications': total_apps
-        })
+    concurrency = f"{connections} connections" if worker_class == 'gevent' else f"{threads} threads"
+    print(f"Serving dashboard with gunicorn on {host}:{port} ({workers} {worker_class} workers x {concurrency})")
+    DashboardApplication().run()
+
+def run_dashboard(config):
+    """
+    Run the web-based dashboard for the job application system.
+    """
+    if not config.get('DASHBOARD_DEBUG', False):
+        serve(config)
+        return
     
-    # Run the app
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app = create_app(config)
+    try:
+        app.run(debug=True, host=config.get('DASHBOARD_HOST', '0.0.0.0'),
+                port=config.get('DASHBOARD_PORT', 5000))
+    finally:
+        app.extensions['event_broadcaster'].close()
 
 if __name__ == '__main__':
-    # This is just for testing the dashboard independently
+    # This is just for testing the dashboard independently (python -m dashboard.app from src/)
     # In production, it will be called from main.py
-    class MockConfig:
-        DATABASE_URL = 'sqlite:///test.db'
+    from config.settings import load_config
     
-    run_dashboard(MockConfig())
\ No newline at end of file
+    run_dashboard(load_config())
\ No newline at end of file
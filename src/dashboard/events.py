@@ -0,0 +1,179 @@
+"""
+Server-Sent Events fan-out of application changes to dashboard clients.
+"""
+import queue
+import threading
+import time
+
+from .models import db, ApplicationEvent
+
+def format_sse(event):
+    """
+    Format an event row as a Server-Sent Events message.
+    """
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {event['data']}\n\n"
+
+class Subscriber:
+    """
+    One connected client: a bounded queue of pending messages.
+    """
+    def __init__(self, queue_size):
+        self.queue = queue.Queue(maxsize=queue_size)
+        # Set when the client fell too far behind or the broadcaster closed
+        self.disconnected = False
+
+class EventBroadcaster:
+    """
+    Polls the event log once per process and fans new events out to all clients.
+
+    However many clients are connected, the database sees one query per
+    poll. Commits made in this process wake the poller immediately; events
+    written by other processes (pipeline daemon, other workers) arrive
+    within `poll_interval`. A client that falls `queue_size` events behind
+    is disconnected and catches up from the log when it reconnects with
+    Last-Event-ID. The poller stops when the last client disconnects or
+    the broadcaster is closed.
+    """
+    def __init__(self, app, poll_interval=1.0, queue_size=1000, retention=86400):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.retention = retention
+        self.last_id = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pruned_at = 0.0
+    
+    def subscribe(self):
+        """
+        Register a client and start the poller if it is not running.
+        """
+        subscriber = Subscriber(self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self._thread is None or not self._thread.is_alive():
+                # Live delivery starts now; older events are replayed per client
+                self.last_id = self._latest_id()
+                self._thread = threading.Thread(target=self._run, name='dashboard-events', daemon=True)
+                self._thread.start()
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        """
+        Remove a client, stopping the poller if it was the last one.
+        """
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                self._wake.set()
+    
+    def close(self):
+        """
+        Disconnect every client and stop the poller, e.g. when the app shuts down.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+            thread = self._thread
+        for subscriber in subscribers:
+            subscriber.disconnected = True
+        self._wake.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+    
+    def wake(self):
+        """
+        Make the poller check for new events now.
+        """
+        self._wake.set()
+    
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+    
+    def replay(self, after_id, limit=1000):
+        """
+        Return logged events newer than `after_id`, oldest first.
+        """
+        table = ApplicationEvent.__table__
+        rows = db.session.execute(
+            db.select(table.c.id, table.c.kind, table.c.data)
+            .where(table.c.id > after_id).order_by(table.c.id).limit(limit)
+        )
+        return [dict(row._mapping) for row in rows]
+    
+    def _latest_id(self):
+        with self.app.app_context():
+            return db.session.execute(db.select(db.func.max(ApplicationEvent.id))).scalar() or 0
+    
+    def _run(self):
+        """
+        Poller loop; exits once the last client has gone.
+        """
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                with self.app.app_context():
+                    events = self.replay(self.last_id)
+                    self._prune()
+            except Exception as e:
+                print(f"Error polling dashboard events: {e}")
+                continue
+            if events:
+                self.last_id = events[-1]['id']
+                self._publish(events)
+    
+    def _publish(self, events):
+        messages = [(event['id'], format_sse(event)) for event in events]
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                for message in messages:
+                    subscriber.queue.put_nowait(message)
+            except queue.Full:
+                subscriber.disconnected = True
+                self.unsubscribe(subscriber)
+    
+    def _prune(self):
+        """
+        Delete events older than the retention period, at most once an hour.
+        """
+        now = time.time()
+        if now - self._pruned_at < 3600:
+            return
+        self._pruned_at = now
+        db.session.execute(ApplicationEvent.__table__.delete().where(
+            ApplicationEvent.__table__.c.created_at < now - self.retention))
+        db.session.commit()
+
+def stream(broadcaster, subscriber, backlog, heartbeat=15.0):
+    """
+    Yield SSE messages for one client: its backlog, then live events.
+    """
+    try:
+        # Tell the browser how soon to reconnect after a dropped connection
+        yield "retry: 3000\n\n"
+        last_sent = 0
+        for event in backlog:
+            last_sent = event['id']
+            yield format_sse(event)
+        while not subscriber.disconnected:
+            try:
+                event_id, message = subscriber.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            # Skip live events already sent from the backlog
+            if event_id > last_sent:
+                last_sent = event_id
+                yield message
+    finally:
+        broadcaster.unsubscribe(subscriber)
@@ -0,0 +1,215 @@
+"""
+Database models for the dashboard and the rollups kept alongside them.
+"""
+import json
+import time
+from collections import Counter
+
+from flask import current_app, has_app_context
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
+
+db = SQLAlchemy()
+
+ROLLUP_FIELDS = ('date_applied', 'status', 'company', 'source', 'skill_match')
+
+def match_bucket(skill_match):
+    """
+    Return the 25-point skill match bucket of a percentage, e.g. 62.5 -> '50-75'.
+    """
+    if skill_match is None:
+        return 'unknown'
+    low = int(min(max(skill_match, 0), 99.999) // 25 * 25)
+    return f"{low}-{low + 25}"
+
+class JobApplication(db.Model):
+    __table_args__ = (
+        # Filters combined with the default newest-first order
+        db.Index('ix_job_application_status_date', 'status', 'date_applied'),
+        db.Index('ix_job_application_company_date', 'company', 'date_applied'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_title = db.Column(db.String(200), nullable=False)
+    # Rollup fields keep their previous value on change, to move counts between rollups
+    company = db.column_property(db.Column(db.String(200), nullable=False), active_history=True)
+    status = db.column_property(db.Column(db.String(50), nullable=False), active_history=True)
+    date_applied = db.column_property(db.Column(db.DateTime, nullable=False, index=True),
+                                      active_history=True)
+    url = db.Column(db.String(500), nullable=True)
+    source = db.column_property(db.Column(db.String(50), nullable=True), active_history=True)
+    skill_match = db.column_property(db.Column(db.Float, nullable=True), active_history=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_title': self.job_title,
+            'company': self.company,
+            'status': self.status,
+            'date_applied': self.date_applied.isoformat() if self.date_applied else None,
+            'url': self.url,
+            'source': self.source,
+            'skill_match': self.skill_match
+        }
+
+class ApplicationRollup(db.Model):
+    """
+    Daily application counts per status, company, source and skill match bucket.
+    """
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(50), primary_key=True)
+    company = db.Column(db.String(200), primary_key=True)
+    source = db.Column(db.String(50), primary_key=True)
+    match_bucket = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class ApplicationEvent(db.Model):
+    """
+    Append-only log of application changes, streamed to dashboard clients.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.Float, nullable=False, index=True)
+    kind = db.Column(db.String(20), nullable=False)
+    application_id = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.Text, nullable=False)
+
+def rollup_key(values):
+    """
+    Return the rollup row an application with these field values counts towards.
+    """
+    return (values['date_applied'].date(), values['status'], values['company'],
+            values['source'] or 'unknown', match_bucket(values['skill_match']))
+
+def committed_values(obj):
+    """
+    Return the rollup fields of an application as they are in the database.
+    """
+    state = inspect(obj)
+    values = {}
+    for name in ROLLUP_FIELDS:
+        history = state.attrs[name].history
+        if history.deleted:
+            values[name] = history.deleted[0]
+        elif history.unchanged:
+            values[name] = history.unchanged[0]
+        else:
+            values[name] = getattr(obj, name)
+    return values
+
+def apply_rollup_deltas(connection, deltas):
+    """
+    Add count deltas to rollup rows, creating missing rows.
+    """
+    table = ApplicationRollup.__table__
+    for (day, status, company, source, bucket), delta in deltas.items():
+        if not delta:
+            continue
+        key = {'day': day, 'status': status, 'company': company,
+               'source': source, 'match_bucket': bucket}
+        if connection.dialect.name in ('sqlite', 'postgresql'):
+            if connection.dialect.name == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            statement = insert(table).values(count=delta, **key)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=list(key),
+                set_={'count': table.c['count'] + statement.excluded['count']}
+            ))
+            continue
+        condition = db.and_(*(table.c[name] == value for name, value in key.items()))
+        updated = connection.execute(
+            table.update().where(condition).values(count=table.c['count'] + delta)
+        )
+        if not updated.rowcount:
+            connection.execute(table.insert().values(count=delta, **key))
+
+def rebuild_rollups():
+    """
+    Recompute all rollups from the applications table, e.g. after bulk inserts.
+    """
+    deltas = Counter()
+    columns = JobApplication.__table__.c
+    for row in db.session.execute(db.select(*(columns[name] for name in ROLLUP_FIELDS))):
+        deltas[rollup_key(row._mapping)] += 1
+    db.session.execute(ApplicationRollup.__table__.delete())
+    apply_rollup_deltas(db.session.connection(), deltas)
+    db.session.commit()
+    clear_stats_cache()
+
+def clear_stats_cache():
+    """
+    Drop the current app's cached /api/stats responses.
+    """
+    if has_app_context():
+        cache = current_app.extensions.get('stats_cache')
+        if cache is not None:
+            cache.clear()
+
+@event.listens_for(db.session, 'before_flush')
+def update_rollups(session, flush_context, instances):
+    """
+    Fold the applications being inserted, changed or deleted into the rollups.
+    """
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, JobApplication):
+            deltas[rollup_key({name: getattr(obj, name) for name in ROLLUP_FIELDS})] += 1
+    for obj in session.dirty:
+        if isinstance(obj, JobApplication) and session.is_modified(obj):
+            deltas[rollup_key(committed_values(obj))] -= 1
+            deltas[rollup_key({name: getattr(obj, name) for name in ROLLUP_FIELDS})] += 1
+    for obj in session.deleted:
+        if isinstance(obj, JobApplication):
+            deltas[rollup_key(committed_values(obj))] -= 1
+    if any(deltas.values()):
+        apply_rollup_deltas(session.connection(), deltas)
+        session.info['rollups_changed'] = True
+
+@event.listens_for(db.session, 'after_flush')
+def record_events(session, flush_context):
+    """
+    Log a delta event for every application inserted, changed or deleted.
+
+    Changes carry only the fields that changed. Events are written in the
+    same transaction as the change itself.
+    """
+    now = time.time()
+    events = []
+    for obj in session.new:
+        if isinstance(obj, JobApplication):
+            events.append({'kind': 'created', 'application_id': obj.id, 'data': obj.to_dict()})
+    for obj in session.dirty:
+        if isinstance(obj, JobApplication) and session.is_modified(obj):
+            state = inspect(obj)
+            changes = {'id': obj.id}
+            for attr in state.mapper.column_attrs:
+                history = state.attrs[attr.key].history
+                if history.added:
+                    value = history.added[0]
+                    changes[attr.key] = value.isoformat() if hasattr(value, 'isoformat') else value
+            events.append({'kind': 'updated', 'application_id': obj.id, 'data': changes})
+    for obj in session.deleted:
+        if isinstance(obj, JobApplication):
+            events.append({'kind': 'deleted', 'application_id': obj.id, 'data': {'id': obj.id}})
+    if events:
+        session.connection().execute(ApplicationEvent.__table__.insert(), [
+            {'created_at': now, 'kind': item['kind'], 'application_id': item['application_id'],
+             'data': json.dumps(item['data'])} for item in events
+        ])
+        session.info['events_written'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def after_commit(session):
+    if session.info.pop('rollups_changed', False):
+        clear_stats_cache()
+    # Wake this process's event poller instead of waiting for its next poll
+    if session.info.pop('events_written', False) and has_app_context():
+        broadcaster = current_app.extensions.get('event_broadcaster')
+        if broadcaster is not None:
+            broadcaster.wake()
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_flags(session):
+    session.info.pop('rollups_changed', None)
+    session.info.pop('events_written', None)
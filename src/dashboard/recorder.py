@@ -0,0 +1,47 @@
+"""
+Record applications made outside the dashboard, e.g. by the pipeline daemon.
+"""
+import threading
+from datetime import datetime
+
+from flask import Flask
+
+from .models import db, JobApplication
+
+_apps = {}
+_apps_lock = threading.Lock()
+
+def _database_app(config):
+    """
+    Return an app bound to the dashboard database, without routes or event poller.
+    """
+    url = config['DATABASE_URL']
+    with _apps_lock:
+        if url not in _apps:
+            from .app import init_database
+            app = Flask(__name__)
+            init_database(app, config)
+            _apps[url] = app
+        return _apps[url]
+
+def record_application(config, job, status='applied', skill_match=None):
+    """
+    Add an application to the dashboard database and return its id.
+
+    The row is written through the ORM, so the rollups and the event log
+    are updated in the same transaction, and every running dashboard
+    pushes it to its clients on its next poll.
+    """
+    with _database_app(config).app_context():
+        application = JobApplication(
+            job_title=(job.get('title') or 'Unknown')[:200],
+            company=(job.get('company') or 'Unknown')[:200],
+            status=status,
+            date_applied=datetime.now(),
+            url=job.get('url'),
+            source=job.get('source'),
+            skill_match=skill_match
+        )
+        db.session.add(application)
+        db.session.commit()
+        return application.id
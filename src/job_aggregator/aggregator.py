@@ -1,79 +1,273 @@
 """
 Job aggregator module for collecting job listings from various sources.
 """
-import requests
-from bs4 import BeautifulSoup
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty, Full
+
+from utils import metrics
+
+from .cache import get_page_cache
+from .connectors import is_new, load_connectors, parse_timestamp
+from .dedup import get_dedup_index
+from .session import get_session
 
 class JobAggregator:
     def __init__(self, config):
         self.config = config
-        self.sources = {
-            'linkedin': self._scrape_linkedin,
-            'indeed': self._scrape_indeed,
-            'stepstone': self._scrape_stepstone
-        }
+        self.session = get_session(config)
+        self.cache = get_page_cache(config)
+        self.dedup = get_dedup_index(config)
+        # Connector plugins keyed by source name; plain search callables work too
+        self.sources = load_connectors(config, session=self.session, cache=self.cache)
+        # Optional per-source deadlines in seconds, e.g. {'indeed': 10}
+        self.source_timeouts = {}
+        # Timing report of the most recently finished search, keyed by source name
+        self.last_search_report = {}
     
-    def search_jobs(self, title, location, radius):
+    def search_jobs(self, title, location, radius, concurrent=None):
         """
         Search for jobs across all configured sources.
+
+        In concurrent mode all sources are queried at the same time, so a
+        search costs roughly as much as the slowest source. A source that
+        misses its deadline is skipped and the jobs found so far are returned.
+        Per-source status and timings are stored in `last_search_report`.
         """
+        results = {source_name: [] for source_name in self.sources}
+        for job in self.iter_jobs(title, location, radius, concurrent=concurrent):
+            # Connectors may tag jobs with a source other than their registry name
+            results.setdefault(job['source'], []).append(job)
+        
         all_jobs = []
+        for jobs in results.values():
+            all_jobs.extend(jobs)
         
-        for source_name, scraper_func in self.sources.items():
+        return all_jobs
+    
+    def iter_jobs(self, title, location, radius, concurrent=None):
+        """
+        Yield jobs as soon as any source produces them.
+
+        Each job is tagged with its 'source'. Downstream stages can start on
+        the first posting instead of waiting for the slowest board, and the
+        bounded hand-off buffer keeps memory flat for very large searches.
+        Cross-source duplicates are dropped; postings seen by earlier runs
+        are only dropped in incremental mode, where connectors are also
+        given their watermark so they can stop paging early.
+        """
+        if concurrent is None:
+            concurrent = self.config.get('SEARCH_CONCURRENT', True)
+        incremental = self.config.get('INCREMENTAL_CRAWL', False) and self.cache is not None
+        watermarks = {}
+        if incremental:
+            watermarks = {source_name: parse_timestamp(self.cache.get_watermark(source_name))
+                          for source_name in self.sources}
+        
+        # Each search fills its own report, so concurrent searches don't mix them up
+        report = {}
+        if concurrent and len(self.sources) > 1:
+            events = self._iter_concurrent(title, location, radius, watermarks, report)
+        else:
+            events = self._iter_sequential(title, location, radius, watermarks, report)
+        
+        run_id = uuid.uuid4().hex
+        matched = set()
+        newest = {}
+        try:
+            for source_name, job in events:
+                if job is None:
+                    # Source finished; advance its watermark if it completed cleanly
+                    if incremental and report[source_name]['status'] == 'ok':
+                        self._advance_watermark(source_name, watermarks.get(source_name), newest.get(source_name))
+                    continue
+                
+                job.setdefault('source', source_name)
+                if incremental:
+                    if not is_new(job, watermarks[source_name]):
+                        continue
+                    posted_at = parse_timestamp(job.get('posted_at'))
+                    if posted_at and (source_name not in newest or posted_at > newest[source_name]):
+                        newest[source_name] = posted_at
+                    report[source_name]['new_jobs'] = report[source_name].get('new_jobs', 0) + 1
+                if self.dedup is not None and self._is_duplicate(job, run_id, matched, incremental):
+                    report[source_name]['duplicates'] = report[source_name].get('duplicates', 0) + 1
+                    continue
+                yield job
+        finally:
+            self.last_search_report = report
+    
+    def _iter_sequential(self, title, location, radius, watermarks, report):
+        """
+        Query each source one after another.
+
+        Yields (source_name, job) pairs and a (source_name, None) marker once
+        a source is finished.
+        """
+        for source_name, source in self.sources.items():
+            self._start_source(report, source_name)
+            started = time.perf_counter()
+            count = 0
             try:
-                jobs = scraper_func(title, location, radius)
-                all_jobs.extend(jobs)
-                print(f"Found {len(jobs)} jobs from {source_name}")
+                for job in self._iter_source(source, title, location, radius, watermarks.get(source_name)):
+                    count += 1
+                    yield source_name, job
+                self._record_source(report, source_name, 'ok', started, count)
             except Exception as e:
-                print(f"Error scraping {source_name}: {str(e)}")
+                self._record_source(report, source_name, 'error', started, count, error=e)
+            yield source_name, None
+    
+    def _iter_concurrent(self, title, location, radius, watermarks, report):
+        """
+        Query all sources on a bounded thread pool with per-source deadlines.
+
+        Sources hand jobs over through a bounded queue. A source that has not
+        finished by its deadline is abandoned; jobs it produced before that
+        have already been yielded.
+        """
+        max_workers = min(len(self.sources), self.config.get('SEARCH_MAX_WORKERS', 8))
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-source')
+        queue = Queue(maxsize=self.config.get('STREAM_BUFFER_SIZE', 1000))
+        started = time.perf_counter()
         
-        return all_jobs
+        stop_events = {}
+        deadlines = {}
+        counts = {}
+        for source_name, source in self.sources.items():
+            self._start_source(report, source_name)
+            stop_events[source_name] = threading.Event()
+            deadlines[source_name] = started + self._source_timeout(source_name)
+            counts[source_name] = 0
+            executor.submit(self._produce, source_name, source,
+                            (title, location, radius, watermarks.get(source_name)),
+                            queue, stop_events[source_name])
+        
+        pending = set(self.sources)
+        try:
+            while pending:
+                # Abandon every source past its deadline, even while others keep the queue busy
+                now = time.perf_counter()
+                for source_name in [s for s in pending if deadlines[s] <= now]:
+                    pending.discard(source_name)
+                    stop_events[source_name].set()
+                    self._record_source(report, source_name, 'timeout', started, counts[source_name])
+                    yield source_name, None
+                if not pending:
+                    break
+                
+                next_deadline = min(deadlines[source_name] for source_name in pending)
+                try:
+                    source_name, kind, payload = queue.get(timeout=max(0, next_deadline - now))
+                except Empty:
+                    continue
+                
+                # Drop late output of abandoned sources before it is counted
+                if source_name not in pending or deadlines[source_name] <= time.perf_counter():
+                    continue
+                if kind == 'job':
+                    counts[source_name] += 1
+                    yield source_name, payload
+                else:
+                    pending.discard(source_name)
+                    self._record_source(report, source_name, kind, started, counts[source_name], error=payload)
+                    yield source_name, None
+        finally:
+            # Do not block on sources that overran their deadline
+            for stop_event in stop_events.values():
+                stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
     
-    def _scrape_linkedin(self, title, location, radius):
-        """
-        Scrape jobs from LinkedIn.
-        """
-        # This is a placeholder implementation
-        # In a real implementation, you would use LinkedIn's API or web scraping
-        jobs = []
-        # Example job structure
-        jobs.append({
-            'title': f'{title} at Company A',
-            'company': 'Company A',
-            'location': location,
-            'url': 'https://linkedin.com/jobs/123',
-            'description': 'Job description for Company A'
-        })
-        return jobs
+    def _produce(self, source_name, source, args, queue, stop_event):
+        """
+        Run one source on a worker thread and push its jobs onto the queue.
+        """
+        try:
+            for job in self._iter_source(source, *args):
+                if not self._put(queue, (source_name, 'job', job), stop_event):
+                    return
+            self._put(queue, (source_name, 'ok', None), stop_event)
+        except Exception as e:
+            self._put(queue, (source_name, 'error', e), stop_event)
     
-    def _scrape_indeed(self, title, location, radius):
-        """
-        Scrape jobs from Indeed.
-        """
-        # This is a placeholder implementation
-        jobs = []
-        # Example job structure
-        jobs.append({
-            'title': f'Senior {title} at Company B',
-            'company': 'Company B',
-            'location': location,
-            'url': 'https://indeed.com/jobs/456',
-            'description': 'Job description for Company B'
-        })
-        return jobs
+    def _put(self, queue, item, stop_event):
+        """
+        Put an item on the queue, giving up once the search has stopped.
+        """
+        while not stop_event.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+    
+    def _iter_source(self, source, title, location, radius, since=None):
+        """
+        Return an iterator over the jobs of a connector or plain function source.
+        """
+        if hasattr(source, 'iter_search'):
+            return source.iter_search(title, location, radius, since=since)
+        return iter(source(title, location, radius))
+    
+    def _is_duplicate(self, job, run_id, matched, incremental):
+        """
+        Check a job against the dedup index, indexing it if it is unseen.
+
+        `matched` collects index entries already matched during this run, so
+        a posting from an earlier run is yielded at most once per search.
+        """
+        duplicate = self.dedup.check_and_add(job, run_id)
+        if duplicate is None:
+            return False
+        if duplicate['run_id'] == run_id or incremental or duplicate['id'] in matched:
+            job['duplicate_of'] = duplicate['url']
+            return True
+        matched.add(duplicate['id'])
+        return False
+    
+    def _advance_watermark(self, source_name, watermark, newest):
+        """
+        Persist the newest posting time seen for a source.
+        """
+        if newest and (not watermark or newest > watermark):
+            self.cache.set_watermark(source_name, newest.isoformat())
+    
+    def _source_timeout(self, source_name):
+        """
+        Return the deadline in seconds for a source.
+        """
+        return self.source_timeouts.get(source_name, self.config.get('SOURCE_TIMEOUT', 30))
+    
+    def _start_source(self, report, source_name):
+        """
+        Create the report entry for a source that is about to run.
+        """
+        report[source_name] = {
+            'status': 'running',
+            'jobs': 0,
+            'elapsed': 0.0,
+            'error': None
+        }
     
-    def _scrape_stepstone(self, title, location, radius):
-        """
-        Scrape jobs from Stepstone.
-        """
-        # This is a placeholder implementation
-        jobs = []
-        # Example job structure
-        jobs.append({
-            'title': f'Lead {title} at Company C',
-            'company': 'Company C',
-            'location': location,
-            'url': 'https://stepstone.com/jobs/789',
-            'description': 'Job description for Company C'
+    def _record_source(self, report, source_name, status, started, count, error=None):
+        """
+        Record the outcome of a single source in the search report.
+        """
+        elapsed = time.perf_counter() - started
+        report[source_name].update({
+            'status': status,
+            'jobs': count,
+            'elapsed': elapsed,
+            'error': str(error) if error else None
         })
-        return jobs
\ No newline at end of file
+        metrics.observe('job_scrape_seconds', elapsed, source=source_name, status=status)
+        metrics.increment('jobs_scraped_total', count, source=source_name)
+        
+        if status == 'ok':
+            print(f"Found {count} jobs from {source_name} in {elapsed:.2f}s")
+        elif status == 'timeout':
+            print(f"Timed out scraping {source_name} after {elapsed:.2f}s")
+        else:
+            print(f"Error scraping {source_name}: {str(error)}")
@@ -0,0 +1,115 @@
+"""
+Persistent HTTP page cache and crawl watermarks for incremental crawls.
+"""
+import os
+import time
+from urllib.parse import urlencode
+
+from utils.sqlite_store import SQLiteStore, get_shared
+
+def get_page_cache(config):
+    """
+    Return the shared page cache for the configured path, or None if disabled.
+    """
+    if not config.get('PAGE_CACHE_ENABLED', True):
+        return None
+    path = config.get('PAGE_CACHE_PATH', os.path.join('output', 'page_cache.db'))
+    max_bytes = int(config.get('PAGE_CACHE_MAX_MB', 256) * 1024 * 1024)
+    return get_shared(PageCache, path, lambda: PageCache(path, max_bytes=max_bytes))
+
+class PageCache(SQLiteStore):
+    """
+    On-disk cache of HTTP responses keyed by URL and query.
+
+    Entries keep their ETag/Last-Modified validators so pages can be
+    revalidated with conditional requests, and the least recently used
+    entries are evicted once the cache grows beyond `max_bytes`.
+    """
+    SCHEMA = (
+        ('CREATE TABLE IF NOT EXISTS pages ('
+         'key TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, '
+         'body BLOB, size INTEGER, last_access REAL)'),
+        'CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access)',
+        'CREATE TABLE IF NOT EXISTS watermarks (source TEXT PRIMARY KEY, value TEXT)',
+    )
+    
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+    
+    @staticmethod
+    def make_key(url, params=None):
+        """
+        Build a cache key from a URL and its query parameters.
+        """
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+    
+    def get(self, key):
+        """
+        Return the cached entry for a key and mark it as recently used.
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT url, etag, last_modified, body FROM pages WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE pages SET last_access = ? WHERE key = ?', (time.time(), key))
+            conn.commit()
+        return {'url': row[0], 'etag': row[1], 'last_modified': row[2], 'body': row[3]}
+    
+    def put(self, key, url, body, etag=None, last_modified=None):
+        """
+        Store a response body with its validators, evicting old entries if needed.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO pages (key, url, etag, last_modified, body, size, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, url, etag, last_modified, body, len(body), time.time())
+            )
+            self._evict(conn)
+            conn.commit()
+    
+    def size(self):
+        """
+        Return the total size of cached bodies in bytes.
+        """
+        with self._lock:
+            return self._connect().execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+    
+    def get_watermark(self, source):
+        """
+        Return the newest posting marker seen for a source.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT value FROM watermarks WHERE source = ?', (source,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set_watermark(self, source, value):
+        """
+        Record the newest posting marker seen for a source.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute('INSERT OR REPLACE INTO watermarks (source, value) VALUES (?, ?)', (source, value))
+            conn.commit()
+    
+    def _evict(self, conn):
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+        """
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute('SELECT key, size FROM pages ORDER BY last_access').fetchall():
+            conn.execute('DELETE FROM pages WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
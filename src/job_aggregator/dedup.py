@@ -0,0 +1,247 @@
+"""
+Near-duplicate detection for job postings collected from several boards.
+"""
+import hashlib
+import os
+import re
+import time
+
+from utils.sqlite_store import SQLiteStore, get_shared
+
+FINGERPRINT_BITS = 64
+# Four 16-bit bands: any two fingerprints within 3 bits share at least one band
+LSH_BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // LSH_BANDS
+
+_GENDER_TAGS = re.compile(r'\((?:[mwfdx]\s*/\s*)+[mwfdx]\)|\b(?:[mwfdx]/)+[mwfdx]\b')
+_NON_WORD = re.compile(r'[^\w+#]+')
+_COMPANY_SUFFIXES = {'gmbh', 'ag', 'inc', 'ltd', 'llc', 'corp', 'co', 'se', 'plc', 'kg', 'limited'}
+# Bit positions as a numpy array, built on the first fingerprint
+_bit_shifts = None
+
+def get_dedup_index(config):
+    """
+    Return the shared dedup index for the configured path, or None if disabled.
+    """
+    if not config.get('DEDUP_ENABLED', True):
+        return None
+    path = config.get('DEDUP_PATH', os.path.join('output', 'dedup.db'))
+    return get_shared(DedupIndex, path, lambda: DedupIndex(
+        path,
+        max_distance=config.get('DEDUP_MAX_DISTANCE', 3),
+        retention=config.get('DEDUP_RETENTION_DAYS', 90) * 86400
+    ))
+
+def normalize_text(value):
+    """
+    Lowercase a field and strip punctuation and gender tags like '(m/w/d)'.
+    """
+    value = _GENDER_TAGS.sub(' ', (value or '').lower())
+    return ' '.join(_NON_WORD.sub(' ', value).split())
+
+def normalize_company(value):
+    """
+    Normalize a company name and drop legal suffixes like 'GmbH' or 'Inc'.
+    """
+    words = normalize_text(value).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def job_key(job):
+    """
+    Return the normalized company/title/location key of a job.
+
+    Returns None if the company or title is missing, since such a key
+    would match every other posting that lacks them.
+    """
+    company = normalize_company(job.get('company'))
+    title = normalize_text(job.get('title'))
+    if not company or not title:
+        return None
+    return '|'.join([company, title, normalize_text(job.get('location'))])
+
+def simhash(text, shingle_size=3):
+    """
+    Compute a 64-bit SimHash of a text over word shingles.
+    """
+    global _bit_shifts
+    import numpy as np
+    
+    words = normalize_text(text).split()
+    if not words:
+        return None
+    if len(words) < shingle_size:
+        shingles = [' '.join(words)]
+    else:
+        shingles = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+         for s in shingles],
+        dtype=np.uint64
+    )
+    if _bit_shifts is None:
+        _bit_shifts = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+    bits = (hashes[:, None] >> _bit_shifts) & np.uint64(1)
+    votes = bits.sum(axis=0) * 2 > len(shingles)
+    return int(np.sum(votes.astype(np.uint64) << _bit_shifts))
+
+def hamming_distance(a, b):
+    """
+    Return the number of differing bits between two fingerprints.
+    """
+    return bin(a ^ b).count('1')
+
+def _bands(fingerprint):
+    """
+    Split a fingerprint into its LSH band values.
+    """
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (band * BAND_BITS)) & mask for band in range(LSH_BANDS)]
+
+def _to_signed(value):
+    """
+    Map an unsigned 64-bit value onto SQLite's signed INTEGER range.
+    """
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+def _to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+class DedupIndex(SQLiteStore):
+    """
+    Persistent index of seen postings for near-duplicate lookup.
+
+    A posting is a duplicate of an indexed one if it has the same URL, the
+    same normalized company/title/location and a matching description (or
+    no description on either side), or the same company and a description
+    SimHash within `max_distance` bits. Description candidates come from
+    LSH band lookups, so the cost per job does not grow with the size of
+    the history. Postings first seen more than `retention` seconds ago are
+    pruned, at most once an hour.
+    """
+    SCHEMA = (
+        ('CREATE TABLE IF NOT EXISTS postings ('
+         'id INTEGER PRIMARY KEY, key TEXT, company TEXT, url TEXT, source TEXT, '
+         'fingerprint INTEGER, run_id TEXT, seen_at REAL)'),
+        'CREATE INDEX IF NOT EXISTS idx_postings_key ON postings (key)',
+        'CREATE INDEX IF NOT EXISTS idx_postings_url ON postings (url)',
+        'CREATE INDEX IF NOT EXISTS idx_postings_seen ON postings (seen_at)',
+        'CREATE TABLE IF NOT EXISTS buckets (band INTEGER, value INTEGER, posting_id INTEGER)',
+        'CREATE INDEX IF NOT EXISTS idx_buckets_band ON buckets (band, value)',
+        'CREATE INDEX IF NOT EXISTS idx_buckets_posting ON buckets (posting_id)',
+    )
+    
+    def __init__(self, path, max_distance=3, retention=90 * 86400):
+        if max_distance >= LSH_BANDS:
+            raise ValueError(f"max_distance must be below {LSH_BANDS} for exact LSH recall")
+        super().__init__(path)
+        self.max_distance = max_distance
+        self.retention = retention
+        self._pruned_at = 0.0
+    
+    def find_duplicate(self, job):
+        """
+        Return the indexed posting a job duplicates, or None.
+        """
+        with self._lock:
+            return self._find(self._connect(), job, job_key(job), simhash(job.get('description')))
+    
+    def add(self, job, run_id=None):
+        """
+        Add a job to the index and return its id.
+        """
+        with self._lock:
+            conn = self._connect()
+            self._prune(conn)
+            job_id = self._insert(conn, job, job_key(job), simhash(job.get('description')), run_id)
+            conn.commit()
+            return job_id
+    
+    def check_and_add(self, job, run_id=None):
+        """
+        Return the posting a job duplicates, or index it and return None.
+        """
+        key = job_key(job)
+        fingerprint = simhash(job.get('description'))
+        with self._lock:
+            conn = self._connect()
+            self._prune(conn)
+            duplicate = self._find(conn, job, key, fingerprint)
+            if duplicate is None:
+                self._insert(conn, job, key, fingerprint, run_id)
+            conn.commit()
+            return duplicate
+    
+    def count(self):
+        """
+        Return the number of indexed postings.
+        """
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+    
+    def _prune(self, conn):
+        """
+        Delete postings older than the retention period, at most once an hour.
+        """
+        now = time.time()
+        if now - self._pruned_at < 3600:
+            return
+        self._pruned_at = now
+        cutoff = now - self.retention
+        conn.execute(
+            'DELETE FROM buckets WHERE posting_id IN (SELECT id FROM postings WHERE seen_at < ?)', (cutoff,))
+        conn.execute('DELETE FROM postings WHERE seen_at < ?', (cutoff,))
+    
+    def _find(self, conn, job, key, fingerprint):
+        url = job.get('url')
+        if url:
+            row = conn.execute('SELECT id, url, source, run_id FROM postings WHERE url = ?', (url,)).fetchone()
+            if row:
+                return self._match(row, 'url')
+        
+        if key is not None:
+            rows = conn.execute(
+                'SELECT id, url, source, run_id, fingerprint FROM postings WHERE key = ?', (key,)
+            ).fetchall()
+            for row in rows:
+                # Separate openings can share a title and place but not their description
+                if (fingerprint is None or row[4] is None
+                        or hamming_distance(fingerprint, _to_unsigned(row[4])) <= self.max_distance):
+                    return self._match(row, 'key')
+        
+        if fingerprint is None:
+            return None
+        company = normalize_company(job.get('company'))
+        clauses = ' OR '.join(['(band = ? AND value = ?)'] * LSH_BANDS)
+        params = []
+        for band, value in enumerate(_bands(fingerprint)):
+            params.extend([band, value])
+        rows = conn.execute(
+            'SELECT DISTINCT p.id, p.url, p.source, p.run_id, p.company, p.fingerprint '
+            f'FROM buckets b JOIN postings p ON p.id = b.posting_id WHERE {clauses}',
+            params
+        ).fetchall()
+        for row in rows:
+            if row[4] == company and hamming_distance(fingerprint, _to_unsigned(row[5])) <= self.max_distance:
+                return self._match(row, 'description')
+        return None
+    
+    def _insert(self, conn, job, key, fingerprint, run_id):
+        cursor = conn.execute(
+            'INSERT INTO postings (key, company, url, source, fingerprint, run_id, seen_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (key, normalize_company(job.get('company')), job.get('url'), job.get('source'),
+             _to_signed(fingerprint) if fingerprint is not None else None, run_id, time.time())
+        )
+        job_id = cursor.lastrowid
+        if fingerprint is not None:
+            conn.executemany(
+                'INSERT INTO buckets (band, value, posting_id) VALUES (?, ?, ?)',
+                [(band, value, job_id) for band, value in enumerate(_bands(fingerprint))]
+            )
+        return job_id
+    
+    def _match(self, row, reason):
+        return {'id': row[0], 'url': row[1], 'source': row[2], 'run_id': row[3], 'reason': reason}
@@ -0,0 +1,90 @@
+"""
+Shared HTTP session with keep-alive connection pooling for job connectors.
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.rate_limit import THROTTLE_STATUSES, domain_of, get_rate_limiter, parse_retry_after
+
+USER_AGENT = 'Mozilla/5.0 (compatible; AutoApplyBot/1.0)'
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTP adapter that waits for the shared per-domain rate limiter before sending.
+
+    Throttling responses (429/503) are reported to the limiter, which slows
+    the domain down for every thread and process, and are retried here
+    once the limiter allows.
+    """
+    def __init__(self, limiter, throttle_retries=3, **kwargs):
+        self.limiter = limiter
+        self.throttle_retries = throttle_retries
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        domain = domain_of(request.url)
+        for attempt in range(self.throttle_retries + 1):
+            self.limiter.acquire(domain)
+            response = super().send(request, **kwargs)
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.limiter.record(domain, response.status_code, retry_after)
+            if response.status_code not in THROTTLE_STATUSES or attempt == self.throttle_retries:
+                return response
+            response.close()
+        return response
+
+def create_session(config):
+    """
+    Create a requests session with a pooled adapter and retry/backoff policy.
+
+    The adapter keeps one keep-alive pool per host, so repeated requests to
+    the same job board reuse open TCP/TLS connections. With the rate
+    limiter enabled, throttling responses are left to the limiter instead
+    of urllib3's own retries.
+    """
+    limiter = get_rate_limiter(config)
+    retry = Retry(
+        total=config.get('HTTP_MAX_RETRIES', 3),
+        backoff_factor=config.get('HTTP_BACKOFF', 0.5),
+        status_forcelist=(500, 502, 504) if limiter else (429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=limiter is None
+    )
+    pool_args = {
+        'pool_connections': config.get('HTTP_POOL_HOSTS', 10),
+        'pool_maxsize': config.get('HTTP_POOL_SIZE', 10),
+        'max_retries': retry
+    }
+    if limiter is not None:
+        adapter = RateLimitedAdapter(limiter, throttle_retries=config.get('HTTP_MAX_RETRIES', 3), **pool_args)
+    else:
+        adapter = HTTPAdapter(**pool_args)
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+def get_session(config):
+    """
+    Return the process-wide session for the given pool settings.
+    """
+    key = (
+        config.get('HTTP_POOL_HOSTS', 10),
+        config.get('HTTP_POOL_SIZE', 10),
+        config.get('HTTP_MAX_RETRIES', 3),
+        config.get('HTTP_BACKOFF', 0.5),
+        config.get('RATE_LIMIT_ENABLED', True),
+        config.get('RATE_LIMIT_PATH', 'output/rate_limits.db')
+    )
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = create_session(config)
+        return _sessions[key]
@@ -1,10 +1,26 @@
 """
 Main entry point for the automated job search and application system.
 """
+import argparse
+import importlib
 import os
 import sys
 
-def main():
+# Menu subsystems and the classes that implement them, imported on first use
+SUBSYSTEMS = {
+    'job aggregator': ('job_aggregator.aggregator', 'JobAggregator'),
+    'skills analyzer': ('skills_analysis.analyzer', 'SkillsAnalyzer'),
+    'application bot': ('application_bot.bot', 'ApplicationBot')
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Automated job search and application system")
+    parser.add_argument('--daemon', action='store_true',
+                        help="run the search, dedup, analyze and apply pipeline unattended")
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'],
+                        help="profile this run and write the report to PROFILE_DIR")
+    args = parser.parse_args(argv)
+    
     # Load configuration
     try:
         from config.settings import load_config
@@ -12,28 +28,38 @@ def main():
     except Exception as e:
         print(f"Error loading configuration: {e}")
         return
+    if args.profile:
+        config['PROFILER'] = args.profile
     
-    # Initialize modules with error handling
-    try:
-        from job_aggregator.aggregator import JobAggregator
-        job_aggregator = JobAggregator(config)
-    except Exception as e:
-        print(f"Error initializing job aggregator: {e}")
-        job_aggregator = None
-    
-    try:
-        from skills_analysis.analyzer import SkillsAnalyzer
-        skills_analyzer = SkillsAnalyzer(config)
-    except Exception as e:
-        print(f"Error initializing skills analyzer: {e}")
-        skills_analyzer = None
-    
-    try:
-        from application_bot.bot import ApplicationBot
-        application_bot = ApplicationBot(config)
-    except Exception as e:
-        print(f"Error initializing application bot: {e}")
-        application_bot = None
+    from utils import metrics
+    metrics.configure(config)
+    with metrics.profile_run(config, 'daemon' if args.daemon else 'session'):
+        if args.daemon:
+            from pipeline.daemon import PipelineDaemon
+            PipelineDaemon(config).run()
+        else:
+            run_interactive(config)
+
+def load_subsystem(config, name, modules):
+    """
+    Import and initialize a menu subsystem once, returning None if it fails.
+    """
+    if name not in modules:
+        module_name, class_name = SUBSYSTEMS[name]
+        try:
+            module = importlib.import_module(module_name)
+            modules[name] = getattr(module, class_name)(config)
+        except Exception as e:
+            print(f"Error initializing {name}: {e}")
+            modules[name] = None
+    return modules[name]
+
+def run_interactive(config):
+    """
+    Run the interactive menu.
+    """
+    # Selenium, spaCy and friends load only when their option is first chosen
+    modules = {}
     
     # Display menu
     while True:
@@ -42,11 +68,13 @@ def main():
         print("2. Analyze Skills")
         print("3. Apply to Jobs")
         print("4. Open Dashboard")
-        print("5. Exit")
+        print("5. Search Saved Jobs")
+        print("6. Exit")
         
         choice = input("Enter your choice: ")
         
         if choice == "1":
+            job_aggregator = load_subsystem(config, 'job aggregator', modules)
             if job_aggregator is None:
                 print("Job aggregator module not available.")
                 continue
@@ -56,10 +84,18 @@ def main():
             location = input("Location: ")
             radius = input("Radius (km): ")
             
-            jobs = job_aggregator.search_jobs(title, location, radius)
+            # Stream jobs so results show up as each source delivers them
+            jobs = []
+            for job in job_aggregator.iter_jobs(title, location, radius):
+                jobs.append(job)
+                print(f"  [{job['source']}] {job.get('title', '')} - {job.get('company', '')}")
             print(f"Found {len(jobs)} jobs")
+            if jobs:
+                from utils.helpers import save_job_data
+                print(f"Saved to {save_job_data(jobs, config=config)}")
             
         elif choice == "2":
+            skills_analyzer = load_subsystem(config, 'skills analyzer', modules)
             if skills_analyzer is None:
                 print("Skills analyzer module not available.")
                 continue
@@ -73,6 +109,7 @@ def main():
             print(analysis)
             
         elif choice == "3":
+            application_bot = load_subsystem(config, 'application bot', modules)
             if application_bot is None:
                 print("Application bot module not available.")
                 continue
@@ -95,6 +132,38 @@ def main():
                 print("Dashboard module not available.")
             
         elif choice == "5":
+            # Query the index over every stored crawl instead of searching again
+            from utils.job_index import get_job_index
+            index = get_job_index(config, load_subsystem(config, 'skills analyzer', modules))
+            print(f"Indexed {index.refresh()} new jobs")
+            keywords = input("Keywords (or leave blank): ")
+            location = input("Location (or leave blank): ")
+            skills = input("Required skills, comma-separated (or leave blank): ")
+            resume_path = input("Path to resume to match against (or leave blank): ")
+            
+            resume_skills = None
+            min_match = None
+            if resume_path:
+                resume_skills = index.analyzer.extract_resume_skills(resume_path)
+                if not resume_skills:
+                    print("No skills found in that resume.")
+                    continue
+                min_match = input(f"Minimum match % [{config['SKILLS_THRESHOLD'] * 100:.0f}]: ")
+                try:
+                    min_match = float(min_match) if min_match else config['SKILLS_THRESHOLD'] * 100
+                except ValueError:
+                    print("Minimum match must be a number.")
+                    continue
+            results = index.search(text=keywords or None, location=location or None,
+                                   skills=[skill.strip() for skill in skills.split(',') if skill.strip()],
+                                   resume_skills=resume_skills, min_match=min_match)
+            for job in results:
+                match = f" ({job['skill_match_percentage']:.0f}% match)" if resume_skills is not None else ""
+                print(f"  [{job['source']}] {job['title']} - {job['company']}, {job['location']}{match}")
+                print(f"      {job['url']}")
+            print(f"Found {len(results)} jobs")
+            
+        elif choice == "6":
             print("Exiting...")
             sys.exit(0)
             
@@ -0,0 +1,3 @@
+"""
+Initialization file for pipeline module.
+"""
\ No newline at end of file
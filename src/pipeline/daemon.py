@@ -0,0 +1,264 @@
+"""
+Headless daemon that runs the search -> dedup -> analyze -> apply pipeline.
+"""
+import os
+import signal
+import threading
+import time
+
+from utils import metrics
+from utils.job_index import get_job_index
+from utils.job_store import get_job_store
+
+from .tasks import TaskQueue
+
+STAGES = ('search', 'dedup', 'analyze', 'apply')
+NEXT_STAGE = {'search': 'dedup', 'dedup': 'analyze', 'analyze': 'apply', 'apply': None}
+
+class PermanentTaskError(Exception):
+    """
+    A task failure that must not be retried, e.g. an application that may already be sent.
+    """
+
+class PipelineDaemon:
+    """
+    Runs every pipeline stage on its own worker threads, fed by a durable queue.
+
+    Each stage handler takes a claimed task and returns (key, payload) pairs
+    for the next stage; the hand-off is committed together with the task, so
+    a crash never loses or duplicates work. Periodic searches are scheduled
+    with `schedule`. Several daemons may share one queue file to spread the
+    work over more processes.
+    """
+    def __init__(self, config, queue=None, handlers=None, workers=None):
+        self.config = config
+        self.queue = queue or TaskQueue(
+            config.get('PIPELINE_QUEUE_PATH', os.path.join('output', 'pipeline.db')),
+            lease_seconds=config.get('PIPELINE_LEASE_SECONDS', 600),
+            max_attempts=config.get('PIPELINE_MAX_ATTEMPTS', 5),
+            backoff=config.get('PIPELINE_BACKOFF', 30.0)
+        )
+        self.handlers = {
+            'search': self._search,
+            'dedup': self._dedup,
+            'analyze': self._analyze,
+            'apply': self._apply
+        }
+        self.handlers.update(handlers or {})
+        self.workers = dict(config.get('PIPELINE_WORKERS', {}))
+        self.workers.update(workers or {})
+        self.poll_interval = config.get('PIPELINE_POLL_INTERVAL', 1.0)
+        self.stop_event = threading.Event()
+        self._threads = []
+        self._local = threading.local()
+        self._modules_lock = threading.Lock()
+        self._aggregator = None
+        self._dedup = None
+        self._analyzer = None
+    
+    def schedule_searches(self):
+        """
+        Enqueue one search task per configured title for the current interval.
+
+        The interval number is part of the task key, so several daemons
+        scheduling the same search only queue it once.
+        """
+        interval = self.config.get('SEARCH_INTERVAL_MINUTES', 60) * 60
+        slot = int(time.time() // interval)
+        location = self.config.get('DEFAULT_LOCATION', 'Remote')
+        radius = self.config.get('DEFAULT_RADIUS', 50)
+        added = 0
+        for title in self.config.get('SEARCH_TITLES', []):
+            payload = {'title': title, 'location': location, 'radius': radius}
+            added += self.queue.enqueue('search', f"{title}|{location}|{radius}|{slot}", payload)
+        return added
+    
+    def start(self):
+        """
+        Recover expired leases and start the stage worker threads.
+        """
+        recovered = self.queue.recover()
+        if recovered:
+            print(f"Recovered {recovered} interrupted tasks")
+        self.stop_event.clear()
+        for stage in STAGES:
+            for number in range(max(self.workers.get(stage, 1), 0)):
+                thread = threading.Thread(target=self._work, args=(stage, f'{stage}-{os.getpid()}-{number}'),
+                                          name=f'pipeline-{stage}-{number}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+    
+    def stop(self, timeout=None):
+        """
+        Ask the workers to stop after their current task and wait for them.
+        """
+        self.stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def run(self):
+        """
+        Run the daemon until interrupted, searching every SEARCH_INTERVAL_MINUTES.
+        """
+        import schedule
+        
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop_event.set())
+        scheduler = schedule.Scheduler()
+        scheduler.every(self.config.get('SEARCH_INTERVAL_MINUTES', 60)).minutes.do(self.schedule_searches)
+        self.schedule_searches()
+        self.start()
+        print(f"Pipeline daemon running with workers {self._worker_counts()}")
+        try:
+            while not self.stop_event.is_set():
+                scheduler.run_pending()
+                self.stop_event.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Stopping pipeline daemon...")
+        finally:
+            self.stop()
+            self.queue.close()
+    
+    def drain(self, timeout=60):
+        """
+        Process tasks until every stage is idle, then stop. Returns the task counts.
+        """
+        self.start()
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                counts = self.queue.counts()
+                busy = any(statuses.get('pending', 0) or statuses.get('running', 0)
+                           for statuses in counts.values())
+                if not busy:
+                    break
+                time.sleep(0.05)
+        finally:
+            self.stop()
+        return self.queue.counts()
+    
+    def _work(self, stage, worker):
+        """
+        Worker loop: claim, handle and complete tasks of one stage.
+        """
+        handler = self.handlers[stage]
+        while not self.stop_event.is_set():
+            task = self.queue.claim(stage, worker)
+            if task is None:
+                self.stop_event.wait(self.poll_interval)
+                continue
+            try:
+                with metrics.span('pipeline_task', stage=stage):
+                    next_tasks = handler(task) or []
+            except Exception as e:
+                status = self.queue.fail(task['id'], worker, f"{type(e).__name__}: {e}",
+                                         retry=not isinstance(e, PermanentTaskError))
+                print(f"Error in {stage} task {task['key']} (attempt {task['attempts']}): {e}"
+                      + {'pending': "", 'failed': " - giving up"}.get(status, " - lease lost to another worker"))
+                continue
+            if not self.queue.complete(task['id'], worker, NEXT_STAGE[stage], next_tasks):
+                print(f"Discarding result of {stage} task {task['key']}: lease lost to another worker")
+                continue
+            metrics.increment('pipeline_tasks_total', stage=stage)
+    
+    def _worker_counts(self):
+        return {stage: max(self.workers.get(stage, 1), 0) for stage in STAGES}
+    
+    def _search(self, task):
+        """
+        Run a search, store its jobs and hand every job to the dedup stage.
+        """
+        payload = task['payload']
+        jobs = list(self._get_aggregator().iter_jobs(payload['title'], payload['location'], payload['radius']))
+        # Keep every crawl in the job store, tagged with its search task
+        get_job_store(self.config).append(jobs, run_id=task['key'])
+        # Make the new postings searchable; a failed refresh is retried by the next search
+        try:
+            get_job_index(self.config, self._get_analyzer()).refresh()
+        except Exception as e:
+            print(f"Error indexing jobs: {e}")
+        return [(f"{job.get('source', '')}:{job.get('url') or job.get('title', '')}", job) for job in jobs]
+    
+    def _dedup(self, task):
+        """
+        Drop jobs already posted under another URL or source.
+        """
+        job = task['payload']
+        dedup = self._get_dedup()
+        if dedup is not None:
+            # The task key tags the index entry, so a retried task never matches itself
+            duplicate = dedup.check_and_add(job, run_id=task['key'])
+            if duplicate is not None and duplicate['run_id'] != task['key']:
+                return []
+        return [(task['key'], job)]
+    
+    def _analyze(self, task):
+        """
+        Score a job against the resume and pass good matches on to the apply stage.
+        """
+        job = task['payload']
+        resume_path = self.config.get('PIPELINE_RESUME', '')
+        if not resume_path:
+            return []
+        analysis = self._get_analyzer().analyze_resume(resume_path, job.get('description', ''))
+        job['skill_match_percentage'] = analysis['skill_match_percentage']
+        if analysis['skill_match_percentage'] < self.config.get('APPLY_MIN_MATCH', 70):
+            return []
+        return [(job.get('url') or task['key'], job)]
+    
+    def _apply(self, task):
+        """
+        Apply to a job when auto-apply is enabled and record it on the dashboard.
+        """
+        job = task['payload']
+        if not self.config.get('AUTO_APPLY', False) or not job.get('url'):
+            return []
+        # Bots hold a browser driver, so each worker thread keeps its own
+        bot = getattr(self._local, 'bot', None)
+        if bot is None:
+            from application_bot.bot import ApplicationBot
+            bot = self._local.bot = ApplicationBot(self.config)
+        result = bot.apply_to_job(job['url'], self.config['PIPELINE_RESUME'],
+                                  self.config.get('PIPELINE_COVER_LETTER') or None)
+        if result.startswith('Error'):
+            # Once the submit button was clicked a retry could send the application twice
+            raise (PermanentTaskError if bot.submit_attempted else RuntimeError)(result)
+        print(f"Applied to {job['url']}: {result}")
+        # Without a confirmation page the applicant still has to finish it by hand
+        self._record_application(job, 'applied' if result.endswith('successfully') else 'pending')
+        return []
+    
+    def _record_application(self, job, status):
+        """
+        Add an application to the dashboard database, which pushes it to open dashboards.
+        """
+        try:
+            from dashboard.recorder import record_application
+            record_application(self.config, job, status, job.get('skill_match_percentage'))
+        except Exception as e:
+            # The application went out; a failed record must not make the task retry it
+            print(f"Error recording application to {job['url']}: {e}")
+    
+    def _get_aggregator(self):
+        with self._modules_lock:
+            if self._aggregator is None:
+                from job_aggregator.aggregator import JobAggregator
+                self._aggregator = JobAggregator(self.config)
+                # Duplicates are dropped by the dedup stage instead
+                self._aggregator.dedup = None
+            return self._aggregator
+    
+    def _get_dedup(self):
+        with self._modules_lock:
+            if self._dedup is None:
+                from job_aggregator.dedup import get_dedup_index
+                self._dedup = get_dedup_index(self.config)
+            return self._dedup
+    
+    def _get_analyzer(self):
+        with self._modules_lock:
+            if self._analyzer is None:
+                from skills_analysis.analyzer import SkillsAnalyzer
+                self._analyzer = SkillsAnalyzer(self.config)
+            return self._analyzer
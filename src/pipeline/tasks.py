@@ -0,0 +1,181 @@
+"""
+Durable SQLite task queue shared by pipeline workers and processes.
+"""
+import json
+import time
+
+from utils.sqlite_store import SQLiteStore
+
+class TaskQueue(SQLiteStore):
+    """
+    Persistent queue of pipeline tasks with leases, retries and idempotent keys.
+
+    Tasks are unique per (stage, key), so enqueueing the same work twice is
+    a no-op. A claimed task is leased to one worker; if the worker dies the
+    lease expires and the task is handed out again, unless that was its
+    last attempt. Failed tasks are retried with exponential backoff until
+    `max_attempts` is reached. Only the worker holding a task can complete
+    or fail it, so a worker whose lease expired cannot overwrite the result
+    of the one that took over. Claims run in IMMEDIATE transactions, so
+    several daemon processes can share one file.
+    """
+    SCHEMA = (
+        ('CREATE TABLE IF NOT EXISTS tasks ('
+         'id INTEGER PRIMARY KEY, stage TEXT NOT NULL, key TEXT NOT NULL, payload TEXT, '
+         'status TEXT NOT NULL, attempts INTEGER NOT NULL, available_at REAL, '
+         'lease_until REAL, worker TEXT, error TEXT, created_at REAL, updated_at REAL, '
+         'UNIQUE (stage, key))'),
+        'CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (stage, status, available_at)',
+    )
+    # Writes take the lock up front with BEGIN IMMEDIATE in _transaction()
+    ISOLATION_LEVEL = None
+    
+    def __init__(self, path, lease_seconds=600, max_attempts=5, backoff=30.0):
+        super().__init__(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+    
+    def enqueue(self, stage, key, payload, delay=0):
+        """
+        Add a task unless one with the same stage and key exists. Returns True if added.
+        """
+        with self._transaction() as conn:
+            return self._insert(conn, stage, key, payload, delay)
+    
+    def claim(self, stage, worker):
+        """
+        Lease the next due task of a stage to a worker, or return None.
+
+        Expired leases of crashed workers count as due, unless the task has
+        used up its attempts, in which case it is marked failed.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._fail_abandoned(conn, now)
+            row = conn.execute(
+                "SELECT id, key, payload, attempts FROM tasks WHERE stage = ? AND ("
+                "(status = 'pending' AND available_at <= ?) OR "
+                "(status = 'running' AND lease_until < ?)) "
+                "ORDER BY available_at, id LIMIT 1",
+                (stage, now, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'running', attempts = attempts + 1, worker = ?, "
+                "lease_until = ?, updated_at = ? WHERE id = ?",
+                (worker, now + self.lease_seconds, now, row[0])
+            )
+        return {'id': row[0], 'stage': stage, 'key': row[1],
+                'payload': json.loads(row[2]), 'attempts': row[3] + 1}
+    
+    def complete(self, task_id, worker, next_stage=None, next_tasks=()):
+        """
+        Mark a task done and enqueue its follow-up tasks in the same transaction.
+
+        `next_tasks` is an iterable of (key, payload) pairs for `next_stage`.
+        Returns False, and enqueues nothing, if the task is no longer leased
+        to `worker`.
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'done', lease_until = NULL, error = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time(), task_id, worker)
+            )
+            if not cursor.rowcount:
+                return False
+            for key, payload in next_tasks:
+                self._insert(conn, next_stage, key, payload, 0)
+        return True
+    
+    def fail(self, task_id, worker, error, retry=True):
+        """
+        Record a failed attempt and schedule a retry, or give up.
+
+        The task fails for good after `max_attempts`, or at once with
+        retry=False. Returns its new status, 'pending' or 'failed', or None
+        if the task is no longer leased to `worker`.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM tasks WHERE id = ? AND worker = ? AND status = 'running'",
+                (task_id, worker)
+            ).fetchone()
+            if row is None:
+                return None
+            if not retry or row[0] >= self.max_attempts:
+                conn.execute(
+                    "UPDATE tasks SET status = 'failed', lease_until = NULL, error = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (error, now, task_id)
+                )
+                return 'failed'
+            conn.execute(
+                "UPDATE tasks SET status = 'pending', lease_until = NULL, error = ?, "
+                "available_at = ?, updated_at = ? WHERE id = ?",
+                (error, now + self.backoff * 2 ** (row[0] - 1), now, task_id)
+            )
+        return 'pending'
+    
+    def recover(self):
+        """
+        Return tasks with expired leases to the pending state. Returns the count.
+
+        Tasks that were on their last attempt are marked failed instead.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._fail_abandoned(conn, now)
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'pending', lease_until = NULL, available_at = ?, "
+                "updated_at = ? WHERE status = 'running' AND lease_until < ?",
+                (now, now, now)
+            )
+        return cursor.rowcount
+    
+    def counts(self):
+        """
+        Return the number of tasks per stage and status.
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT stage, status, COUNT(*) FROM tasks GROUP BY stage, status'
+            ).fetchall()
+        counts = {}
+        for stage, status, count in rows:
+            counts.setdefault(stage, {})[status] = count
+        return counts
+    
+    def get(self, stage, key):
+        """
+        Return a task by stage and key, or None.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT id, status, attempts, payload, error FROM tasks WHERE stage = ? AND key = ?',
+                (stage, key)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'stage': stage, 'key': key, 'status': row[1],
+                'attempts': row[2], 'payload': json.loads(row[3]), 'error': row[4]}
+    
+    def _fail_abandoned(self, conn, now):
+        # A worker that died on the last attempt leaves nothing to retry
+        conn.execute(
+            "UPDATE tasks SET status = 'failed', lease_until = NULL, "
+            "error = 'lease expired on the last attempt', updated_at = ? WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+            (now, now, self.max_attempts)
+        )
+    
+    def _insert(self, conn, stage, key, payload, delay):
+        now = time.time()
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO tasks (stage, key, payload, status, attempts, available_at, '
+            "created_at, updated_at) VALUES (?, ?, ?, 'pending', 0, ?, ?, ?)",
+            (stage, key, json.dumps(payload, default=str), now + delay, now, now)
+        )
+        return cursor.rowcount
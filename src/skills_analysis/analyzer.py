@@ -1,27 +1,51 @@
 """
 Skills analysis module for comparing candidate skills with job requirements.
 """
-import re
+import hashlib
+import importlib
+import importlib.util
+import itertools
+import os
+import threading
 
-# Global flag for spaCy availability
-SPACY_AVAILABLE = False
-nlp = None
+from utils import metrics
 
-# Try to import spaCy, but provide fallback if not available
-try:
-    import importlib
-    spacy = importlib.import_module('spacy')
-    SPACY_AVAILABLE = True
-    try:
-        # Use a lighter model if available
-        nlp = spacy.load("en_core_web_sm")
-    except OSError:
-        # If model not found, disable spaCy features
-        SPACY_AVAILABLE = False
-        print("Warning: spaCy model not found. Using fallback methods.")
-except ImportError:
-    SPACY_AVAILABLE = False
-    print("Warning: spaCy not available. Using fallback tokenization.")
+from .matcher import SkillMatcher
+from .resume_parser import extract_text, file_hash, get_resume_cache
+
+# Cheap availability check; spaCy itself is only imported on first use
+SPACY_AVAILABLE = importlib.util.find_spec('spacy') is not None
+
+# Shared NLP pipelines, loaded lazily and keyed by (model, excluded components)
+_nlp_pipelines = {}
+_nlp_lock = threading.Lock()
+
+def get_nlp(model='en_core_web_sm', exclude=('parser', 'ner')):
+    """
+    Load a spaCy pipeline on first use and share it across the process.
+
+    Components in `exclude` are never loaded. Returns None, with a one-time
+    warning, if spaCy or the model is not installed.
+    """
+    key = (model, tuple(exclude))
+    if key in _nlp_pipelines:
+        return _nlp_pipelines[key]
+    
+    with _nlp_lock:
+        if key not in _nlp_pipelines:
+            nlp = None
+            try:
+                spacy = importlib.import_module('spacy')
+                nlp = spacy.load(model, exclude=list(exclude))
+            except ImportError:
+                print("Warning: spaCy not available. Using fallback tokenization.")
+                metrics.increment('spacy_fallback_total', reason='not_installed')
+            except OSError:
+                # If model not found, disable spaCy features
+                print("Warning: spaCy model not found. Using fallback methods.")
+                metrics.increment('spacy_fallback_total', reason='model_missing')
+            _nlp_pipelines[key] = nlp
+    return _nlp_pipelines[key]
 
 class SkillsAnalyzer:
     def __init__(self, config):
@@ -35,16 +59,30 @@ class SkillsAnalyzer:
             'Machine Learning', 'Data Science', 'AI', 'NLP', 'Computer Vision',
             'Agile', 'Scrum', 'Project Management'
         ]
+        # Alternative spellings mapped to their canonical skill
+        self.skill_aliases = {
+            'k8s': 'Kubernetes', 'golang': 'Go', 'postgres': 'PostgreSQL',
+            'js': 'JavaScript', 'nodejs': 'Node.js', 'vue': 'Vue.js', 'vuejs': 'Vue.js',
+            'reactjs': 'React', 'react.js': 'React', 'angularjs': 'Angular',
+            'mongo': 'MongoDB', 'amazon web services': 'AWS', 'google cloud': 'GCP',
+            'microsoft azure': 'Azure', 'csharp': 'C#', 'cpp': 'C++',
+            'ml': 'Machine Learning', 'artificial intelligence': 'AI',
+            'natural language processing': 'NLP', 'html5': 'HTML', 'css3': 'CSS'
+        }
+        self._matcher = None
+        self._matcher_key = None
+        self._similarity = None
+        self._similarity_key = None
+        self._pool = None
+        self._pool_key = None
+        self._pool_lock = threading.Lock()
     
     def analyze_resume(self, resume_path, job_description=None):
         """
         Analyze a resume and compare with job description if provided.
         """
-        # Extract text from resume (placeholder implementation)
-        resume_text = self._extract_text_from_resume(resume_path)
-        
-        # Extract skills from resume
-        resume_skills = self._extract_skills(resume_text)
+        # Extract text and skills from resume (cached by file content)
+        resume_text, resume_skills = self._resume_profile(resume_path)
         
         analysis = {
             'resume_skills': resume_skills,
@@ -62,6 +100,24 @@ class SkillsAnalyzer:
             if job_skills:
                 analysis['skill_match_percentage'] = len(matching_skills) / len(job_skills) * 100
             
+            # Give partial credit for related skills and free-text requirements
+            # when semantic matching is on
+            index = self._get_similarity_index()
+            if index is not None:
+                credit, source = self._skill_credit(index, resume_skills)
+                job_indices = [index.index[skill] for skill in job_skills]
+                required, earned, phrase_matches = self._requirement_credit(
+                    index, [job_description], resume_skills)[0]
+                required += len(job_skills)
+                earned += float(credit[job_indices].sum())
+                if required:
+                    analysis['skill_match_percentage'] = earned / required * 100
+                analysis['partial_matches'] = {
+                    skill: index.skills[source[i]]
+                    for skill, i in zip(job_skills, job_indices) if 0 < credit[i] < 1
+                }
+                analysis['partial_matches'].update(phrase_matches)
+            
             # Identify missing skills
             analysis['missing_skills'] = list(set(job_skills) - set(resume_skills))
             
@@ -70,29 +126,343 @@ class SkillsAnalyzer:
         
         return analysis
     
+    def extract_resume_skills(self, resume_path):
+        """
+        Return the skills found in a resume, or an empty list if it can't be read.
+        """
+        return self._resume_profile(resume_path)[1]
+    
+    def analyze_batch(self, resume_path, job_descriptions, top_k=None):
+        """
+        Score one resume against many job descriptions in a single pass.
+
+        The resume is parsed once and every job is turned into a row of a
+        sparse job x skill matrix, so match percentages for all jobs come from
+        one sparse matrix-vector product. Jobs may be description strings or
+        job dicts. Returns the resume skills and the results ranked by match
+        percentage; each result keeps the 'index' of its job in the input.
+        """
+        import numpy as np
+        
+        matcher = self.get_matcher()
+        _, resume_skills = self._resume_profile(resume_path)
+        resume_vector = np.zeros(len(matcher.skills), dtype=bool)
+        resume_vector[[matcher.index[skill] for skill in resume_skills]] = True
+        
+        index = self._get_similarity_index()
+        if index is not None:
+            # Read twice: once for the skills, once for free-text requirements
+            job_descriptions = list(job_descriptions)
+        with metrics.span('skill_extraction_batch'):
+            job_matrix = self._skill_matrix(job_descriptions)
+        required = np.diff(job_matrix.indptr).astype(np.float64)
+        if index is not None:
+            # Partial credit per skill, applied to every job in the same product
+            credit, _ = self._skill_credit(index, resume_skills)
+            matched = job_matrix @ credit
+            texts = [self._job_text(job) for job in job_descriptions]
+            for row, (count, earned, _) in enumerate(self._requirement_credit(index, texts, resume_skills)):
+                required[row] += count
+                matched[row] += earned
+        else:
+            matched = job_matrix @ resume_vector.astype(np.int32)
+        percentages = np.zeros(len(required))
+        np.divide(matched * 100.0, required, out=percentages, where=required > 0)
+        
+        # Missing skills are the non-zero entries the resume does not cover
+        missing_flags = ~resume_vector[job_matrix.indices]
+        order = np.argsort(-percentages, kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
+        
+        skills = matcher.skills
+        results = []
+        for row in order.tolist():
+            start, end = job_matrix.indptr[row], job_matrix.indptr[row + 1]
+            missing = job_matrix.indices[start:end][missing_flags[start:end]]
+            results.append({
+                'index': row,
+                'skill_match_percentage': float(percentages[row]),
+                'missing_skills': [skills[i] for i in missing.tolist()]
+            })
+        
+        return {
+            'resume_skills': [skills[i] for i in np.flatnonzero(resume_vector).tolist()],
+            'results': results
+        }
+    
+    def iter_analyze(self, resume_path, jobs):
+        """
+        Score one resume against a stream of jobs, yielding results in input order.
+
+        Unlike `analyze_batch` nothing is ranked or collected, so a whole
+        crawl (e.g. `JobStore.iter_jobs()`) can be scanned in constant
+        memory. Each result has the job's 'index', 'skill_match_percentage'
+        and 'missing_skills'.
+        """
+        matcher = self.get_matcher()
+        _, resume_skills = self._resume_profile(resume_path)
+        resume_indices = {matcher.index[skill] for skill in resume_skills}
+        index = self._get_similarity_index()
+        credit = self._skill_credit(index, resume_skills)[0] if index is not None else None
+        if credit is not None:
+            jobs, texts = itertools.tee(jobs)
+        
+        for position, found in enumerate(self.iter_skill_indices(jobs)):
+            required = len(found)
+            if credit is not None:
+                matched = float(credit[found].sum()) if found else 0.0
+                count, earned, _ = self._requirement_credit(index, [self._job_text(next(texts))], resume_skills)[0]
+                required += count
+                matched += earned
+            else:
+                matched = sum(1 for i in found if i in resume_indices)
+            yield {
+                'index': position,
+                'skill_match_percentage': matched / required * 100 if required else 0,
+                'missing_skills': [matcher.skills[i] for i in found if i not in resume_indices]
+            }
+    
+    def get_matcher(self):
+        """
+        Return the compiled matcher, rebuilding it if the taxonomy was replaced
+        or extended.
+        """
+        key = (id(self.tech_skills), len(self.tech_skills),
+               id(self.skill_aliases), len(self.skill_aliases))
+        if self._matcher is None or self._matcher_key != key:
+            self._matcher = SkillMatcher(self.tech_skills, self.skill_aliases)
+            self._matcher_key = key
+        return self._matcher
+    
+    def iter_skill_indices(self, jobs):
+        """
+        Yield the taxonomy indices of the skills in each job, in input order.
+
+        With ANALYSIS_WORKERS above 1 (0 means one per core), batches larger
+        than two chunks are spread over a process pool; smaller ones are not
+        worth sending to the workers. The pool is started on first use and
+        kept for later batches until `close` is called.
+        """
+        workers = self.config.get('ANALYSIS_WORKERS', 1) or os.cpu_count() or 1
+        chunk_size = self.config.get('ANALYSIS_CHUNK_SIZE', 256)
+        if workers > 1 and not (hasattr(jobs, '__len__') and len(jobs) < 2 * chunk_size):
+            yield from self._get_pool(workers, chunk_size).iter_indices(jobs)
+            return
+        
+        matcher = self.get_matcher()
+        texts = (self._job_text(job) for job in jobs)
+        nlp = self._get_nlp()
+        if nlp is not None:
+            texts = self._iter_prepared(nlp, texts)
+        for text in texts:
+            yield matcher.find_indices(text)
+    
+    def close(self):
+        """
+        Stop the skill extraction worker processes, if any were started.
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+    
+    def taxonomy_signature(self):
+        """
+        Return a fingerprint of everything that affects extracted skills.
+        """
+        state = repr((self.tech_skills, sorted(self.skill_aliases.items()),
+                      self.config.get('USE_SPACY', False)))
+        return hashlib.sha1(state.encode('utf-8')).hexdigest()
+    
+    def _get_pool(self, workers, chunk_size):
+        """
+        Return the worker pool, replacing it if the taxonomy or pool size changed.
+        """
+        from .parallel import SkillAnalysisPool
+        
+        key = (workers, chunk_size, self.taxonomy_signature())
+        with self._pool_lock:
+            if self._pool is None or self._pool_key != key:
+                if self._pool is not None:
+                    self._pool.close()
+                self._pool = SkillAnalysisPool(self, workers=workers, chunk_size=chunk_size)
+                self._pool_key = key
+            return self._pool
+    
+    def _get_similarity_index(self):
+        """
+        Return the skill similarity index if semantic matching is enabled.
+
+        The index is loaded memory-mapped from SIMILARITY_INDEX_PATH and
+        rebuilt offline-style (then saved) only when the taxonomy changed.
+        """
+        if not self.config.get('SEMANTIC_MATCHING', False):
+            return None
+        self.get_matcher()
+        if self._similarity is None or self._similarity_key != self._matcher_key:
+            from .similarity import load_or_build_index
+            path = self.config.get('SIMILARITY_INDEX_PATH', os.path.join('output', 'skill_index'))
+            self._similarity = load_or_build_index(path, self.tech_skills, self.skill_aliases)
+            self._similarity_key = self._matcher_key
+        return self._similarity
+    
+    def _skill_credit(self, index, resume_skills):
+        """
+        Return per-skill partial credit and its source skill for a resume.
+        """
+        return index.credit_vector([index.index[skill] for skill in resume_skills],
+                                   self.config.get('SIMILARITY_MIN_SCORE', 0.5))
+    
+    def _requirement_credit(self, index, texts, resume_skills):
+        """
+        Return partial credit for the free-text requirements of each job text.
+
+        Requirement clauses that name no taxonomy skill but are close to one,
+        such as 'relational databases', count as one more requirement of
+        their job. Each earns its best similarity to a resume skill, or 0
+        below SIMILARITY_MIN_SCORE. Returns one (requirements, credit,
+        {phrase: resume skill}) tuple per text; all phrases are compared
+        in one matrix product.
+        """
+        import numpy as np
+        from .similarity import requirement_phrases
+        
+        min_score = self.config.get('SIMILARITY_MIN_SCORE', 0.5)
+        matcher = self.get_matcher()
+        owners, phrases = [], []
+        for position, text in enumerate(texts):
+            for phrase in requirement_phrases(text):
+                if not matcher.find_indices(phrase):
+                    owners.append(position)
+                    phrases.append(phrase)
+        results = [[0, 0.0, {}] for _ in texts]
+        if not phrases:
+            return [tuple(result) for result in results]
+        
+        similarity = index.phrase_similarity(phrases)
+        relevant = similarity.max(axis=1) >= min_score
+        owned = [index.index[skill] for skill in resume_skills]
+        credit = np.zeros(len(phrases), dtype=np.float32)
+        if owned:
+            best = similarity[:, owned].argmax(axis=1)
+            credit = similarity[np.arange(len(phrases)), np.asarray(owned)[best]]
+            credit[credit < min_score] = 0
+        for row in np.flatnonzero(relevant).tolist():
+            result = results[owners[row]]
+            result[0] += 1
+            result[1] += float(min(credit[row], 1.0))
+            if credit[row] > 0:
+                result[2][phrases[row]] = resume_skills[best[row]]
+        return [tuple(result) for result in results]
+    
+    def _skill_matrix(self, job_descriptions):
+        """
+        Build a sparse boolean job x skill matrix from job texts.
+        """
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        
+        matcher = self.get_matcher()
+        indptr = [0]
+        indices = []
+        for found in self.iter_skill_indices(job_descriptions):
+            indices.extend(found)
+            indptr.append(len(indices))
+        
+        data = np.ones(len(indices), dtype=np.int32)
+        return csr_matrix((data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+                          shape=(len(indptr) - 1, len(matcher.skills)))
+    
+    def _job_text(self, job):
+        """
+        Return the text to match for a job given as a string or a job dict.
+        """
+        if isinstance(job, dict):
+            return f"{job.get('title', '')}\n{job.get('description', '')}"
+        return job or ''
+    
+    def _resume_profile(self, resume_path):
+        """
+        Return the text and skills of a resume.
+
+        Results are cached by file content hash, so analyzing the same resume
+        again costs a hash and a lookup. Skills are re-extracted from the
+        cached text if the taxonomy has changed since they were stored.
+        """
+        cache = get_resume_cache(self.config)
+        entry = None
+        if cache is not None and os.path.isfile(resume_path):
+            digest = file_hash(resume_path)
+            signature = self.taxonomy_signature()
+            entry = cache.get(digest)
+            if entry and entry['signature'] == signature:
+                metrics.increment('resume_cache_requests_total', result='hit')
+                return entry['text'], entry['skills']
+            metrics.increment('resume_cache_requests_total', result='miss')
+        else:
+            cache = None
+        
+        if entry:
+            resume_text = entry['text']
+        else:
+            try:
+                resume_text = self._extract_text_from_resume(resume_path)
+            except Exception as e:
+                # Unsupported and corrupt files are analyzed as empty, like a missing resume
+                print(f"Error parsing resume {resume_path}: {e}")
+                return '', []
+        resume_skills = self._extract_skills(resume_text)
+        if cache is not None:
+            cache.put(digest, resume_text, resume_skills, signature)
+        return resume_text, resume_skills
+    
     def _extract_text_from_resume(self, resume_path):
         """
-        Extract text content from a resume file.
+        Extract text content from a PDF, DOCX or text resume file.
         """
-        # Placeholder implementation
-        # In a real implementation, you would parse PDF, DOCX, etc.
-        return "Sample resume text with Python, JavaScript, and AWS experience"
+        if not os.path.isfile(resume_path):
+            print(f"Resume not found: {resume_path}")
+            return ''
+        return extract_text(resume_path)
     
     def _extract_skills(self, text):
         """
         Extract skills from text using keyword matching.
         """
-        found_skills = []
-        text_lower = text.lower()
-        
-        # Enhanced skill extraction with better matching
-        for skill in self.tech_skills:
-            # Use word boundaries for better matching
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
-        
-        return found_skills
+        with metrics.span('skill_extraction'):
+            return self.get_matcher().find(self._prepare_texts([text])[0])
+    
+    def _get_nlp(self):
+        """
+        Return the shared spaCy pipeline if NLP matching is enabled.
+        """
+        if not self.config.get('USE_SPACY', False):
+            return None
+        return get_nlp(self.config.get('SPACY_MODEL', 'en_core_web_sm'),
+                       self.config.get('SPACY_EXCLUDE', ('parser', 'ner')))
+    
+    def _prepare_texts(self, texts):
+        """
+        Return texts ready for keyword matching.
+
+        With NLP enabled, each text is followed by its lemmatized form so
+        inflected mentions ('containers', 'databases') still match. Texts go
+        through `nlp.pipe` in batches rather than one call per document.
+        """
+        nlp = self._get_nlp()
+        if nlp is None:
+            return texts if isinstance(texts, list) else list(texts)
+        return list(self._iter_prepared(nlp, texts))
+    
+    def _iter_prepared(self, nlp, texts):
+        """
+        Lazily append lemmatized forms to a stream of texts.
+        """
+        texts, originals = itertools.tee(texts)
+        docs = nlp.pipe(texts, batch_size=self.config.get('SPACY_BATCH_SIZE', 64))
+        for text, doc in zip(originals, docs):
+            yield text + '\n' + ' '.join(token.lemma_ for token in doc)
     
     def _generate_recommendations(self, missing_skills):
         """
@@ -0,0 +1,100 @@
+"""
+Compiled skill matcher that finds every taxonomy skill in a single regex pass.
+"""
+import re
+
+# A skill may not be glued to surrounding word characters; '+' and '#' also
+# count on the right so 'C' never matches inside 'C++' or 'C#'
+_LEFT_BOUNDARY = r'(?<!\w)'
+_RIGHT_BOUNDARY = r'(?![\w+#])'
+
+def normalize_skill(name):
+    """
+    Lowercase a skill name and collapse internal whitespace.
+    """
+    return ' '.join(name.lower().split())
+
+def _quote(char):
+    return r'\s+' if char == ' ' else re.escape(char)
+
+def _trie_pattern(node):
+    """
+    Turn a character trie into a regex with shared prefixes factored out.
+
+    Longer continuations are tried first, so the longest name wins at any
+    position (e.g. 'javascript' before 'java').
+    """
+    alternatives = []
+    single_chars = []
+    for char in sorted(key for key in node if key):
+        child = node[char]
+        if list(child) == ['']:
+            if char == ' ':
+                alternatives.append(_quote(char))
+            else:
+                single_chars.append(re.escape(char))
+        else:
+            alternatives.append(_quote(char) + _trie_pattern(child))
+    
+    if len(single_chars) == 1:
+        alternatives.append(single_chars[0])
+    elif single_chars:
+        alternatives.append('[' + ''.join(single_chars) + ']')
+    
+    if len(alternatives) == 1:
+        pattern = alternatives[0]
+    else:
+        pattern = '(?:' + '|'.join(alternatives) + ')'
+    
+    if '' in node:
+        pattern = f'(?:{pattern})?'
+    return pattern
+
+class SkillMatcher:
+    """
+    Matches a whole skills taxonomy, including aliases, in one pass over a text.
+
+    Names are compiled once into a trie-shaped regex, so the cost per text
+    grows with the text length rather than with the number of skills.
+    """
+    def __init__(self, skills, aliases=None):
+        self.skills = list(skills)
+        self.index = {skill: i for i, skill in enumerate(self.skills)}
+        
+        self._lookup = {}
+        for i, skill in enumerate(self.skills):
+            self._lookup[normalize_skill(skill)] = i
+        for alias, canonical in (aliases or {}).items():
+            if canonical in self.index:
+                self._lookup.setdefault(normalize_skill(alias), self.index[canonical])
+        
+        trie = {}
+        for name in self._lookup:
+            node = trie
+            for char in name:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        
+        body = _trie_pattern(trie) if trie else '(?!)'
+        self.pattern = re.compile(_LEFT_BOUNDARY + body + _RIGHT_BOUNDARY)
+    
+    def find_indices(self, text):
+        """
+        Return the sorted taxonomy indices of all skills found in a text.
+        """
+        lookup = self._lookup
+        found = set()
+        # The pattern has no capturing groups, so findall returns whole matches
+        for name in set(self.pattern.findall(text.lower())):
+            index = lookup.get(name)
+            if index is None:
+                index = lookup.get(' '.join(name.split()))
+            if index is not None:
+                found.add(index)
+        return sorted(found)
+    
+    def find(self, text):
+        """
+        Return the canonical skills found in a text, in taxonomy order.
+        """
+        return [self.skills[i] for i in self.find_indices(text)]
@@ -0,0 +1,129 @@
+"""
+Process pool for skill extraction over large batches of job postings.
+"""
+import multiprocessing
+import os
+import threading
+from array import array
+from collections import deque
+from itertools import islice
+
+# Analyzer of a worker process, built by its initializer; never set in the parent
+_worker_analyzer = None
+
+def _init_worker(config, tech_skills, skill_aliases):
+    """
+    Build the analyzer of one worker process, with its matcher and NLP pipeline loaded once.
+    """
+    global _worker_analyzer
+    from .analyzer import SkillsAnalyzer
+    analyzer = SkillsAnalyzer(config)
+    analyzer.tech_skills = tech_skills
+    analyzer.skill_aliases = skill_aliases
+    analyzer.get_matcher()
+    analyzer._get_nlp()
+    _worker_analyzer = analyzer
+
+def _extract_chunk(texts):
+    """
+    Return the skill indices of a chunk of texts as flat (lengths, indices) arrays.
+    """
+    matcher = _worker_analyzer.get_matcher()
+    lengths = array('i')
+    indices = array('i')
+    for text in _worker_analyzer._prepare_texts(texts):
+        found = matcher.find_indices(text)
+        lengths.append(len(found))
+        indices.extend(found)
+    return lengths, indices
+
+def start_method():
+    """
+    Return 'forkserver' where the platform supports it, otherwise 'spawn'.
+    
+    Workers are never forked from the caller itself, which may be running
+    threads (the dashboard, the pipeline daemon) whose locks a fork would
+    copy in whatever state they happen to be in.
+    """
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+class SkillAnalysisPool:
+    """
+    Worker processes that extract skills from postings in parallel.
+    
+    The taxonomy and the optional spaCy pipeline are loaded once per
+    worker, so extraction is no longer bound to one core by the GIL, and
+    the workers stay up for later batches until `close` is called.
+    Postings are sent in chunks of `chunk_size` texts and results come
+    back in input order. At most `2 * workers` chunks are in flight, so
+    arbitrarily long streams (e.g. a day's crawl from the job store) are
+    processed in bounded memory.
+    """
+    def __init__(self, analyzer, workers=None, chunk_size=None):
+        config = analyzer.config
+        self.analyzer = analyzer
+        self.workers = workers or config.get('ANALYSIS_WORKERS') or os.cpu_count() or 1
+        self.chunk_size = chunk_size or config.get('ANALYSIS_CHUNK_SIZE', 256)
+        self._pool = None
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+    
+    def start(self):
+        """
+        Start the worker processes unless they are running.
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = multiprocessing.get_context(start_method()).Pool(
+                    self.workers,
+                    initializer=_init_worker,
+                    initargs=(dict(self.analyzer.config), list(self.analyzer.tech_skills),
+                              dict(self.analyzer.skill_aliases))
+                )
+    
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+    
+    def iter_indices(self, jobs):
+        """
+        Yield the sorted taxonomy indices of the skills in each job, in order.
+        
+        Jobs may be description strings or job dicts.
+        """
+        self.start()
+        texts = (self.analyzer._job_text(job) for job in jobs)
+        pending = deque()
+        while True:
+            chunk = list(islice(texts, self.chunk_size))
+            if chunk:
+                pending.append(self._pool.apply_async(_extract_chunk, (chunk,)))
+            if pending and (not chunk or len(pending) >= 2 * self.workers):
+                lengths, indices = pending.popleft().get()
+                position = 0
+                for length in lengths:
+                    yield indices[position:position + length].tolist()
+                    position += length
+            elif not chunk:
+                return
+    
+    def extract_skills(self, jobs):
+        """
+        Yield the skills found in each job, in order.
+        """
+        skills = self.analyzer.get_matcher().skills
+        for found in self.iter_indices(jobs):
+            yield [skills[i] for i in found]
@@ -0,0 +1,111 @@
+"""
+Resume text extraction with a persistent cache keyed by file content hash.
+"""
+import hashlib
+import json
+import os
+import time
+
+from utils import metrics
+from utils.sqlite_store import SQLiteStore, get_shared
+
+def extract_text(path):
+    """
+    Extract plain text from a PDF, DOCX or text resume.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with metrics.span('resume_parse', format=extension.lstrip('.') or 'text'):
+        if extension == '.pdf':
+            return _extract_pdf(path)
+        if extension == '.docx':
+            return _extract_docx(path)
+        if extension in ('.txt', '.md', '.text', ''):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        raise ValueError(f"Unsupported resume format: {extension}")
+
+def _extract_pdf(path):
+    """
+    Extract text from a PDF with pdfplumber, falling back to PyPDF2.
+    """
+    try:
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            return '\n'.join(page.extract_text() or '' for page in pdf.pages)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"pdfplumber could not parse {path}: {e}. Trying PyPDF2.")
+    
+    from PyPDF2 import PdfReader
+    reader = PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+def _extract_docx(path):
+    """
+    Extract paragraph and table text from a DOCX file.
+    """
+    import docx
+    document = docx.Document(path)
+    parts = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            parts.append(' '.join(cell.text for cell in row.cells))
+    return '\n'.join(parts)
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """
+    Return the SHA-256 hex digest of a file's content.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def get_resume_cache(config):
+    """
+    Return the shared resume cache for the configured path, or None if disabled.
+    """
+    if not config.get('RESUME_CACHE_ENABLED', True):
+        return None
+    path = config.get('RESUME_CACHE_PATH', os.path.join('output', 'resume_cache.db'))
+    return get_shared(ResumeCache, path)
+
+class ResumeCache(SQLiteStore):
+    """
+    Persistent store of extracted resume text and skills.
+
+    Entries are keyed by the SHA-256 of the file content, so an edited resume
+    gets a new entry automatically. Skills are stored with the signature of
+    the taxonomy that produced them and are recomputed when it changes.
+    """
+    SCHEMA = (
+        ('CREATE TABLE IF NOT EXISTS resumes ('
+         'digest TEXT PRIMARY KEY, text TEXT, skills TEXT, signature TEXT, updated_at REAL)'),
+    )
+    
+    def get(self, digest):
+        """
+        Return the cached entry for a content hash, or None.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT text, skills, signature FROM resumes WHERE digest = ?', (digest,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'text': row[0], 'skills': json.loads(row[1]), 'signature': row[2]}
+    
+    def put(self, digest, text, skills, signature):
+        """
+        Store extracted text and skills for a content hash.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO resumes (digest, text, skills, signature, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (digest, text, json.dumps(skills), signature, time.time())
+            )
+            conn.commit()
@@ -0,0 +1,278 @@
+"""
+Offline skill similarity index for partial-credit skill matching.
+
+Skills are embedded with TF-IDF over their names, aliases and a short
+context description (reduced with truncated SVD for large taxonomies), and
+the normalized vectors are stored as a NumPy matrix that is memory-mapped
+at load time. Cosine similarity is then a plain matrix product.
+
+Free-text requirements that name no skill, such as "relational
+databases", are embedded as TF-IDF vectors over the words of the skill
+names, aliases and context, and compared with the skills' own word vectors,
+so they can earn credit from e.g. PostgreSQL on the resume.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from utils.helpers import create_directory
+
+# Related vocabulary for the built-in skills, so that e.g. MySQL and
+# PostgreSQL end up close to each other and to SQL
+SKILL_CONTEXT = {
+    'Python': 'programming language scripting backend',
+    'Java': 'programming language jvm backend',
+    'JavaScript': 'programming language web frontend',
+    'C++': 'programming language systems native',
+    'C#': 'programming language dotnet backend',
+    'Ruby': 'programming language scripting web',
+    'PHP': 'programming language web backend',
+    'Swift': 'programming language ios mobile',
+    'Go': 'programming language systems backend',
+    'Rust': 'programming language systems native',
+    'HTML': 'web markup frontend',
+    'CSS': 'web styling frontend',
+    'SQL': 'relational database query',
+    'NoSQL': 'document key value database',
+    'MongoDB': 'nosql document database',
+    'PostgreSQL': 'relational database sql',
+    'MySQL': 'relational database sql',
+    'Redis': 'nosql key value cache database',
+    'AWS': 'cloud platform infrastructure',
+    'Azure': 'cloud platform infrastructure',
+    'GCP': 'cloud platform infrastructure',
+    'Docker': 'containers devops infrastructure',
+    'Kubernetes': 'containers orchestration devops infrastructure',
+    'Git': 'version control',
+    'Jenkins': 'continuous integration pipelines devops',
+    'React': 'frontend javascript ui framework',
+    'Angular': 'frontend typescript ui framework',
+    'Vue.js': 'frontend javascript ui framework',
+    'Node.js': 'backend javascript runtime',
+    'Express': 'backend javascript node web framework',
+    'Django': 'backend python web framework',
+    'Flask': 'backend python web framework',
+    'Machine Learning': 'ai models data science',
+    'Data Science': 'machine learning statistics analytics',
+    'AI': 'machine learning artificial intelligence',
+    'NLP': 'machine learning text language ai',
+    'Computer Vision': 'machine learning images ai',
+    'Agile': 'scrum process methodology',
+    'Scrum': 'agile process methodology',
+    'Project Management': 'planning agile delivery'
+}
+
+EMBEDDINGS_FILE = 'embeddings.npy'
+TERMS_FILE = 'terms.npy'
+META_FILE = 'skills.json'
+
+# Job text that states requirements: bullet lines and sentences with one of these cues
+REQUIREMENT_CUE = re.compile(
+    r'\b(experience|knowledge|familiar\w*|proficien\w*|understanding|background|expertise|'
+    r'skills?|required|requirements?|must|plus)\b', re.IGNORECASE
+)
+BULLET = re.compile(r'^\s*[-*\u2022]\s*')
+# Dots only separate clauses at the end of a sentence, so 'Node.js' stays whole
+CLAUSE_SEPARATOR = re.compile(r'[,;:()/]|\.(?=\s|$)|\b(?:and|or)\b', re.IGNORECASE)
+TERM_PATTERN = re.compile(r'[a-z0-9+#.]*[a-z0-9+#]')
+
+def phrase_terms(text):
+    """
+    Return the lowercased words of a text without plural -s, e.g. 'Databases' -> 'database'.
+    """
+    terms = []
+    for term in TERM_PATTERN.findall(text.lower()):
+        if len(term) > 3 and term.endswith('s') and not term.endswith('ss'):
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+def requirement_phrases(text):
+    """
+    Return the clauses of a job text that state requirements.
+
+    Bullet lines and sentences with a cue such as 'experience' or
+    'knowledge' are split at commas, 'and', 'or' and similar separators,
+    e.g. 'Experience with relational databases and REST' gives
+    ['Experience with relational databases', 'REST'].
+    """
+    phrases = []
+    for line in text.splitlines():
+        if BULLET.match(line):
+            segments = [BULLET.sub('', line)]
+        else:
+            segments = [sentence for sentence in re.split(r'(?<=[.!?])\s+', line)
+                        if REQUIREMENT_CUE.search(sentence)]
+        for segment in segments:
+            phrases.extend(clause.strip() for clause in CLAUSE_SEPARATOR.split(segment) if clause.strip())
+    return phrases
+
+def taxonomy_signature(skills, aliases=None, context=None):
+    """
+    Return a fingerprint of the inputs an index was built from.
+    """
+    state = repr((list(skills), sorted((aliases or {}).items()), sorted((context or {}).items())))
+    return hashlib.sha1(state.encode('utf-8')).hexdigest()
+
+class SkillSimilarityIndex:
+    """
+    Row-normalized skill embeddings in taxonomy order.
+
+    `terms` holds each skill's normalized TF-IDF vector over `vocabulary`
+    (weighted by `idf`), used to compare free-text phrases with the skills.
+    """
+    def __init__(self, skills, embeddings, signature=None, terms=None, vocabulary=(), idf=()):
+        self.skills = list(skills)
+        self.index = {skill: i for i, skill in enumerate(self.skills)}
+        self.embeddings = embeddings
+        self.signature = signature
+        self.terms = terms
+        self.vocabulary = list(vocabulary)
+        self.term_index = {term: i for i, term in enumerate(self.vocabulary)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+    
+    @classmethod
+    def build(cls, skills, aliases=None, context=None, max_dims=128):
+        """
+        Train embeddings for a taxonomy with scikit-learn.
+        """
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.preprocessing import normalize
+        from scipy.sparse import hstack
+        
+        aliases = aliases or {}
+        context = SKILL_CONTEXT if context is None else context
+        names = {skill: [skill] for skill in skills}
+        for alias, canonical in aliases.items():
+            if canonical in names:
+                names[canonical].append(alias)
+        
+        name_docs = [' '.join(names[skill]) for skill in skills]
+        context_docs = [context.get(skill, '') for skill in skills]
+        # Character n-grams catch spelling variants, words catch shared context
+        name_features = TfidfVectorizer(analyzer='char_wb', ngram_range=(3, 4), lowercase=True).fit_transform(name_docs)
+        if any(context_docs):
+            context_features = TfidfVectorizer(token_pattern=r'[\w+#.]+').fit_transform(context_docs)
+            features = hstack([name_features, context_features]).tocsr()
+        else:
+            features = name_features
+        
+        if features.shape[1] > max_dims and len(skills) > max_dims:
+            vectors = TruncatedSVD(n_components=max_dims, random_state=0).fit_transform(features)
+        else:
+            vectors = features.toarray()
+        embeddings = normalize(vectors).astype(np.float32)
+        
+        # Word vectors of every skill, the space free-text phrases are embedded in
+        term_vectorizer = TfidfVectorizer(analyzer=phrase_terms)
+        term_docs = [f"{name_doc} {context_doc}" for name_doc, context_doc in zip(name_docs, context_docs)]
+        terms = normalize(term_vectorizer.fit_transform(term_docs)).toarray().astype(np.float32)
+        return cls(skills, embeddings, taxonomy_signature(skills, aliases, context), terms,
+                   term_vectorizer.get_feature_names_out().tolist(), term_vectorizer.idf_.tolist())
+    
+    def save(self, directory):
+        """
+        Write the embeddings matrix and skill list to a directory.
+        """
+        create_directory(directory)
+        np.save(os.path.join(directory, EMBEDDINGS_FILE), np.ascontiguousarray(self.embeddings))
+        if self.terms is not None:
+            np.save(os.path.join(directory, TERMS_FILE), np.ascontiguousarray(self.terms))
+        with open(os.path.join(directory, META_FILE), 'w') as f:
+            json.dump({'skills': self.skills, 'signature': self.signature,
+                       'vocabulary': self.vocabulary, 'idf': self.idf.tolist()}, f)
+    
+    @classmethod
+    def load(cls, directory):
+        """
+        Load a saved index with the embeddings memory-mapped read-only.
+        """
+        with open(os.path.join(directory, META_FILE), 'r') as f:
+            meta = json.load(f)
+        embeddings = np.load(os.path.join(directory, EMBEDDINGS_FILE), mmap_mode='r')
+        terms_path = os.path.join(directory, TERMS_FILE)
+        terms = np.load(terms_path, mmap_mode='r') if os.path.exists(terms_path) else None
+        return cls(meta['skills'], embeddings, meta.get('signature'), terms,
+                   meta.get('vocabulary', ()), meta.get('idf', ()))
+    
+    def credit_vector(self, owned_indices, min_similarity=0.5):
+        """
+        Return, for every skill, the credit earned from the owned skills.
+
+        Owned skills earn 1.0; other skills earn their best cosine similarity
+        to an owned skill, or 0 below `min_similarity`. Also returns the index
+        of the owned skill giving that credit (-1 if none).
+        """
+        credit = np.zeros(len(self.skills), dtype=np.float32)
+        source = np.full(len(self.skills), -1, dtype=np.int64)
+        owned = np.asarray(owned_indices, dtype=np.int64)
+        if owned.size == 0:
+            return credit, source
+        
+        similarities = np.asarray(self.embeddings @ self.embeddings[owned].T)
+        best = similarities.argmax(axis=1)
+        credit = similarities[np.arange(len(self.skills)), best]
+        source = owned[best]
+        credit[credit < min_similarity] = 0
+        source[credit == 0] = -1
+        credit[owned] = 1.0
+        source[owned] = owned
+        return np.clip(credit, 0, 1), source
+    
+    def phrase_similarity(self, phrases):
+        """
+        Return a phrases x skills matrix of cosine similarities over the skills' words.
+
+        Words outside the vocabulary are ignored, so a phrase made only of
+        such words is similar to nothing.
+        """
+        vectors = np.zeros((len(phrases), len(self.vocabulary)), dtype=np.float32)
+        for row, phrase in enumerate(phrases):
+            for term in phrase_terms(phrase):
+                column = self.term_index.get(term)
+                if column is not None:
+                    vectors[row, column] += self.idf[column]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors @ np.asarray(self.terms).T
+    
+    def most_similar(self, skill, k=5):
+        """
+        Return the k skills closest to a skill as (skill, score) pairs.
+        """
+        row = self.index[skill]
+        scores = np.asarray(self.embeddings @ self.embeddings[row])
+        scores[row] = -1
+        top = np.argsort(-scores)[:k]
+        return [(self.skills[i], float(scores[i])) for i in top]
+
+def load_or_build_index(path, skills, aliases=None):
+    """
+    Load the index at `path`, rebuilding and saving it if the taxonomy changed.
+    """
+    signature = taxonomy_signature(skills, aliases, SKILL_CONTEXT)
+    if os.path.exists(os.path.join(path, META_FILE)):
+        index = SkillSimilarityIndex.load(path)
+        # Indexes saved before phrase matching have no word vectors yet
+        if index.signature == signature and index.terms is not None:
+            return index
+    index = SkillSimilarityIndex.build(skills, aliases)
+    index.save(path)
+    return index
+
+if __name__ == '__main__':
+    # Build the index offline: python -m skills_analysis.similarity
+    from config.settings import load_config
+    from skills_analysis.analyzer import SkillsAnalyzer
+    
+    config = load_config()
+    analyzer = SkillsAnalyzer(config)
+    path = sys.argv[1] if len(sys.argv) > 1 else config['SIMILARITY_INDEX_PATH']
+    index = SkillSimilarityIndex.build(analyzer.tech_skills, analyzer.skill_aliases)
+    index.save(path)
+    print(f"Saved similarity index for {len(index.skills)} skills to {path}")
@@ -3,27 +3,49 @@ Utility functions for the automated job search system.
 """
 import os
 import json
+import stat
+import tempfile
 from datetime import datetime
 
-def save_job_data(jobs, filename=None):
+# Extensions of files read and written as SQLite job stores; anything else is JSON
+STORE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+def save_job_data(jobs, filename=None, config=None):
     """
-    Save job data to a JSON file.
+    Save job data to a job store if `filename` ends in .db or .sqlite, otherwise to a JSON file.
+
+    Without a filename, jobs go to the configured store (JOB_STORE_PATH).
+    Store writes append the jobs as one crawl run. Returns the path written to.
     """
     if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"jobs_{timestamp}.json"
-    
-    with open(filename, 'w') as f:
-        json.dump(jobs, f, indent=2)
+        if config is None:
+            from config.settings import load_config
+            config = load_config()
+        filename = config.get('JOB_STORE_PATH', os.path.join('output', 'jobs.db'))
+    if not filename.endswith(STORE_EXTENSIONS):
+        with open(filename, 'w') as f:
+            json.dump(jobs, f, indent=2)
+        return filename
     
+    from utils.job_store import JobStore
+    from utils.sqlite_store import get_shared
+    get_shared(JobStore, filename).append(jobs, run_id=datetime.now().strftime("%Y%m%d_%H%M%S"))
     return filename
 
-def load_job_data(filename):
+def load_job_data(filename, **filters):
     """
-    Load job data from a JSON file.
+    Load job data from a job store if `filename` ends in .db or .sqlite, otherwise from a JSON file.
+
+    Store reads accept the `JobStore.iter_jobs` filters (source, url, since,
+    until, run_id); use `JobStore.iter_jobs` directly to stream large stores.
     """
-    with open(filename, 'r') as f:
-        return json.load(f)
+    if not filename.endswith(STORE_EXTENSIONS):
+        with open(filename, 'r') as f:
+            return json.load(f)
+    
+    from utils.job_store import JobStore
+    from utils.sqlite_store import get_shared
+    return list(get_shared(JobStore, filename).iter_jobs(**filters))
 
 def create_directory(path):
     """
@@ -33,6 +55,49 @@ def create_directory(path):
         os.makedirs(path)
     return path
 
+def write_json_atomic(path, data):
+    """
+    Write data as JSON so readers see either the old file or the new one.
+    
+    The JSON goes to a temporary file in the same directory, which then
+    replaces `path`, so concurrent writers can't interleave their output.
+    The file keeps the mode of the one it replaces, or gets the mode a
+    plain open() would give it.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        create_directory(directory)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = default_file_mode()
+    fd, temp_path = tempfile.mkstemp(dir=directory or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        # mkstemp creates the file readable by its owner only
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def default_file_mode():
+    """
+    Return the mode of a file created with open() under the current umask.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return 0o666 & ~int(line.split()[1], 8)
+    except OSError:
+        pass
+    # Reading the umask means setting it, which other threads would see briefly
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
 def format_salary(salary):
     """
     Format salary information for display.
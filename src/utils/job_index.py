@@ -0,0 +1,262 @@
+"""
+Full-text and skill-faceted search index over the job store.
+"""
+import os
+import re
+import threading
+from itertools import tee
+
+from utils import metrics
+from utils.job_store import JobStore, get_job_store
+from utils.sqlite_store import SQLiteStore, get_shared
+
+# Words, plus the symbols that belong to skill names such as C++, C# and Node.js
+TOKEN_PATTERN = re.compile(r'\w[\w.+#-]*')
+
+def get_job_index(config, analyzer=None):
+    """
+    Return the shared search index for the configured job store.
+    """
+    path = config.get('JOB_STORE_PATH', os.path.join('output', 'jobs.db'))
+    store = get_job_store(config)
+    def build():
+        if analyzer is None:
+            from skills_analysis.analyzer import SkillsAnalyzer
+            return JobIndex(path, SkillsAnalyzer(config), store)
+        return JobIndex(path, analyzer, store)
+    return get_shared(JobIndex, path, build)
+
+def _phrase(text):
+    """
+    Quote text as an FTS5 phrase.
+    """
+    return '"' + ' '.join(TOKEN_PATTERN.findall(text)).replace('"', '""') + '"'
+
+class JobIndex(SQLiteStore):
+    """
+    Search stored jobs by keyword, company, location, source and skills.
+    
+    Lives in the job store's SQLite file next to the `jobs` table, on its
+    own connection; new jobs are read through the store. Titles,
+    descriptions, companies and locations go into an FTS5 table, and the
+    skills extracted from each posting into a (skill, job) facet table, so
+    "jobs requiring Docker" or "jobs matching 70% of my skills" are index
+    lookups and a GROUP BY instead of a scan. Only the latest crawl of each
+    URL is indexed. `refresh` indexes whatever was appended since the last
+    call, and re-indexes everything if the skills taxonomy changed.
+    """
+    SCHEMA = JobStore.SCHEMA + (
+        ("CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+         "title, description, company, location, tokenize = 'unicode61 remove_diacritics 2')"),
+        ('CREATE TABLE IF NOT EXISTS job_skills ('
+         'skill TEXT, job_id INTEGER, PRIMARY KEY (skill, job_id)) WITHOUT ROWID'),
+        'CREATE INDEX IF NOT EXISTS idx_job_skills_job ON job_skills (job_id)',
+        ('CREATE TABLE IF NOT EXISTS indexed_jobs ('
+         'job_id INTEGER PRIMARY KEY, key TEXT UNIQUE, source TEXT, skill_count INTEGER, skills TEXT)'),
+        'CREATE INDEX IF NOT EXISTS idx_indexed_jobs_source ON indexed_jobs (source)',
+        'CREATE TABLE IF NOT EXISTS job_index_state (key TEXT PRIMARY KEY, value TEXT)',
+    )
+    # Writes take the lock up front with BEGIN IMMEDIATE in _transaction()
+    ISOLATION_LEVEL = None
+    
+    def __init__(self, path, analyzer, store=None):
+        super().__init__(path)
+        self.analyzer = analyzer
+        self.store = store or get_shared(JobStore, path)
+        self._refresh_lock = threading.Lock()
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+        self._stop = threading.Event()
+    
+    def refresh(self, batch_size=1000):
+        """
+        Index jobs appended since the last refresh and return how many were indexed.
+        """
+        with self._refresh_lock:
+            with self._transaction() as conn:
+                state = dict(conn.execute('SELECT key, value FROM job_index_state'))
+                signature = self.analyzer.taxonomy_signature()
+                if state.get('signature') != signature:
+                    # Skills depend on the taxonomy, so start over
+                    for table in ('jobs_fts', 'job_skills', 'indexed_jobs'):
+                        conn.execute(f'DELETE FROM {table}')
+                    self._set_state(conn, signature=signature, last_id=0)
+                    state = {'last_id': '0'}
+            last_id = int(state.get('last_id', 0))
+            
+            rows, jobs = tee(self.store.iter_rows(last_id, batch_size))
+            skills = self.analyzer.get_matcher().skills
+            found = self.analyzer.iter_skill_indices(job for _, job in jobs)
+            indexed = 0
+            batch = []
+            for (job_id, job), indices in zip(rows, found):
+                batch.append((job_id, job, [skills[i] for i in indices]))
+                if len(batch) >= batch_size:
+                    indexed += self._write(batch)
+                    batch = []
+            if batch:
+                indexed += self._write(batch)
+            return indexed
+    
+    def start_refresher(self, interval):
+        """
+        Refresh the index every `interval` seconds on a background thread.
+        
+        Lets servers answer searches from the index without indexing new
+        postings inside a request. Does nothing if the thread is running.
+        """
+        with self._refresher_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._stop.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, args=(interval,),
+                                               name='job-index-refresh', daemon=True)
+            self._refresher.start()
+    
+    def search(self, text=None, company=None, location=None, source=None, skills=(),
+               resume_skills=None, min_match=None, limit=50):
+        """
+        Return the newest jobs matching every given filter.
+        
+        `text` matches title and description keywords; `company` and
+        `location` match phrases in those fields (e.g. location='remote');
+        `skills` lists skills a job must all require. Given `resume_skills`,
+        each result gets the share of its required skills the resume covers
+        as 'skill_match_percentage', results are ranked by it, and
+        `min_match` (a percentage) drops weaker matches.
+        """
+        where, params = self._filters(text, company, location, source, skills)
+        columns = 'i.job_id, j.url, j.source, j.title, j.company, j.location, j.posted_at, i.skills'
+        if resume_skills is None:
+            query = (f'SELECT {columns} FROM indexed_jobs i JOIN jobs j ON j.id = i.job_id '
+                     f'WHERE 1 = 1{where} ORDER BY i.job_id DESC LIMIT ?')
+            params = params + [limit]
+        else:
+            resume_skills = self.normalize_skills(resume_skills)
+            placeholders = ', '.join('?' * len(resume_skills))
+            match = 'CASE WHEN i.skill_count > 0 THEN COALESCE(m.hits, 0) * 100.0 / i.skill_count ELSE 0 END'
+            query = (f'SELECT {columns}, {match} AS skill_match FROM indexed_jobs i JOIN jobs j ON j.id = i.job_id '
+                     f'LEFT JOIN (SELECT job_id, COUNT(*) AS hits FROM job_skills WHERE skill IN ({placeholders}) '
+                     f'GROUP BY job_id) m ON m.job_id = i.job_id '
+                     f'WHERE 1 = 1{where} AND {match} >= ? ORDER BY skill_match DESC, i.job_id DESC LIMIT ?')
+            params = list(resume_skills) + params + [min_match or 0, limit]
+        
+        with self._lock, metrics.span('db_query', database='jobs', operation='SEARCH'):
+            rows = self._connect().execute(query, params).fetchall()
+        results = []
+        for row in rows:
+            result = {
+                'id': row[0], 'url': row[1], 'source': row[2], 'title': row[3], 'company': row[4],
+                'location': row[5], 'posted_at': row[6], 'skills': row[7].split('|') if row[7] else []
+            }
+            if resume_skills is not None:
+                result['skill_match_percentage'] = row[8]
+            results.append(result)
+        return results
+    
+    def skill_facets(self, text=None, company=None, location=None, source=None, skills=(), limit=20):
+        """
+        Return the most requested skills among matching jobs, with job counts.
+        """
+        where, params = self._filters(text, company, location, source, skills)
+        with self._lock, metrics.span('db_query', database='jobs', operation='FACET'):
+            rows = self._connect().execute(
+                f'SELECT s.skill, COUNT(*) AS jobs FROM job_skills s JOIN indexed_jobs i ON i.job_id = s.job_id '
+                f'WHERE 1 = 1{where} GROUP BY s.skill ORDER BY jobs DESC, s.skill LIMIT ?',
+                params + [limit]
+            ).fetchall()
+        return dict(rows)
+    
+    def count(self):
+        """
+        Return the number of indexed jobs.
+        """
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM indexed_jobs').fetchone()[0]
+    
+    def normalize_skills(self, names):
+        """
+        Map skill names and aliases ('k8s') to their canonical taxonomy names.
+        """
+        matcher = self.analyzer.get_matcher()
+        normalized = []
+        for name in names:
+            found = matcher.find(name)
+            normalized.append(found[0] if len(found) == 1 else name)
+        return normalized
+    
+    def close(self):
+        """
+        Stop the background refresher and close the database connection.
+        """
+        self._stop.set()
+        # Wait for a refresh in progress so it doesn't reopen the database
+        with self._refresh_lock:
+            super().close()
+    
+    def _refresh_loop(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing job index: {e}")
+            self._stop.wait(interval)
+    
+    def _filters(self, text, company, location, source, skills):
+        where, params = '', []
+        expression = []
+        if text:
+            expression.extend('{title description} : ' + _phrase(token) for token in TOKEN_PATTERN.findall(text))
+        if company:
+            expression.append('company : ' + _phrase(company))
+        if location:
+            expression.append('location : ' + _phrase(location))
+        if expression:
+            where += ' AND i.job_id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)'
+            params.append(' AND '.join(expression))
+        if source:
+            where += ' AND i.source = ?'
+            params.append(source)
+        if skills:
+            skills = sorted(set(self.normalize_skills(skills)))
+            placeholders = ', '.join('?' * len(skills))
+            where += (f' AND i.job_id IN (SELECT job_id FROM job_skills WHERE skill IN ({placeholders}) '
+                      f'GROUP BY job_id HAVING COUNT(*) = ?)')
+            params.extend(skills + [len(skills)])
+        return where, params
+    
+    def _write(self, batch):
+        """
+        Index a batch of (id, job, skills), replacing older crawls of the same URLs.
+        """
+        with metrics.span('db_query', database='jobs', operation='INDEX'), self._transaction() as conn:
+            # Another process may have indexed these rows since they were read
+            row = conn.execute("SELECT value FROM job_index_state WHERE key = 'last_id'").fetchone()
+            last_id = int(row[0]) if row else 0
+            batch = [entry for entry in batch if entry[0] > last_id]
+            if not batch:
+                return 0
+            for job_id, job, skills in batch:
+                key = job.get('url') or f'#{job_id}'
+                previous = conn.execute('SELECT job_id FROM indexed_jobs WHERE key = ?', (key,)).fetchone()
+                if previous is not None:
+                    conn.execute('DELETE FROM jobs_fts WHERE rowid = ?', previous)
+                    conn.execute('DELETE FROM job_skills WHERE job_id = ?', previous)
+                    conn.execute('DELETE FROM indexed_jobs WHERE job_id = ?', previous)
+                conn.execute(
+                    'INSERT INTO jobs_fts (rowid, title, description, company, location) VALUES (?, ?, ?, ?, ?)',
+                    (job_id, job.get('title') or '', job.get('description') or '',
+                     job.get('company') or '', job.get('location') or '')
+                )
+                conn.executemany('INSERT OR IGNORE INTO job_skills (skill, job_id) VALUES (?, ?)',
+                                 [(skill, job_id) for skill in skills])
+                conn.execute(
+                    'INSERT INTO indexed_jobs (job_id, key, source, skill_count, skills) VALUES (?, ?, ?, ?, ?)',
+                    (job_id, key, job.get('source'), len(skills), '|'.join(skills))
+                )
+            self._set_state(conn, last_id=batch[-1][0])
+        return len(batch)
+    
+    def _set_state(self, conn, **values):
+        conn.executemany('INSERT OR REPLACE INTO job_index_state (key, value) VALUES (?, ?)',
+                         [(key, str(value)) for key, value in values.items()])
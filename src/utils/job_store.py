@@ -0,0 +1,147 @@
+"""
+Append-only SQLite store for crawled jobs with indexed lookups and streaming reads.
+"""
+import json
+import os
+import time
+import zlib
+from itertools import islice
+
+from utils import metrics
+from utils.sqlite_store import SQLiteStore, get_shared
+
+# Job fields kept in their own indexed columns; the full job is stored compressed
+COLUMNS = ('url', 'source', 'title', 'company', 'location', 'posted_at')
+
+def get_job_store(config):
+    """
+    Return the shared job store for the configured path.
+    """
+    path = config.get('JOB_STORE_PATH', os.path.join('output', 'jobs.db'))
+    return get_shared(JobStore, path)
+
+class JobStore(SQLiteStore):
+    """
+    Jobs from every crawl in one SQLite file.
+
+    Rows are only ever appended, each tagged with its crawl time and run.
+    The searchable fields are plain indexed columns; the complete job is
+    kept as zlib-compressed JSON, which is several times smaller than the
+    indented JSON files it replaces. Reads stream in batches, so a month
+    of crawls can be scanned without loading it into memory.
+    """
+    SCHEMA = (
+        ('CREATE TABLE IF NOT EXISTS jobs ('
+         'id INTEGER PRIMARY KEY, url TEXT, source TEXT, title TEXT, company TEXT, '
+         'location TEXT, posted_at TEXT, crawled_at REAL, run_id TEXT, data BLOB)'),
+        'CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs (url)',
+        'CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs (source, crawled_at)',
+        'CREATE INDEX IF NOT EXISTS idx_jobs_crawled ON jobs (crawled_at)',
+        'CREATE INDEX IF NOT EXISTS idx_jobs_run ON jobs (run_id)',
+    )
+    
+    def append(self, jobs, run_id=None, batch_size=500):
+        """
+        Append jobs from any iterable and return how many were written.
+        """
+        crawled_at = time.time()
+        jobs = iter(jobs)
+        written = 0
+        while True:
+            batch = list(islice(jobs, batch_size))
+            if not batch:
+                return written
+            rows = [tuple(str(job[name]) if job.get(name) is not None else None for name in COLUMNS)
+                    + (crawled_at, run_id, zlib.compress(json.dumps(job, default=str).encode()))
+                    for job in batch]
+            with self._lock, metrics.span('db_query', database='jobs', operation='INSERT'):
+                conn = self._connect()
+                conn.executemany(
+                    'INSERT INTO jobs (url, source, title, company, location, posted_at, '
+                    'crawled_at, run_id, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+                conn.commit()
+            written += len(rows)
+    
+    def iter_jobs(self, source=None, url=None, since=None, until=None, run_id=None, batch_size=500):
+        """
+        Stream stored jobs, oldest first, optionally filtered.
+
+        `since` and `until` bound the crawl time (Unix seconds). Each batch
+        is a separate indexed query, so no read transaction is held open
+        between batches.
+        """
+        where, params = self._filters(source, url, since, until, run_id)
+        last_id = 0
+        while True:
+            with self._lock, metrics.span('db_query', database='jobs', operation='SELECT'):
+                rows = self._connect().execute(
+                    f'SELECT id, data FROM jobs WHERE id > ?{where} ORDER BY id LIMIT ?',
+                    [last_id] + params + [batch_size]
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, data in rows:
+                yield self.decode(data)
+            last_id = rows[-1][0]
+    
+    def iter_rows(self, after_id=0, batch_size=500):
+        """
+        Stream (row id, job) for the jobs appended after row `after_id`, oldest first.
+
+        Lets consumers such as the search index pick up where they left off.
+        """
+        while True:
+            with self._lock, metrics.span('db_query', database='jobs', operation='SELECT'):
+                rows = self._connect().execute(
+                    'SELECT id, data FROM jobs WHERE id > ? ORDER BY id LIMIT ?', (after_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, data in rows:
+                yield row_id, self.decode(data)
+            after_id = rows[-1][0]
+    
+    def get_by_url(self, url):
+        """
+        Return the most recently crawled job with a URL, or None.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT data FROM jobs WHERE url = ? ORDER BY id DESC LIMIT 1', (url,)
+            ).fetchone()
+        return self.decode(row[0]) if row else None
+    
+    def count(self, source=None, url=None, since=None, until=None, run_id=None):
+        """
+        Return the number of stored jobs matching the filters.
+        """
+        where, params = self._filters(source, url, since, until, run_id)
+        with self._lock:
+            return self._connect().execute(f'SELECT COUNT(*) FROM jobs WHERE 1 = 1{where}', params).fetchone()[0]
+    
+    def runs(self):
+        """
+        Return (run_id, crawled_at, job count) for every stored crawl, newest first.
+        """
+        with self._lock:
+            return self._connect().execute(
+                'SELECT run_id, MIN(crawled_at), COUNT(*) FROM jobs GROUP BY run_id ORDER BY MIN(crawled_at) DESC'
+            ).fetchall()
+    
+    @staticmethod
+    def decode(data):
+        """
+        Return the job stored in a compressed `data` column.
+        """
+        return json.loads(zlib.decompress(data))
+    
+    def _filters(self, source, url, since, until, run_id):
+        where, params = '', []
+        for clause, value in (('source = ?', source), ('url = ?', url), ('crawled_at >= ?', since),
+                              ('crawled_at < ?', until), ('run_id = ?', run_id)):
+            if value is not None:
+                where += f' AND {clause}'
+                params.append(value)
+        return where, params
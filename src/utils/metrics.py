@@ -0,0 +1,380 @@
+"""
+Lightweight spans, counters and histograms with Prometheus text export.
+
+Instrumented code calls `span`, `observe` and `increment` unconditionally.
+Until `configure` enables metrics these return immediately, so the cost on
+hot paths is one global lookup. Each process keeps its metrics in memory
+and periodically flushes a snapshot to a shared SQLite file, so the
+dashboard's /metrics endpoint reports the pipeline and bot processes too.
+"""
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.helpers import create_directory
+from utils.sqlite_store import open_database
+
+# Histogram bucket upper bounds in seconds, from a fast regex match to a slow scrape
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = None
+_registry_lock = threading.Lock()
+
+class _NullSpan:
+    """
+    Shared no-op span returned while metrics are disabled.
+    """
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """
+    Time a block into `<name>_seconds` and count failures in `<name>_errors_total`.
+    """
+    __slots__ = ('registry', 'name', 'labels', 'started')
+    
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.started = 0.0
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name + '_seconds', time.perf_counter() - self.started, self.labels)
+        if exc_type is not None:
+            self.registry.increment(self.name + '_errors_total', 1, self.labels)
+        return False
+
+def configure(config):
+    """
+    Enable or disable metrics for this process from the configuration.
+    
+    Returns the active registry, or None when METRICS_ENABLED is off.
+    """
+    global _registry
+    with _registry_lock:
+        if not config.get('METRICS_ENABLED', False):
+            if _registry is not None:
+                _registry.close()
+            _registry = None
+            return None
+        path = config.get('METRICS_PATH', os.path.join('output', 'metrics.db'))
+        if _registry is None or _registry.path != path:
+            if _registry is not None:
+                _registry.close()
+            _registry = MetricsRegistry(
+                path,
+                flush_interval=config.get('METRICS_FLUSH_INTERVAL', 10.0),
+                retention=config.get('METRICS_RETENTION_HOURS', 24) * 3600
+            )
+        return _registry
+
+def _after_fork():
+    # Registered once below, so replaced registries don't pile up fork hooks
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    if _registry is not None:
+        _registry._after_fork()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+def get_registry():
+    """
+    Return the active registry, or None while metrics are disabled.
+    """
+    return _registry
+
+def span(name, **labels):
+    """
+    Context manager that times a block as `<name>_seconds`.
+    """
+    registry = _registry
+    if registry is None:
+        return _NULL_SPAN
+    return _Span(registry, name, labels)
+
+def observe(name, value, **labels):
+    """
+    Record a value (usually seconds) in a histogram.
+    """
+    registry = _registry
+    if registry is not None:
+        registry.observe(name, value, labels)
+
+def increment(name, value=1, **labels):
+    """
+    Add to a counter.
+    """
+    registry = _registry
+    if registry is not None:
+        registry.increment(name, value, labels)
+
+def render_prometheus():
+    """
+    Return the metrics of every process in the Prometheus text format.
+    """
+    registry = _registry
+    if registry is None:
+        return ''
+    return format_prometheus(registry.collect())
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        f'{key}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for key, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+def format_prometheus(snapshot):
+    """
+    Format a snapshot from `MetricsRegistry.collect` as Prometheus text.
+    """
+    lines = []
+    counters = {}
+    for name, labels, value in snapshot['counters']:
+        counters.setdefault(name, []).append((labels, value))
+    for name in sorted(counters):
+        lines.append(f'# TYPE {name} counter')
+        for labels, value in sorted(counters[name]):
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+    
+    histograms = {}
+    for name, labels, counts, total, count in snapshot['histograms']:
+        histograms.setdefault(name, []).append((labels, counts, total, count))
+    for name in sorted(histograms):
+        lines.append(f'# TYPE {name} histogram')
+        for labels, counts, total, count in sorted(histograms[name]):
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS, counts):
+                cumulative += bucket
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", f"{bound:g}")])} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+class MetricsRegistry:
+    """
+    In-memory metrics for one process, flushed to a shared SQLite file.
+    
+    Counters and histograms are keyed by name and label set. A background
+    thread writes a snapshot every `flush_interval` seconds (and once more
+    at exit); `collect` merges this process's live metrics with the last
+    snapshot of every other process, dropping processes silent for longer
+    than `retention` seconds.
+    """
+    def __init__(self, path, flush_interval=10.0, retention=86400):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._start_process()
+        atexit.register(self.flush)
+    
+    def observe(self, name, value, labels):
+        """
+        Record a value in the histogram `name`.
+        """
+        key = (name, _label_key(labels))
+        position = bisect_left(BUCKETS, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(BUCKETS), 0.0, 0]
+            if position < len(BUCKETS):
+                histogram[0][position] += 1
+            histogram[1] += value
+            histogram[2] += 1
+    
+    def increment(self, name, value, labels):
+        """
+        Add `value` to the counter `name`.
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def snapshot(self):
+        """
+        Return this process's metrics as plain lists.
+        """
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(labels), list(counts), total, count]
+                               for (name, labels), (counts, total, count) in self._histograms.items()]
+            }
+    
+    def collect(self):
+        """
+        Return the metrics of this process merged with every other live process.
+        """
+        snapshots = [self.snapshot()]
+        try:
+            with self._conn_lock:
+                rows = self._connect().execute(
+                    'SELECT data FROM metrics WHERE process != ? AND updated_at >= ?',
+                    (self.process, time.time() - self.retention)
+                ).fetchall()
+            snapshots.extend(json.loads(row[0]) for row in rows)
+        except sqlite3.Error as e:
+            print(f"Error reading metrics from {self.path}: {e}")
+        
+        counters = {}
+        histograms = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, counts, total, count in snapshot['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [[0] * len(BUCKETS), 0.0, 0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+                merged[2] += count
+        return {
+            'counters': [(name, labels, value) for (name, labels), value in counters.items()],
+            'histograms': [(name, labels, counts, total, count)
+                           for (name, labels), (counts, total, count) in histograms.items()]
+        }
+    
+    def flush(self):
+        """
+        Write this process's snapshot to the shared file.
+        """
+        if not self._stop.is_set():
+            self._write()
+    
+    def close(self):
+        """
+        Stop the flush thread, write a final snapshot and close the file.
+        """
+        if self._stop.is_set():
+            return
+        self._write()
+        self._stop.set()
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _write(self):
+        data = json.dumps(self.snapshot())
+        if data == '{"counters": [], "histograms": []}':
+            return
+        now = time.time()
+        try:
+            with self._conn_lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO metrics (process, pid, updated_at, data) VALUES (?, ?, ?, ?)',
+                        (self.process, os.getpid(), now, data)
+                    )
+                    conn.execute('DELETE FROM metrics WHERE updated_at < ?', (now - self.retention,))
+        except sqlite3.Error as e:
+            print(f"Error flushing metrics to {self.path}: {e}")
+    
+    def _start_process(self):
+        # Process ids are reused, so the start time keeps snapshots apart
+        self.process = f'{os.getpid()}-{time.time():.6f}'
+        if self.flush_interval:
+            threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+    
+    def _after_fork(self):
+        # A forked worker starts empty; its parent keeps reporting its own metrics
+        if self._stop.is_set():
+            return
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._start_process()
+    
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+    
+    def _connect(self):
+        if self._conn is None:
+            self._conn = open_database(self.path, [
+                'CREATE TABLE IF NOT EXISTS metrics ('
+                'process TEXT PRIMARY KEY, pid INTEGER, updated_at REAL, data TEXT)'
+            ])
+        return self._conn
+
+@contextmanager
+def profile_run(config, name):
+    """
+    Profile a block with cProfile or pyinstrument when PROFILER is set.
+    
+    PROFILER is 'cprofile' (writes a .prof file for pstats or snakeviz) or
+    'pyinstrument' (writes an HTML report). Reports go to PROFILE_DIR,
+    named after `name` and the start time. Falls back to cProfile when
+    pyinstrument is not installed.
+    """
+    profiler_name = (config.get('PROFILER') or '').lower()
+    if not profiler_name:
+        yield None
+        return
+    
+    directory = create_directory(config.get('PROFILE_DIR', os.path.join('output', 'profiles')))
+    stem = os.path.join(directory, f"{name}-{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    if profiler_name == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("pyinstrument not available, profiling with cProfile")
+            profiler_name = 'cprofile'
+    
+    if profiler_name == 'pyinstrument':
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            path = stem + '.html'
+            with open(path, 'w') as f:
+                f.write(profiler.output_html())
+            print(f"Profile written to {path}")
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            path = stem + '.prof'
+            profiler.dump_stats(path)
+            print(f"Profile written to {path}")
@@ -0,0 +1,187 @@
+"""
+Per-domain token-bucket rate limiter shared by threads, asyncio tasks and processes.
+"""
+import ipaddress
+import os
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from utils.sqlite_store import SQLiteStore, get_shared
+
+THROTTLE_STATUSES = (429, 503)
+
+# Public suffixes with two labels, so 'jobs.example.co.uk' maps to 'example.co.uk'
+_TWO_LABEL_SUFFIXES = ('co.uk', 'org.uk', 'ac.uk', 'com.au', 'co.in', 'co.jp', 'com.br', 'co.nz')
+
+def domain_of(url):
+    """
+    Return the registrable domain of a URL, e.g. 'de.indeed.com' -> 'indeed.com'.
+    """
+    host = (urlparse(url).hostname or '').lower()
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    labels = host.split('.')
+    if len(labels) > 2 and '.'.join(labels[-2:]) in _TWO_LABEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+def parse_retry_after(value):
+    """
+    Return the delay in seconds from a Retry-After header, or None.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def get_rate_limiter(config):
+    """
+    Return the shared rate limiter for the configured path, or None if disabled.
+    """
+    if not config.get('RATE_LIMIT_ENABLED', True):
+        return None
+    path = config.get('RATE_LIMIT_PATH', os.path.join('output', 'rate_limits.db'))
+    return get_shared(DomainRateLimiter, path, lambda: DomainRateLimiter(
+        path,
+        rate=config.get('RATE_LIMIT_PER_SECOND', 1.0),
+        burst=config.get('RATE_LIMIT_BURST', 5),
+        max_backoff=config.get('RATE_LIMIT_MAX_BACKOFF', 300.0),
+        overrides=config.get('RATE_LIMIT_OVERRIDES', {})
+    ))
+
+class DomainRateLimiter(SQLiteStore):
+    """
+    Token bucket per domain, stored in SQLite so every process on the host shares it.
+
+    Each request reserves a token and sleeps until its slot comes up, so
+    concurrent callers are queued rather than all retrying at once. A 429
+    or 503 halves the domain's rate and blocks it for the Retry-After time
+    (or an exponential penalty); successful requests restore the rate
+    gradually.
+    """
+    SCHEMA = (
+        ('CREATE TABLE IF NOT EXISTS buckets ('
+         'domain TEXT PRIMARY KEY, tokens REAL, updated REAL, rate REAL, '
+         'blocked_until REAL, strikes INTEGER)'),
+    )
+    # Writes take the lock up front with BEGIN IMMEDIATE in _transaction()
+    ISOLATION_LEVEL = None
+    
+    def __init__(self, path, rate=1.0, burst=5, max_backoff=300.0, overrides=None):
+        super().__init__(path)
+        self.rate = rate
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self.overrides = overrides or {}
+    
+    def base_rate(self, domain):
+        """
+        Return the configured requests per second for a domain.
+        """
+        return self.overrides.get(domain, self.rate)
+    
+    def reserve(self, domain):
+        """
+        Take one token for a domain and return how long to wait before using it.
+        """
+        if not domain:
+            return 0.0
+        now = time.time()
+        with self._transaction() as conn:
+            tokens, updated, rate, blocked_until, _ = self._bucket(conn, domain, now)
+            # During a block `updated` is its end, so nothing refills until then
+            start = max(updated, now)
+            tokens = min(self.burst, tokens + (start - updated) * rate) - 1
+            conn.execute('UPDATE buckets SET tokens = ?, updated = ? WHERE domain = ?',
+                         (tokens, start, domain))
+        wait = start - now + (-tokens / rate if tokens < 0 else 0.0)
+        return max(wait, blocked_until - now, 0.0)
+    
+    def acquire(self, domain):
+        """
+        Block the calling thread until a request to the domain is allowed.
+        """
+        wait = self.reserve(domain)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self, domain):
+        """
+        Wait without blocking the event loop until a request to the domain is allowed.
+        """
+        import asyncio
+        
+        wait = await asyncio.to_thread(self.reserve, domain)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def record(self, domain, status, retry_after=None):
+        """
+        Adapt the domain's rate to a response status.
+
+        Throttling responses halve the rate and block the domain; other
+        responses raise a reduced rate back by a tenth of the base rate.
+        """
+        if not domain:
+            return
+        now = time.time()
+        base = self.base_rate(domain)
+        with self._transaction() as conn:
+            tokens, updated, rate, blocked_until, strikes = self._bucket(conn, domain, now)
+            if status in THROTTLE_STATUSES:
+                strikes += 1
+                delay = retry_after if retry_after is not None else min(2 ** strikes, self.max_backoff)
+                rate = max(rate / 2, base / 64)
+                blocked_until = max(blocked_until, now + min(delay, self.max_backoff))
+                # Drain the bucket and refill only from the end of the block, so
+                # callers queued during the block are spaced out instead of bursting
+                tokens = min(tokens, 0.0)
+                updated = blocked_until
+            elif rate < base or strikes:
+                # Credit the tokens earned at the old rate before raising it
+                start = max(updated, now)
+                tokens = min(self.burst, tokens + (start - updated) * rate)
+                updated = start
+                rate = min(base, rate + base / 10)
+                strikes = 0
+            else:
+                return
+            conn.execute(
+                'UPDATE buckets SET tokens = ?, updated = ?, rate = ?, blocked_until = ?, strikes = ? '
+                'WHERE domain = ?',
+                (tokens, updated, rate, blocked_until, strikes, domain)
+            )
+    
+    def state(self, domain):
+        """
+        Return the current rate and block time of a domain.
+        """
+        with self._transaction() as conn:
+            _, _, rate, blocked_until, strikes = self._bucket(conn, domain, time.time())
+        return {'rate': rate, 'blocked_until': blocked_until, 'strikes': strikes}
+    
+    def _bucket(self, conn, domain, now):
+        row = conn.execute(
+            'SELECT tokens, updated, rate, blocked_until, strikes FROM buckets WHERE domain = ?', (domain,)
+        ).fetchone()
+        if row is not None:
+            return row
+        row = (float(self.burst), now, self.base_rate(domain), 0.0, 0)
+        conn.execute(
+            'INSERT INTO buckets (domain, tokens, updated, rate, blocked_until, strikes) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (domain,) + row
+        )
+        return row
@@ -0,0 +1,101 @@
+"""
+Shared plumbing for the SQLite files that keep the pipeline's state.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from utils.helpers import create_directory
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+def get_shared(cls, path, factory=None):
+    """
+    Return the process-wide instance of `cls` for a database path.
+    
+    The instance is built on first use by `factory` (default `cls(path)`).
+    """
+    with _shared_lock:
+        key = (cls, path)
+        if key not in _shared:
+            _shared[key] = factory() if factory else cls(path)
+        return _shared[key]
+
+def open_database(path, schema=(), isolation_level=''):
+    """
+    Open a SQLite file in WAL mode and create its schema.
+    
+    The parent directory is created if needed, and the connection may be
+    used from any thread, so callers must serialize access themselves.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        create_directory(directory)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=isolation_level)
+    conn.execute('PRAGMA journal_mode=WAL')
+    create_schema(conn, schema)
+    return conn
+
+def create_schema(conn, schema):
+    """
+    Run CREATE ... IF NOT EXISTS statements and commit them.
+    """
+    for statement in schema:
+        conn.execute(statement)
+    if conn.in_transaction:
+        conn.commit()
+
+class SQLiteStore:
+    """
+    Base class for a store kept in one SQLite file.
+    
+    Subclasses list their tables and indexes in `SCHEMA`. The connection is
+    opened on first `_connect()` and shared by all threads; hold `_lock`
+    while using it. Stores that set ISOLATION_LEVEL = None write through
+    `_transaction()`.
+    """
+    SCHEMA = ()
+    # None runs in autocommit mode for stores that issue BEGIN IMMEDIATE themselves
+    ISOLATION_LEVEL = ''
+    
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _connect(self):
+        """
+        Open the database on first use.
+        """
+        if self._conn is None:
+            self._conn = open_database(self.path, self.SCHEMA, self.ISOLATION_LEVEL)
+        return self._conn
+    
+    @contextmanager
+    def _transaction(self):
+        """
+        Run the block under the lock and a BEGIN IMMEDIATE transaction.
+        
+        The write lock also excludes other processes; the block's changes
+        are committed together, or rolled back if it raises.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
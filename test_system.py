@@ -1,10 +1,44 @@
 """
 Test suite for the automated job search system.
 """
+import atexit
+import shutil
 import sys
 import os
+import tempfile
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Keep the state files written with default settings out of the repository's output/.
+# Worker processes started by the tests import this module again and reuse the directory.
+STATE_DIR = os.environ.get('JOB_SEARCH_TEST_STATE_DIR')
+if STATE_DIR is None:
+    STATE_DIR = os.environ['JOB_SEARCH_TEST_STATE_DIR'] = tempfile.mkdtemp(prefix='job-search-tests-')
+    atexit.register(shutil.rmtree, STATE_DIR, ignore_errors=True)
+for name, filename in (('WAIT_STATS_PATH', 'wait_stats.json'), ('FORM_STRATEGY_PATH', 'form_strategies.json'),
+                       ('RATE_LIMIT_PATH', 'rate_limits.db'), ('DEDUP_PATH', 'dedup.db'),
+                       ('PAGE_CACHE_PATH', 'page_cache.db'), ('JOB_STORE_PATH', 'jobs.db'),
+                       ('RESUME_CACHE_PATH', 'resume_cache.db'), ('SIMILARITY_INDEX_PATH', 'skill_index'),
+                       ('PIPELINE_QUEUE_PATH', 'pipeline.db'), ('METRICS_PATH', 'metrics.db')):
+    os.environ[name] = os.path.join(STATE_DIR, filename)
+
+def browser_unavailable():
+    """Return why Playwright cannot launch its browser here, or None if it can."""
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            playwright.chromium.launch().close()
+    except Exception as e:
+        return str(e).strip().splitlines()[0]
+    return None
+
+def skip(name, reason):
+    """Report a test that cannot run here; under pytest it is marked skipped."""
+    print(f"- {name} test skipped: {reason}")
+    if 'pytest' in sys.modules:
+        import pytest
+        pytest.skip(reason)
+    return True
+
 def test_config_loading():
     """Test that configuration loads correctly."""
     try:
@@ -17,6 +51,55 @@ def test_config_loading():
         print(f"✗ Configuration loading test failed: {e}")
         return False
 
+def test_lazy_startup():
+    """Test that entry points defer heavy imports and settings are parsed once."""
+    try:
+        import subprocess
+        from config.settings import Settings, get_settings, load_config
+        
+        code = ("import sys; sys.path.insert(0, 'src'); "
+                "import main, pipeline.daemon, application_bot.bot, job_aggregator.connectors, utils.job_index; "
+                "from config.settings import load_config; load_config(); "
+                "print(sorted(m for m in ('selenium', 'spacy', 'flask', 'sqlalchemy', 'bs4', 'numpy') "
+                "if m in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert output.stdout.strip() == '[]', output.stdout + output.stderr
+        
+        # One parse per process; callers get their own copy to change
+        assert get_settings() is get_settings()
+        config = load_config()
+        config['JOB_SOURCES'].append('example')
+        config['PROFILER'] = 'cprofile'
+        assert 'example' not in load_config()['JOB_SOURCES']
+        assert load_config()['PROFILER'] == get_settings().PROFILER
+        
+        settings = Settings.from_env({'DB_POOL_SIZE': '8', 'HEADLESS': 'false', 'SEARCH_TITLES': 'Data Engineer,,SRE',
+                                      'RATE_LIMIT_OVERRIDES': 'api.example.com:0.5', 'PIPELINE_WORKERS': 'apply:3'})
+        assert settings.DB_POOL_SIZE == 8 and settings.HEADLESS is False
+        assert settings.SEARCH_TITLES == ('Data Engineer', 'SRE')
+        assert settings.RATE_LIMIT_OVERRIDES == {'api.example.com': 0.5}
+        assert settings.PIPELINE_WORKERS == {'apply': 3}
+        spaced = Settings.from_env({'RATE_LIMIT_OVERRIDES': ' a.com : 0.5 , b.com:2 ,'})
+        assert spaced.RATE_LIMIT_OVERRIDES == {'a.com': 0.5, 'b.com': 2.0}
+        assert Settings().JOB_SOURCES == ('linkedin', 'indeed', 'stepstone')
+        assert Settings(SEARCH_TITLES=['SRE']).SEARCH_TITLES == ('SRE',)
+        assert settings.to_dict()['PIPELINE_WORKERS'] == {'apply': 3}
+        
+        # The shared settings cannot be changed in place
+        for change in (lambda: get_settings().PIPELINE_WORKERS.update(apply=9),
+                       lambda: get_settings().JOB_SOURCES.append('example')):
+            try:
+                change()
+            except (TypeError, AttributeError):
+                continue
+            raise AssertionError('cached settings were mutated')
+        print("✓ Lazy startup test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Lazy startup test failed: {e}")
+        return False
+
 def test_job_aggregator():
     """Test the job aggregator module."""
     try:
@@ -31,6 +114,528 @@ def test_job_aggregator():
         print(f"✗ Job aggregator test failed: {e}")
         return False
 
+def test_concurrent_job_search():
+    """Test concurrent source fan-out against stub sources."""
+    try:
+        import tempfile
+        import time
+        from config.settings import load_config
+        from job_aggregator.aggregator import JobAggregator
+        config = load_config()
+        config['SOURCE_TIMEOUT'] = 0.5
+        aggregator = JobAggregator(config)
+        
+        def fast_source(title, location, radius):
+            time.sleep(0.2)
+            return [{'title': title, 'company': 'Fast', 'location': location}]
+        
+        def also_fast_source(title, location, radius):
+            time.sleep(0.2)
+            return [{'title': title, 'company': 'Also Fast', 'location': location}]
+        
+        def slow_source(title, location, radius):
+            time.sleep(1.5)
+            return [{'title': title, 'company': 'Slow', 'location': location}]
+        
+        def failing_source(title, location, radius):
+            raise RuntimeError("board unavailable")
+        
+        aggregator.sources = {
+            'fast': fast_source,
+            'also_fast': also_fast_source,
+            'slow': slow_source,
+            'failing': failing_source
+        }
+        
+        started = time.perf_counter()
+        jobs = aggregator.search_jobs("Software Engineer", "Remote", "50")
+        elapsed = time.perf_counter() - started
+        
+        report = aggregator.last_search_report
+        assert len(jobs) == 2
+        assert elapsed < 1.0
+        assert report['fast']['status'] == 'ok'
+        assert report['slow']['status'] == 'timeout'
+        assert report['failing']['status'] == 'error'
+        
+        # A source that never stops producing still hits its deadline
+        def flooding_source(title, location, radius):
+            number = 0
+            while True:
+                number += 1
+                yield {'title': f'{title} {number}', 'company': 'Flood', 'location': location}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config['DEDUP_PATH'] = os.path.join(tmp, 'dedup.db')
+            aggregator = JobAggregator(config)
+            aggregator.sources = {'fast': fast_source, 'flooding': flooding_source}
+            started = time.perf_counter()
+            aggregator.search_jobs("Software Engineer", "Remote", "50")
+            assert time.perf_counter() - started < 1.5
+            assert aggregator.last_search_report['flooding']['status'] == 'timeout'
+            aggregator.dedup.close()
+        print("✓ Concurrent job search test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Concurrent job search test failed: {e}")
+        return False
+
+def test_connector_registry():
+    """Test that connectors are loaded from the registry with a shared session."""
+    try:
+        from config.settings import load_config
+        from job_aggregator.aggregator import JobAggregator
+        from job_aggregator.connectors import Connector, register_connector
+        
+        @register_connector
+        class StubConnector(Connector):
+            name = 'stub'
+            
+            def search(self, title, location, radius, since=None):
+                return [{'title': title, 'company': 'Stub', 'location': location}]
+        
+        config = load_config()
+        config['JOB_SOURCES'] = ['linkedin', 'stub']
+        aggregator = JobAggregator(config)
+        assert list(aggregator.sources) == ['linkedin', 'stub']
+        assert aggregator.sources['stub'].session is aggregator.sources['linkedin'].session
+        jobs = aggregator.search_jobs("Data Engineer", "Berlin", "25")
+        assert [job['company'] for job in jobs] == ['Company A', 'Stub']
+        
+        @register_connector
+        class RelabelingConnector(Connector):
+            name = 'relabeling'
+            
+            def search(self, title, location, radius, since=None):
+                return [{'title': title, 'company': 'Partner', 'location': location, 'source': 'partner-feed'}]
+        
+        config['JOB_SOURCES'] = ['relabeling']
+        jobs = JobAggregator(config).search_jobs("Data Engineer", "Berlin", "25")
+        assert [job['source'] for job in jobs] == ['partner-feed']
+        print("✓ Connector registry test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Connector registry test failed: {e}")
+        return False
+
+def test_streaming_job_search():
+    """Test that iter_jobs yields postings before slow sources finish."""
+    try:
+        import time
+        from config.settings import load_config
+        from job_aggregator.aggregator import JobAggregator
+        from job_aggregator.connectors import Connector
+        
+        class PagedConnector(Connector):
+            name = 'paged'
+            
+            def iter_search(self, title, location, radius, since=None):
+                for page in range(3):
+                    if page:
+                        time.sleep(0.3)
+                    yield {'title': f'{title} {page}', 'company': 'Paged'}
+        
+        config = load_config()
+        aggregator = JobAggregator(config)
+        aggregator.sources = {
+            'paged': PagedConnector(config),
+            'quick': lambda title, location, radius: [{'title': title, 'company': 'Quick'}]
+        }
+        
+        started = time.perf_counter()
+        arrivals = []
+        for job in aggregator.iter_jobs("Engineer", "Remote", "50"):
+            arrivals.append((time.perf_counter() - started, job['source']))
+        
+        assert len(arrivals) == 4
+        assert arrivals[0][0] < 0.2
+        assert arrivals[-1][0] >= 0.6
+        assert aggregator.last_search_report['paged']['jobs'] == 3
+        
+        # Searches sharing one aggregator keep separate reports
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(2) as executor:
+            counts = list(executor.map(
+                lambda title: len(list(aggregator.iter_jobs(title, "Remote", "50"))), ["Engineer", "Analyst"]))
+        assert counts == [4, 4]
+        assert set(aggregator.last_search_report) == {'paged', 'quick'}
+        print("✓ Streaming job search test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Streaming job search test failed: {e}")
+        return False
+
+def test_page_cache():
+    """Test conditional requests, LRU eviction and crawl watermarks."""
+    try:
+        import tempfile
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from config.settings import load_config
+        from job_aggregator.aggregator import JobAggregator
+        from job_aggregator.cache import PageCache
+        from job_aggregator.connectors import Connector, is_new
+        
+        hits = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                hits.append(self.headers.get('If-None-Match'))
+                if self.headers.get('If-None-Match') == '"v1"':
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = b'<html><title>Job</title><body>Python developer</body></html>'
+                self.send_response(200)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}/jobs/1'
+        
+        config = load_config()
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageCache(os.path.join(tmp, 'cache.db'), max_bytes=100)
+            connector = Connector(config, cache=cache)
+            assert connector.fetch_page(url).modified
+            page = connector.fetch_page(url)
+            assert not page.modified and 'Python developer' in page.text
+            assert hits == [None, '"v1"']
+            
+            cache.put('other', 'http://example.com', b'x' * 80)
+            assert cache.get(PageCache.make_key(url)) is None
+            assert cache.size() <= 100
+            
+            pages = [[{'title': 'Engineer', 'company': 'A', 'posted_at': '2024-01-02T09:00:00+01:00'},
+                      {'title': 'Engineer', 'company': 'B', 'posted_at': 'Mon, 01 Jan 2024 12:00:00 GMT'}],
+                     [{'title': 'Engineer', 'company': 'C', 'posted_at': '2023-12-31'}]]
+            fetched = []
+            
+            class PostingsConnector(Connector):
+                name = 'postings'
+                
+                def iter_search(self, title, location, radius, since=None):
+                    # Newest first, so paging stops at the first page with nothing new
+                    for number, page in enumerate(pages):
+                        fetched.append(number)
+                        new = [job for job in page if is_new(job, since)]
+                        yield from new
+                        if len(new) < len(page):
+                            return
+            
+            config['INCREMENTAL_CRAWL'] = True
+            aggregator = JobAggregator(config)
+            aggregator.cache = cache
+            aggregator.dedup = None
+            aggregator.sources = {'postings': PostingsConnector(config, cache=cache)}
+            assert len(aggregator.search_jobs("Engineer", "Remote", "50")) == 3
+            assert cache.get_watermark('postings') == '2024-01-02T09:00:00+01:00'
+            # Timestamps are compared as times, not strings; the posting at the
+            # watermark is kept for the dedup index to drop
+            pages[0].insert(0, {'title': 'Engineer', 'company': 'D', 'posted_at': '2024-01-02T08:30:00Z'})
+            fetched.clear()
+            jobs = aggregator.search_jobs("Engineer", "Remote", "50")
+            assert [job['company'] for job in jobs] == ['D', 'A'] and fetched == [0]
+            assert cache.get_watermark('postings') == '2024-01-02T08:30:00+00:00'
+            cache.close()
+        server.shutdown()
+        print("✓ Page cache test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Page cache test failed: {e}")
+        return False
+
+def test_job_deduplication():
+    """Test near-duplicate detection across sources."""
+    try:
+        import tempfile
+        from config.settings import load_config
+        from job_aggregator.aggregator import JobAggregator
+        from job_aggregator.dedup import DedupIndex
+        
+        description = ("We are looking for a senior Python developer to build data pipelines "
+                       "with Spark and AWS. You will work closely with our analytics team "
+                       "in Berlin and mentor junior engineers.")
+        
+        def linkedin(title, location, radius):
+            return [{'title': 'Senior Python Developer (m/w/d)', 'company': 'ACME GmbH',
+                     'location': 'Berlin', 'url': 'https://linkedin.com/jobs/1',
+                     'description': description}]
+        
+        def indeed(title, location, radius):
+            return [{'title': 'Sr. Python Engineer', 'company': 'Acme',
+                     'location': 'Berlin, Germany', 'url': 'https://indeed.com/jobs/2',
+                     'description': description.upper() + '!'},
+                    {'title': 'Marketing Manager', 'company': 'Acme', 'location': 'Berlin',
+                     'url': 'https://indeed.com/jobs/3',
+                     'description': 'Own our consumer brand campaigns and agency budget.'}]
+        
+        config = load_config()
+        with tempfile.TemporaryDirectory() as tmp:
+            aggregator = JobAggregator(config)
+            aggregator.dedup = DedupIndex(os.path.join(tmp, 'dedup.db'))
+            aggregator.sources = {'linkedin': linkedin, 'indeed': indeed}
+            jobs = aggregator.search_jobs("Python Developer", "Berlin", "50", concurrent=False)
+            assert [job['url'] for job in jobs] == ['https://linkedin.com/jobs/1',
+                                                    'https://indeed.com/jobs/3']
+            assert aggregator.last_search_report['indeed']['duplicates'] == 1
+            
+            # A repeated search still returns each posting once
+            assert len(aggregator.search_jobs("Python Developer", "Berlin", "50", concurrent=False)) == 2
+            assert aggregator.dedup.count() == 2
+            aggregator.dedup.close()
+            
+            index = DedupIndex(os.path.join(tmp, 'keys.db'), retention=3600)
+            # Postings without company and title don't all share the key '||'
+            assert index.check_and_add({'url': 'https://example.com/a'}) is None
+            assert index.check_and_add({'url': 'https://example.com/b'}) is None
+            # Two openings with the same title and place but different descriptions
+            opening = {'title': 'Python Developer', 'company': 'Acme', 'location': 'Berlin'}
+            assert index.check_and_add(dict(opening, url='https://example.com/c', description=description)) is None
+            assert index.check_and_add(dict(
+                opening, url='https://example.com/d',
+                description='Maintain our Django billing service and its PostgreSQL database.')) is None
+            assert index.check_and_add(dict(opening, url='https://example.com/e'))['reason'] == 'key'
+            
+            # Entries older than the retention period are pruned
+            conn = index._connect()
+            conn.execute('UPDATE postings SET seen_at = seen_at - 7200')
+            conn.commit()
+            index._pruned_at = 0.0
+            assert index.check_and_add(dict(opening, url='https://example.com/e')) is None
+            assert index.count() == 1
+            assert conn.execute('SELECT COUNT(*) FROM buckets').fetchone()[0] == 0
+            index.close()
+        print("✓ Job deduplication test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Job deduplication test failed: {e}")
+        return False
+
+def test_rate_limiter():
+    """Test the shared per-domain token bucket and throttling backoff."""
+    try:
+        import asyncio
+        import tempfile
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from job_aggregator.session import create_session
+        from utils.rate_limit import DomainRateLimiter, domain_of
+        
+        assert domain_of('https://de.indeed.com/jobs?q=python') == 'indeed.com'
+        assert domain_of('https://jobs.example.co.uk/1') == 'example.co.uk'
+        assert domain_of('http://127.0.0.1:8000/') == '127.0.0.1'
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'limits.db')
+            limiter = DomainRateLimiter(path, rate=10, burst=2)
+            # A second instance stands in for another process sharing the file
+            other = DomainRateLimiter(path, rate=10, burst=2)
+            assert limiter.reserve('indeed.com') == 0
+            assert other.reserve('indeed.com') == 0
+            assert 0.05 < limiter.reserve('indeed.com') <= 0.1
+            assert limiter.reserve('linkedin.com') == 0
+            assert asyncio.run(other.acquire_async('stepstone.com')) == 0
+            
+            other.record('indeed.com', 429, retry_after=2)
+            assert limiter.state('indeed.com')['rate'] == 5
+            # Callers queued during the block are spaced at the halved rate after it
+            waits = [limiter.reserve('indeed.com') for _ in range(3)]
+            assert waits[0] > 1.5
+            assert all(0.15 < later - earlier < 0.25 for earlier, later in zip(waits, waits[1:]))
+            limiter.record('indeed.com', 200)
+            assert limiter.state('indeed.com')['rate'] == 6
+            # Tokens earned while throttled are kept when the rate recovers
+            limiter.record('glassdoor.com', 429, retry_after=0)
+            time.sleep(0.3)
+            limiter.record('glassdoor.com', 200)
+            assert limiter.reserve('glassdoor.com') == 0
+            
+            statuses = [429, 200]
+            
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    status = statuses.pop(0)
+                    self.send_response(status)
+                    self.send_header('Retry-After', '0')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                
+                def log_message(self, format, *args):
+                    pass
+            
+            server = HTTPServer(('127.0.0.1', 0), Handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            session = create_session({'RATE_LIMIT_PATH': path, 'RATE_LIMIT_PER_SECOND': 100})
+            response = session.get(f'http://127.0.0.1:{server.server_address[1]}/')
+            server.shutdown()
+            assert response.status_code == 200 and not statuses
+            # Halved by the 429, then raised by a tenth of the base rate
+            assert limiter.state('127.0.0.1')['rate'] == 60
+            limiter.close()
+            other.close()
+        print("✓ Rate limiter test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Rate limiter test failed: {e}")
+        return False
+
+def test_job_store():
+    """Test the append-only job store and the save/load helpers."""
+    try:
+        import tempfile
+        import time
+        from utils.helpers import save_job_data, load_job_data
+        from utils.job_store import JobStore
+        
+        jobs = [{'title': f"Python Developer {n}", 'company': f"Company {n}",
+                 'source': 'linkedin' if n % 2 else 'indeed', 'url': f"https://example.com/jobs/{n}",
+                 'description': 'Python, SQL and Docker. ' * 20} for n in range(1200)]
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = os.path.join(tmp, 'jobs.json')
+            assert save_job_data(jobs[:3], legacy) == legacy
+            assert load_job_data(legacy) == jobs[:3]
+            
+            path = os.path.join(tmp, 'jobs.db')
+            assert save_job_data(jobs[:2], path) == path
+            store = JobStore(path)
+            started = time.time()
+            assert store.append(iter(jobs), run_id='run-2') == 1200
+            
+            assert store.count() == 1202
+            assert store.count(source='indeed', run_id='run-2') == 600
+            assert store.count(since=started) == 1200
+            assert store.get_by_url('https://example.com/jobs/7')['company'] == 'Company 7'
+            assert store.get_by_url('https://example.com/missing') is None
+            streamed = store.iter_jobs(source='linkedin', run_id='run-2', batch_size=100)
+            assert next(streamed) == jobs[1]
+            assert sum(1 for _ in streamed) == 599
+            assert [run[0] for run in store.runs()][0] == 'run-2'
+            assert len(load_job_data(path, url='https://example.com/jobs/1')) == 2
+            store.close()
+            
+            # One store per path, created with its directory and reopened after close
+            from utils.job_store import get_job_store
+            config = {'JOB_STORE_PATH': os.path.join(tmp, 'nested', 'jobs.db')}
+            shared = get_job_store(config)
+            assert get_job_store(config) is shared
+            assert shared.count() == 0
+            shared.close()
+            assert shared.count() == 0
+            shared.close()
+            
+            # Compressed rows take less room than the indented JSON dump
+            save_job_data(jobs, legacy)
+            assert os.path.getsize(path) < os.path.getsize(legacy)
+            
+            # Only SQLite extensions select the store; the default path comes from config
+            export = os.path.join(tmp, 'jobs.txt')
+            assert save_job_data(jobs[:1], export) == export and load_job_data(export) == jobs[:1]
+            assert save_job_data(jobs[:1], config=config) == config['JOB_STORE_PATH']
+            assert shared.count() == 1
+            
+            # Atomic JSON writes keep the replaced file's mode, or get the default
+            import stat
+            from utils.helpers import default_file_mode, write_json_atomic
+            settings = os.path.join(tmp, 'settings.json')
+            write_json_atomic(settings, {'a': 1})
+            assert stat.S_IMODE(os.stat(settings).st_mode) == default_file_mode()
+            os.chmod(settings, 0o640)
+            write_json_atomic(settings, {'a': 2})
+            assert stat.S_IMODE(os.stat(settings).st_mode) == 0o640
+        print("✓ Job store test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Job store test failed: {e}")
+        return False
+
+def test_job_index():
+    """Test full-text and skill-faceted search over stored jobs."""
+    try:
+        import tempfile
+        import time
+        from dashboard.app import create_app
+        from dashboard.models import db
+        from skills_analysis.analyzer import SkillsAnalyzer
+        from utils.job_index import JobIndex, get_job_index
+        from utils.job_store import JobStore
+        
+        jobs = [
+            {'title': 'Python Developer', 'company': 'Acme', 'location': 'Remote', 'source': 'linkedin',
+             'url': 'https://example.com/1', 'description': 'Python, Docker and SQL'},
+            {'title': 'Data Engineer', 'company': 'Globex', 'location': 'Berlin', 'source': 'indeed',
+             'url': 'https://example.com/2', 'description': 'Python, Kubernetes, AWS and Spark'},
+            {'title': 'Frontend Engineer', 'company': 'Acme', 'location': 'Remote, Germany', 'source': 'indeed',
+             'url': 'https://example.com/3', 'description': 'React, CSS and some Python'},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'jobs.db')
+            store = JobStore(path)
+            store.append(jobs, run_id='run-1')
+            index = JobIndex(path, SkillsAnalyzer({}))
+            assert index.refresh() == 3 and index.refresh() == 0
+            
+            def urls(results):
+                return sorted(job['url'] for job in results)
+            
+            assert urls(index.search(text='python', location='remote')) == ['https://example.com/1', 'https://example.com/3']
+            assert urls(index.search(company='acme', source='indeed')) == ['https://example.com/3']
+            assert urls(index.search(skills=['python', 'k8s'])) == ['https://example.com/2']
+            assert index.search(text='engineer', limit=1)[0]['url'] == 'https://example.com/3'
+            
+            # Ranked by the share of each job's skills the resume covers
+            matches = index.search(location='remote', resume_skills=['Python', 'Docker', 'SQL', 'React'], min_match=70)
+            assert [(job['url'], job['skill_match_percentage']) for job in matches] == [('https://example.com/1', 100)]
+            weaker = index.search(location='remote', resume_skills=['Python', 'Docker', 'SQL', 'React'], min_match=50)
+            assert [round(job['skill_match_percentage']) for job in weaker] == [100, 67]
+            assert index.skill_facets(location='remote')['Python'] == 2
+            
+            # A new crawl of a URL replaces the old posting in the index
+            store.append([dict(jobs[0], description='Go and Rust')], run_id='run-2')
+            assert index.refresh() == 1 and index.count() == 3
+            assert index.search(skills=['Go'])[0]['url'] == 'https://example.com/1'
+            assert index.search(text='docker') == []
+            
+            resume_path = os.path.join(tmp, 'resume.txt')
+            with open(resume_path, 'w') as f:
+                f.write("Python and Kubernetes on AWS")
+            app = create_app({'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'dashboard.db')}",
+                              'JOB_STORE_PATH': path, 'PIPELINE_RESUME': resume_path, 'SKILLS_THRESHOLD': 0.7,
+                              'RESUME_CACHE_ENABLED': False, 'JOB_INDEX_REFRESH_INTERVAL': 0})
+            client = app.test_client()
+            body = client.get('/api/jobs/search?q=engineer&facets=true').get_json()
+            assert urls(body['items']) == ['https://example.com/2', 'https://example.com/3']
+            assert body['skill_facets']['Python'] == 2
+            body = client.get('/api/jobs/search?match=true').get_json()
+            assert [job['url'] for job in body['items']] == ['https://example.com/2']
+            assert client.get('/api/jobs/search?min_match=x').status_code == 400
+            
+            # Requests only query; new postings are indexed in the background
+            store.append([dict(jobs[1], url='https://example.com/4')], run_id='run-3')
+            assert len(client.get('/api/jobs/search?q=engineer').get_json()['items']) == 2
+            index.start_refresher(0.05)
+            deadline = time.time() + 5
+            while index.count() < 4 and time.time() < deadline:
+                time.sleep(0.05)
+            assert len(client.get('/api/jobs/search?q=engineer').get_json()['items']) == 3
+            with app.app_context():
+                db.engine.dispose()
+            get_job_index(app.extensions['job_search_config']).close()
+            index.close()
+            store.close()
+        print("✓ Job index test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Job index test failed: {e}")
+        return False
+
 def test_skills_analyzer():
     """Test the skills analyzer module."""
     try:
@@ -47,6 +652,191 @@ def test_skills_analyzer():
         print(f"✗ Skills analyzer test failed: {e}")
         return False
 
+def test_skill_matcher():
+    """Test the compiled skill matcher on punctuated names and aliases."""
+    try:
+        from config.settings import load_config
+        from skills_analysis.analyzer import SkillsAnalyzer
+        analyzer = SkillsAnalyzer(load_config())
+        text = ("Backend role: C++ and C# services, Node.js APIs, k8s on AWS, "
+                "postgres. Machine\nlearning a plus. Golang, not Google.")
+        skills = analyzer._extract_skills(text)
+        assert skills == ['C++', 'C#', 'Go', 'PostgreSQL', 'AWS', 'Kubernetes',
+                          'Node.js', 'Machine Learning']
+        assert analyzer._extract_skills("JavaScript only") == ['JavaScript']
+        
+        analyzer.tech_skills = analyzer.tech_skills + ['Terraform']
+        assert analyzer._extract_skills("Terraform modules") == ['Terraform']
+        print("✓ Skill matcher test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Skill matcher test failed: {e}")
+        return False
+
+def test_batch_skill_matching():
+    """Test vectorized scoring of one resume against many jobs."""
+    try:
+        from config.settings import load_config
+        from skills_analysis.analyzer import SkillsAnalyzer
+        analyzer = SkillsAnalyzer(load_config())
+        analyzer._extract_text_from_resume = lambda path: "Python, JavaScript and AWS"
+        jobs = [
+            "Java and Kubernetes",
+            {'title': 'Python Engineer', 'description': 'Python, AWS and Docker'},
+            "Python and JavaScript",
+            "No listed skills"
+        ]
+        batch = analyzer.analyze_batch("resume.txt", jobs)
+        assert batch['resume_skills'] == ['Python', 'JavaScript', 'AWS']
+        ranked = [(r['index'], round(r['skill_match_percentage'])) for r in batch['results']]
+        assert ranked == [(2, 100), (1, 67), (0, 0), (3, 0)]
+        assert batch['results'][1]['missing_skills'] == ['Docker']
+        
+        single = analyzer.analyze_resume("resume.txt", jobs[0])
+        assert single['skill_match_percentage'] == batch['results'][2]['skill_match_percentage']
+        print("✓ Batch skill matching test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Batch skill matching test failed: {e}")
+        return False
+
+def test_lazy_nlp_loading():
+    """Test that spaCy is only loaded when NLP matching is used."""
+    try:
+        import subprocess
+        from types import SimpleNamespace
+        from config.settings import load_config
+        from skills_analysis import analyzer as analyzer_module
+        
+        code = ("import sys; sys.path.insert(0, 'src'); "
+                "from skills_analysis.analyzer import SkillsAnalyzer; "
+                "SkillsAnalyzer({})._extract_skills('Python'); "
+                "print('spacy' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert output.stdout.strip() == 'False'
+        
+        calls = []
+        
+        class FakeNLP:
+            def pipe(self, texts, batch_size):
+                calls.append(batch_size)
+                for text in texts:
+                    yield [SimpleNamespace(lemma_=word.rstrip('s')) for word in text.split()]
+        
+        config = load_config()
+        config['USE_SPACY'] = True
+        config['SPACY_BATCH_SIZE'] = 16
+        key = (config['SPACY_MODEL'], tuple(config['SPACY_EXCLUDE']))
+        analyzer_module._nlp_pipelines[key] = FakeNLP()
+        try:
+            analyzer = analyzer_module.SkillsAnalyzer(config)
+            assert analyzer._extract_skills("Running Dockers") == ['Docker']
+            analyzer._extract_text_from_resume = lambda path: "Docker"
+            batch = analyzer.analyze_batch("resume.txt", ["Dockers", "Reacts"] * 10)
+            assert len(batch['results']) == 20
+            assert calls[-1] == 16
+        finally:
+            del analyzer_module._nlp_pipelines[key]
+        print("✓ Lazy NLP loading test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Lazy NLP loading test failed: {e}")
+        return False
+
+def test_resume_cache():
+    """Test resume extraction and the content-hash resume cache."""
+    try:
+        import tempfile
+        import docx
+        from config.settings import load_config
+        from skills_analysis.analyzer import SkillsAnalyzer
+        from skills_analysis.resume_parser import extract_text, get_resume_cache
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config = load_config()
+            config['RESUME_CACHE_PATH'] = os.path.join(tmp, 'resume_cache.db')
+            analyzer = SkillsAnalyzer(config)
+            parses = []
+            parse = analyzer._extract_text_from_resume
+            analyzer._extract_text_from_resume = lambda path: parses.append(path) or parse(path)
+            
+            resume_path = os.path.join(tmp, 'resume.txt')
+            with open(resume_path, 'w') as f:
+                f.write("Python developer with Docker experience")
+            assert analyzer.analyze_resume(resume_path)['resume_skills'] == ['Python', 'Docker']
+            assert analyzer.analyze_resume(resume_path, "Python and Go")['skill_match_percentage'] == 50
+            assert len(parses) == 1
+            
+            with open(resume_path, 'w') as f:
+                f.write("Rust developer")
+            assert analyzer.analyze_resume(resume_path)['resume_skills'] == ['Rust']
+            assert len(parses) == 2
+            
+            document = docx.Document()
+            document.add_paragraph("Skills: Kubernetes, AWS")
+            docx_path = os.path.join(tmp, 'resume.docx')
+            document.save(docx_path)
+            assert 'Kubernetes' in extract_text(docx_path)
+            
+            # Unsupported or corrupt files are analyzed as an empty resume
+            for name, content in (('resume.doc', b'legacy word file'), ('broken.pdf', b'not a pdf')):
+                path = os.path.join(tmp, name)
+                with open(path, 'wb') as f:
+                    f.write(content)
+                analysis = analyzer.analyze_resume(path, "Python and Go")
+                assert analysis['resume_skills'] == [] and analysis['skill_match_percentage'] == 0
+            get_resume_cache(config).close()
+        print("✓ Resume cache test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Resume cache test failed: {e}")
+        return False
+
+def test_semantic_skill_matching():
+    """Test partial credit from the skill similarity index."""
+    try:
+        import tempfile
+        from config.settings import load_config
+        from skills_analysis.analyzer import SkillsAnalyzer
+        from skills_analysis.similarity import SkillSimilarityIndex
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config = load_config()
+            config['SEMANTIC_MATCHING'] = True
+            config['SIMILARITY_INDEX_PATH'] = os.path.join(tmp, 'skill_index')
+            analyzer = SkillsAnalyzer(config)
+            analyzer._extract_text_from_resume = lambda path: "PostgreSQL and React"
+            
+            analysis = analyzer.analyze_resume("resume.txt", "MySQL and React")
+            assert 50 < analysis['skill_match_percentage'] < 100
+            assert analysis['partial_matches'] == {'MySQL': 'PostgreSQL'}
+            assert analysis['missing_skills'] == ['MySQL']
+            
+            batch = analyzer.analyze_batch("resume.txt", ["MySQL and React", "Kubernetes"])
+            assert batch['results'][0]['skill_match_percentage'] == analysis['skill_match_percentage']
+            assert batch['results'][1]['skill_match_percentage'] == 0
+            
+            # Free-text requirements earn credit from related resume skills
+            job = "Requirements:\n- Experience with relational databases\n- React"
+            analysis = analyzer.analyze_resume("resume.txt", job)
+            assert analysis['partial_matches'] == {'Experience with relational databases': 'PostgreSQL'}
+            assert 50 < analysis['skill_match_percentage'] < 100
+            batch = analyzer.analyze_batch("resume.txt", [job])
+            assert abs(batch['results'][0]['skill_match_percentage'] - analysis['skill_match_percentage']) < 1e-6
+            streamed = next(analyzer.iter_analyze("resume.txt", [job]))
+            assert abs(streamed['skill_match_percentage'] - analysis['skill_match_percentage']) < 1e-6
+            
+            index = SkillSimilarityIndex.load(config['SIMILARITY_INDEX_PATH'])
+            assert index.skills == analyzer.tech_skills
+            assert index.most_similar('PostgreSQL', 1)[0][0] == 'MySQL'
+            del index
+        print("✓ Semantic skill matching test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Semantic skill matching test failed: {e}")
+        return False
+
 def test_application_bot():
     """Test the application bot module."""
     try:
@@ -61,22 +851,717 @@ def test_application_bot():
         print(f"✗ Application bot test failed: {e}")
         return False
 
+def test_application_pool():
+    """Test worker pool ordering, context recycling and crash recovery."""
+    try:
+        from config.settings import load_config
+        from application_bot.pool import ApplicationWorkerPool, NEEDS_CAPTCHA, SUBMITTED
+        
+        class FakeContext:
+            def new_page(self):
+                return self
+            
+            def close(self):
+                pass
+        
+        class FakeSession:
+            def __init__(self, config):
+                pass
+            
+            def start(self):
+                pass
+            
+            def new_context(self):
+                return FakeContext()
+            
+            def stop(self):
+                pass
+        
+        def form_filler(page, application, config):
+            if application['url'].endswith('/3'):
+                raise RuntimeError("page crashed")
+            if application['url'].endswith('/5'):
+                return NEEDS_CAPTCHA
+            return SUBMITTED
+        
+        pool = ApplicationWorkerPool(load_config(), workers=2, recycle_after=2,
+                                     session_factory=FakeSession, form_filler=form_filler)
+        applications = [{'url': f'https://jobs.example.com/{i}', 'resume_path': 'resume.pdf'}
+                        for i in range(8)]
+        results = pool.run(applications)
+        assert [r['url'] for r in results] == [a['url'] for a in applications]
+        # A form stopped by a CAPTCHA is not applied, but its context is kept
+        assert [r['ok'] for r in results].count(False) == 2 and not results[3]['ok']
+        assert not results[5]['ok'] and results[5]['status'] == NEEDS_CAPTCHA
+        assert pool.stats['crashes'] == 1
+        assert pool.stats['contexts'] >= 4
+        
+        # Browser start failures are reported per run, not carried over
+        failure = ['no display']
+        
+        class BrokenSession(FakeSession):
+            def start(self):
+                raise RuntimeError(failure[0])
+        
+        broken = ApplicationWorkerPool(load_config(), workers=2, session_factory=BrokenSession,
+                                       form_filler=form_filler)
+        assert broken.run(applications[:2])[0]['status'] == "Error starting browser: no display"
+        failure[0] = 'out of memory'
+        assert all(r['status'] == "Error starting browser: out of memory" for r in broken.run(applications[:2]))
+        print("✓ Application pool test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Application pool test failed: {e}")
+        return False
+
+def test_adaptive_waits():
+    """Test condition-based waits and per-site timeout learning."""
+    try:
+        import time
+        from config.settings import load_config
+        from application_bot.waits import AdaptiveWaiter
+        
+        config = load_config()
+        waiter = AdaptiveWaiter(config)
+        assert waiter.timeout_for('fast.example.com', 'page_load') == config['APPLY_STEP_TIMEOUT']
+        
+        ready_at = time.perf_counter() + 0.2
+        started = time.perf_counter()
+        result = waiter.wait_for(object(), 'fast.example.com', 'page_load',
+                                 lambda driver: time.perf_counter() >= ready_at and 'ready')
+        assert result == 'ready'
+        assert time.perf_counter() - started < 1.0
+        
+        for _ in range(20):
+            waiter.record('fast.example.com', 'page_load', 0.3)
+            waiter.record('slow.example.com', 'page_load', 6.0)
+        assert waiter.timeout_for('fast.example.com', 'page_load') == config['WAIT_MIN_TIMEOUT']
+        assert waiter.timeout_for('slow.example.com', 'page_load') > 6.0
+        
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        from selenium.common.exceptions import TimeoutException
+        
+        class TimeoutSettingError(Exception):
+            pass
+        
+        for error in (TimeoutError("no confirmation"), TimeoutException("no confirmation"),
+                      PlaywrightTimeoutError("no confirmation"), TimeoutSettingError("not a wait")):
+            try:
+                with waiter.measure('slow.example.com', 'confirmation'):
+                    raise error
+            except Exception:
+                pass
+        report = waiter.report()
+        assert report['slow.example.com']['confirmation']['count'] == 4
+        assert report['slow.example.com']['confirmation']['timeouts'] == 3
+        assert report['fast.example.com']['page_load']['count'] == 21
+        print("✓ Adaptive waits test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Adaptive waits test failed: {e}")
+        return False
+
+def test_form_strategies():
+    """Test site identification and the per-site form strategy cache."""
+    try:
+        import json
+        import tempfile
+        from application_bot.strategies import (FormStrategyCache, PROBE_SCRIPT, identify_site,
+                                                discover_mapping, field_values)
+        
+        assert identify_site('https://boards.greenhouse.io/acme/jobs/1') == 'greenhouse'
+        assert identify_site('https://jobs.lever.co/acme/42') == 'lever'
+        assert identify_site('https://careers.acme.com/apply', '<div id="grnhse_app">') == 'greenhouse'
+        assert identify_site('https://www.acme.com/apply') == 'acme.com'
+        
+        fields = [
+            {'selector': '#first_name', 'tag': 'input', 'type': 'text', 'name': 'first_name',
+             'id': 'first_name', 'label': 'First name', 'placeholder': '', 'text': ''},
+            {'selector': '#last_name', 'tag': 'input', 'type': 'text', 'name': 'last_name',
+             'id': 'last_name', 'label': 'Last name', 'placeholder': '', 'text': ''},
+            {'selector': 'input[name="contact"]', 'tag': 'input', 'type': 'email', 'name': 'contact',
+             'id': '', 'label': 'Email address', 'placeholder': '', 'text': ''},
+            {'selector': '#cv', 'tag': 'input', 'type': 'file', 'name': 'cv',
+             'id': 'cv', 'label': 'CV', 'placeholder': '', 'text': ''},
+            {'selector': '#cover', 'tag': 'input', 'type': 'file', 'name': 'cover',
+             'id': 'cover', 'label': 'Cover letter', 'placeholder': '', 'text': ''},
+            {'selector': '#send', 'tag': 'button', 'type': 'submit', 'name': '',
+             'id': 'send', 'label': '', 'placeholder': '', 'text': 'Apply'}
+        ]
+        mapping = discover_mapping(fields)
+        assert mapping == {'first_name': '#first_name', 'last_name': '#last_name',
+                           'email': 'input[name="contact"]', 'resume': '#cv',
+                           'cover_letter': '#cover', 'submit': '#send'}
+        assert field_values({'full_name': 'Ada Lovelace'})['last_name'] == 'Lovelace'
+        
+        # A bare 'name' hint only matches a whole attribute
+        def text_field(name, label):
+            return {'selector': f'#{name}', 'tag': 'input', 'type': 'text', 'name': name,
+                    'id': name, 'label': label, 'placeholder': '', 'text': ''}
+        named = discover_mapping([text_field('company_name', 'Company name'), text_field('username', 'Username'),
+                                  text_field('name', 'Name *')])
+        assert named == {'full_name': '#name', 'submit': 'button[type="submit"], input[type="submit"]'}
+        
+        class FakePage:
+            def __init__(self):
+                self.probes = 0
+                self.selectors = {field['selector'] for field in fields}
+            
+            def evaluate(self, script, arg=None):
+                if script == PROBE_SCRIPT:
+                    self.probes += 1
+                    return [field for field in fields if field['selector'] in self.selectors]
+                if not all(selector in self.selectors for selector in arg):
+                    return None
+                return [field for field in fields
+                        if field['selector'] in self.selectors and field['selector'] not in arg]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'strategies.json')
+            page = FakePage()
+            cache = FormStrategyCache(path)
+            assert cache.resolve(page, 'greenhouse') == mapping
+            assert cache.resolve(page, 'greenhouse') == mapping
+            assert page.probes == 1
+            assert not os.path.exists(path)
+            cache.save()
+            
+            # A persisted strategy is reused until the form changes
+            reloaded = FormStrategyCache(path)
+            assert reloaded.resolve(page, 'greenhouse') == mapping
+            page.selectors.discard('#cover')
+            assert 'cover_letter' not in reloaded.resolve(page, 'greenhouse')
+            assert page.probes == 2
+            assert reloaded.stats('greenhouse') == {'hits': 2, 'probes': 2}
+            
+            # Another company's form on the same ATS adds a phone field
+            fields.append({'selector': '#tel', 'tag': 'input', 'type': 'tel', 'name': 'tel',
+                           'id': 'tel', 'label': 'Phone', 'placeholder': '', 'text': ''})
+            page.selectors.add('#tel')
+            assert reloaded.resolve(page, 'greenhouse')['phone'] == '#tel'
+            assert reloaded.resolve(page, 'greenhouse')['phone'] == '#tel'
+            assert reloaded.stats('greenhouse') == {'hits': 3, 'probes': 3}
+            
+            # Short hints only match as whole words
+            assert discover_mapping([text_field('hotel', 'Preferred hotel'), text_field('cvv', 'Card CVV')]) == {
+                'submit': 'button[type="submit"], input[type="submit"]'}
+            
+            # Concurrent saves replace the file whole instead of interleaving
+            from concurrent.futures import ThreadPoolExecutor
+            for number in range(200):
+                reloaded._strategies[f'site-{number}'] = {'mapping': mapping, 'hits': number, 'probes': 1}
+            reloaded._dirty = True
+            with ThreadPoolExecutor(8) as executor:
+                list(executor.map(lambda _: reloaded.save(), range(16)))
+            with open(path) as f:
+                assert len(json.load(f)) == 201
+            assert os.listdir(tmp) == ['strategies.json']
+        print("✓ Form strategies test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Form strategies test failed: {e}")
+        return False
+
+def test_application_form_fixture():
+    """Test a real headless browser against the local application form."""
+    from pathlib import Path
+    from config.settings import load_config
+    from application_bot.pool import ApplicationWorkerPool
+    
+    reason = browser_unavailable()
+    if reason:
+        return skip("Application form fixture", reason)
+    
+    # Failures raise, so pytest reports them instead of a swallowed False
+    fixture = Path(__file__).resolve().parent / 'fixtures' / 'application_form.html'
+    with tempfile.TemporaryDirectory() as tmp:
+        resume_path = os.path.join(tmp, 'resume.pdf')
+        with open(resume_path, 'wb') as f:
+            f.write(b'%PDF-1.4 test resume')
+        pool = ApplicationWorkerPool(load_config(), workers=1)
+        results = pool.run([{
+            'url': fixture.as_uri(),
+            'resume_path': resume_path,
+            'fields': {'full_name': 'Ada Lovelace', 'email': 'ada@example.com'}
+        }])
+    assert results[0]['ok'], results[0]['status']
+    assert results[0]['status'] == "Application submitted successfully"
+    print("✓ Application form fixture test passed")
+    return True
+
+def test_task_queue():
+    """Test idempotent tasks, retries with backoff and lease recovery."""
+    try:
+        import tempfile
+        import time
+        from pipeline.tasks import TaskQueue
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = TaskQueue(os.path.join(tmp, 'pipeline.db'), lease_seconds=0.2, max_attempts=2, backoff=0.1)
+            assert queue.enqueue('search', 'python|Berlin', {'title': 'python'})
+            assert not queue.enqueue('search', 'python|Berlin', {'title': 'python'})
+            
+            task = queue.claim('search', 'worker-1')
+            assert task['payload'] == {'title': 'python'} and task['attempts'] == 1
+            assert queue.claim('search', 'worker-2') is None
+            
+            # A crashed worker's lease expires and the task is handed out again
+            time.sleep(0.25)
+            assert queue.recover() == 1
+            task = queue.claim('search', 'worker-2')
+            assert task['attempts'] == 2
+            # The stale worker can no longer complete or fail it
+            assert not queue.complete(task['id'], 'worker-1', 'dedup', [('stale', {})])
+            assert queue.fail(task['id'], 'worker-1', 'boom') is None
+            assert queue.complete(task['id'], 'worker-2', 'dedup', [('a', {}), ('a', {}), ('b', {})])
+            assert queue.counts() == {'search': {'done': 1}, 'dedup': {'pending': 2}}
+            assert queue.fail(task['id'] + 100, 'worker-2', 'boom') is None
+            
+            # A failed attempt is retried after the backoff, until max_attempts
+            task = queue.claim('dedup', 'worker-1')
+            assert queue.fail(task['id'], 'worker-1', 'boom') == 'pending'
+            other = queue.claim('dedup', 'worker-1')
+            assert queue.complete(other['id'], 'worker-1')
+            assert queue.claim('dedup', 'worker-1') is None
+            time.sleep(0.15)
+            assert queue.claim('dedup', 'worker-1')['key'] == task['key']
+            assert queue.fail(task['id'], 'worker-1', 'boom again') == 'failed'
+            assert queue.get('dedup', task['key'])['status'] == 'failed'
+            
+            # Non-retryable failures and workers dying on the last attempt end the task
+            queue.enqueue('apply', 'job-1', {})
+            queue.enqueue('apply', 'job-2', {})
+            first = queue.claim('apply', 'worker-1')
+            assert queue.fail(first['id'], 'worker-1', 'submitted', retry=False) == 'failed'
+            second = queue.claim('apply', 'worker-1')
+            time.sleep(0.25)
+            assert queue.claim('apply', 'worker-2')['id'] == second['id']
+            time.sleep(0.25)
+            assert queue.claim('apply', 'worker-3') is None
+            assert queue.get('apply', second['key'])['status'] == 'failed'
+            queue.close()
+        print("✓ Task queue test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Task queue test failed: {e}")
+        return False
+
+def test_parallel_analysis():
+    """Test skill analysis on a process pool against the in-process results."""
+    try:
+        import tempfile
+        from skills_analysis.analyzer import SkillsAnalyzer
+        from skills_analysis.parallel import SkillAnalysisPool
+        
+        skills = ['Python', 'Docker', 'AWS', 'React', 'SQL', 'Kubernetes', 'Go']
+        jobs = [{'title': f"Engineer {n}", 'description': f"We use {skills[n % 7]} and {skills[n * 3 % 7]}, k8s {n}"}
+                for n in range(600)]
+        with tempfile.TemporaryDirectory() as tmp:
+            resume_path = os.path.join(tmp, 'resume.txt')
+            with open(resume_path, 'w') as f:
+                f.write("Python developer with Docker and SQL")
+            serial = SkillsAnalyzer({'RESUME_CACHE_ENABLED': False})
+            parallel = SkillsAnalyzer({'RESUME_CACHE_ENABLED': False, 'ANALYSIS_WORKERS': 2,
+                                       'ANALYSIS_CHUNK_SIZE': 50})
+            
+            # Results stream back in input order and match the single-process scores
+            streamed = list(parallel.iter_analyze(resume_path, iter(jobs)))
+            assert streamed == list(serial.iter_analyze(resume_path, jobs))
+            assert [result['index'] for result in streamed] == list(range(600))
+            # Later batches reuse the running workers
+            pool = parallel._pool
+            assert parallel.analyze_batch(resume_path, jobs) == serial.analyze_batch(resume_path, jobs)
+            assert parallel._pool is pool
+            parallel.close()
+            first = serial.analyze_resume(resume_path, serial._job_text(jobs[0]))
+            assert streamed[0]['skill_match_percentage'] == first['skill_match_percentage']
+            
+            with SkillAnalysisPool(serial, workers=2, chunk_size=7) as pool:
+                extracted = list(pool.extract_skills(jobs[:20]))
+            assert extracted == [serial._extract_skills(serial._job_text(job)) for job in jobs[:20]]
+        print("✓ Parallel analysis test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Parallel analysis test failed: {e}")
+        return False
+
+def test_pipeline_daemon():
+    """Test that the daemon carries jobs through every pipeline stage."""
+    try:
+        import tempfile
+        from config.settings import load_config
+        from pipeline.daemon import PermanentTaskError, PipelineDaemon
+        from pipeline.tasks import TaskQueue
+        
+        config = load_config()
+        config['SEARCH_TITLES'] = ['python developer']
+        config['PIPELINE_POLL_INTERVAL'] = 0.01
+        applied = []
+        flaky = {'calls': 0}
+        
+        def search(task):
+            return [(f"test:{n}", {'title': f"Job {n}", 'company': f"Company {n}",
+                                   'url': f"https://example.com/{n}"}) for n in range(5)]
+        
+        def analyze(task):
+            flaky['calls'] += 1
+            if flaky['calls'] == 1:
+                raise RuntimeError("temporary failure")
+            return [(task['payload']['url'], task['payload'])]
+        
+        def apply(task):
+            applied.append(task['payload']['url'])
+            if task['payload']['url'].endswith('/4'):
+                raise PermanentTaskError("failed after submitting")
+            return []
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config['DEDUP_PATH'] = os.path.join(tmp, 'dedup.db')
+            queue = TaskQueue(os.path.join(tmp, 'pipeline.db'), backoff=0.01)
+            daemon = PipelineDaemon(config, queue=queue,
+                                    handlers={'search': search, 'analyze': analyze, 'apply': apply},
+                                    workers={'search': 1, 'dedup': 2, 'analyze': 2, 'apply': 2})
+            assert daemon.schedule_searches() == 1
+            assert daemon.schedule_searches() == 0
+            counts = daemon.drain(timeout=10)
+            queue.close()
+        
+        # The application that failed after submitting is not sent again
+        assert sorted(applied) == [f"https://example.com/{n}" for n in range(5)]
+        assert counts['apply'] == {'done': 4, 'failed': 1}
+        assert flaky['calls'] == 6
+        print("✓ Pipeline daemon test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Pipeline daemon test failed: {e}")
+        return False
+
+def test_dashboard_applications_api():
+    """Test cursor pagination and filtering of /api/applications."""
+    try:
+        import tempfile
+        from datetime import datetime, timedelta
+        from dashboard.app import create_app
+        from dashboard.models import db, JobApplication
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'dashboard.db')}"})
+            with app.app_context():
+                for n in range(7):
+                    db.session.add(JobApplication(
+                        job_title=f"Job {n}", company='Acme' if n % 2 else 'Globex',
+                        status='interview' if n in (2, 5) else 'applied',
+                        date_applied=datetime(2024, 1, 1) + timedelta(days=n)
+                    ))
+                db.session.commit()
+                assert db.session.execute(db.text('PRAGMA journal_mode')).scalar() == 'wal'
+            
+            client = app.test_client()
+            ids, cursor = [], None
+            while True:
+                page = client.get('/api/applications', query_string={'limit': 3, 'cursor': cursor}).get_json()
+                ids.extend(item['id'] for item in page['items'])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+            assert ids == [7, 6, 5, 4, 3, 2, 1]
+            
+            page = client.get('/api/applications?status=interview&order=asc').get_json()
+            assert [item['job_title'] for item in page['items']] == ['Job 2', 'Job 5']
+            page = client.get('/api/applications?company=Acme&date_from=2024-01-03&date_to=2024-01-06').get_json()
+            assert [item['job_title'] for item in page['items']] == ['Job 5', 'Job 3']
+            page = client.get('/api/applications?sort=company&order=asc&limit=4').get_json()
+            assert [item['company'] for item in page['items']] == ['Acme', 'Acme', 'Acme', 'Globex']
+            page = client.get('/api/applications', query_string={'sort': 'company', 'order': 'asc',
+                                                                  'cursor': page['next_cursor']}).get_json()
+            assert len(page['items']) == 3 and page['next_cursor'] is None
+            assert client.get('/api/applications?sort=salary').status_code == 400
+            from dashboard.app import encode_cursor
+            for bad in ('not-base64!', encode_cursor([1, 2, 3]), encode_cursor('x'), encode_cursor({'a': 1, 'b': 2}),
+                        encode_cursor([5, 'x'])):
+                assert client.get('/api/applications', query_string={'cursor': bad}).status_code == 400
+            # Cursor values must have the type of the sort column
+            for sort, bad in (('company', [5, 1]), ('status', [None, 1]), ('id', ['7', 1]), ('id', [True, 1]),
+                              ('company', ['Acme', False])):
+                response = client.get('/api/applications', query_string={'sort': sort, 'cursor': encode_cursor(bad)})
+                assert response.status_code == 400
+            with app.app_context():
+                db.engine.dispose()
+            
+            # Under gunicorn the master builds no app; each worker builds one when loaded
+            import types
+            import dashboard.app as dashboard_app
+            built = []
+            
+            class FakeApplication:
+                def __init__(self):
+                    self.cfg = types.SimpleNamespace(set=lambda key, value: None)
+                
+                def run(self):
+                    self.load_config()
+                    assert not built
+                    assert self.load() == 'worker app'
+            
+            gunicorn = types.ModuleType('gunicorn.app.base')
+            gunicorn.BaseApplication = FakeApplication
+            create_app = dashboard_app.create_app
+            dashboard_app.create_app = lambda config: built.append(config) or 'worker app'
+            sys.modules['gunicorn.app.base'] = gunicorn
+            try:
+                dashboard_app.run_dashboard({'DASHBOARD_WORKER_CLASS': 'gthread'})
+            finally:
+                dashboard_app.create_app = create_app
+                del sys.modules['gunicorn.app.base']
+            assert len(built) == 1
+        print("✓ Dashboard applications API test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Dashboard applications API test failed: {e}")
+        return False
+
+def test_dashboard_stats_rollups():
+    """Test incremental stats rollups, backfill and ETag caching."""
+    try:
+        import tempfile
+        from datetime import datetime
+        from dashboard.app import create_app
+        from dashboard.models import db, JobApplication, ApplicationRollup
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'dashboard.db')}", 'STATS_CACHE_TTL': 60}
+            app = create_app(config)
+            client = app.test_client()
+            with app.app_context():
+                first = JobApplication(job_title='Data Engineer', company='Acme', status='applied',
+                                       date_applied=datetime.now(), source='linkedin', skill_match=82.0)
+                second = JobApplication(job_title='Analyst', company='Globex', status='applied',
+                                        date_applied=datetime.now(), skill_match=40.0)
+                db.session.add_all([first, second])
+                db.session.commit()
+                
+                stats = client.get('/api/stats')
+                assert stats.get_json()['by_status'] == {'applied': 2}
+                assert client.get('/api/stats', headers={'If-None-Match': stats.headers['ETag']}).status_code == 304
+                
+                # Equivalent queries share one entry, and the cache stays bounded
+                cache = app.extensions['stats_cache']
+                assert client.get('/api/stats?days=30&x=1').headers['ETag'] == stats.headers['ETag']
+                assert client.get('/api/stats?days=0').status_code == 400
+                for days in range(1, 50):
+                    client.get(f'/api/stats?days={days}')
+                assert len(cache._entries) == 32
+                
+                first.status = 'interview'
+                db.session.commit()
+                db.session.delete(second)
+                db.session.commit()
+            
+            data = client.get('/api/stats').get_json()
+            assert data['total_applications'] == 1
+            assert data['by_status'] == {'interview': 1}
+            assert data['by_source'] == {'linkedin': 1}
+            assert data['by_skill_match'] == {'75-100': 1}
+            assert data['daily'][0]['count'] == 1
+            
+            # Rollups are rebuilt for a database that has applications but none
+            with app.app_context():
+                db.session.execute(ApplicationRollup.__table__.delete())
+                db.session.commit()
+                db.engine.dispose()
+            restarted = create_app(config)
+            assert restarted.test_client().get('/api/stats').get_json()['by_company'] == {'Acme': 1}
+            with restarted.app_context():
+                db.engine.dispose()
+        print("✓ Dashboard stats rollups test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Dashboard stats rollups test failed: {e}")
+        return False
+
+def test_dashboard_events():
+    """Test the Server-Sent Events stream of application changes."""
+    try:
+        import json
+        import tempfile
+        from datetime import datetime
+        from dashboard.app import create_app
+        from dashboard.models import db, JobApplication
+        
+        def next_event(chunks):
+            for chunk in chunks:
+                chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+                if chunk.startswith('id:'):
+                    fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+                    return fields['event'], json.loads(fields['data']), int(fields['id'])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            database_url = f"sqlite:///{os.path.join(tmp, 'dashboard.db')}"
+            app = create_app({'DATABASE_URL': database_url, 'SSE_POLL_INTERVAL': 0.05, 'SSE_HEARTBEAT': 0.1})
+            broadcaster = app.extensions['event_broadcaster']
+            client = app.test_client()
+            response = client.get('/api/events', buffered=False)
+            assert response.mimetype == 'text/event-stream'
+            chunks = iter(response.response)
+            
+            # Hundreds of clients share one poller
+            others = [broadcaster.subscribe() for _ in range(300)]
+            with app.app_context():
+                application = JobApplication(job_title='Data Engineer', company='Acme', status='applied',
+                                             date_applied=datetime.now(), source='linkedin')
+                db.session.add(application)
+                db.session.commit()
+                application.status = 'interview'
+                db.session.commit()
+            
+            kind, data, first_id = next_event(chunks)
+            assert kind == 'created' and data['company'] == 'Acme'
+            kind, data, _ = next_event(chunks)
+            assert kind == 'updated' and data == {'id': 1, 'status': 'interview'}
+            assert all(subscriber.queue.qsize() == 2 for subscriber in others)
+            
+            # Applications recorded by the pipeline daemon reach the stream through the log
+            from dashboard.recorder import record_application
+            record_application({'DATABASE_URL': database_url},
+                               {'title': 'SRE', 'company': 'Globex', 'url': 'https://example.com/sre'},
+                               skill_match=80.0)
+            kind, data, _ = next_event(chunks)
+            assert kind == 'created' and data['company'] == 'Globex' and data['skill_match'] == 80.0
+            response.close()
+            for subscriber in others:
+                broadcaster.unsubscribe(subscriber)
+            
+            # A reconnecting client replays what it missed
+            replay = client.get('/api/events', headers={'Last-Event-ID': str(first_id)}, buffered=False)
+            kind, data, _ = next_event(iter(replay.response))
+            assert kind == 'updated' and data['status'] == 'interview'
+            replay.close()
+            
+            # The poller stops once the last client has gone, and on close
+            thread = broadcaster._thread
+            thread.join(timeout=2)
+            assert not thread.is_alive() and broadcaster._thread is None
+            subscriber = broadcaster.subscribe()
+            broadcaster.close()
+            assert subscriber.disconnected and broadcaster._thread is None
+            with app.app_context():
+                db.engine.dispose()
+        print("✓ Dashboard events test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Dashboard events test failed: {e}")
+        return False
+
+def test_metrics():
+    """Test spans, counters, the /metrics endpoint and run profiling."""
+    try:
+        import tempfile
+        from dashboard.app import create_app
+        from dashboard.models import db
+        from skills_analysis.analyzer import SkillsAnalyzer
+        from utils import metrics
+        
+        # Disabled metrics hand out one shared no-op span
+        assert metrics.configure({'METRICS_ENABLED': False}) is None
+        assert metrics.span('skill_extraction') is metrics.span('job_scrape', source='indeed')
+        metrics.increment('jobs_scraped_total', 5, source='indeed')
+        assert metrics.render_prometheus() == ''
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {'METRICS_ENABLED': True, 'METRICS_PATH': os.path.join(tmp, 'metrics.db'),
+                      'METRICS_FLUSH_INTERVAL': 0, 'PROFILER': 'cprofile', 'PROFILE_DIR': tmp,
+                      'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'dashboard.db')}"}
+            registry = metrics.configure(config)
+            assert registry is not None and metrics.configure(config) is registry
+            
+            with metrics.profile_run(config, 'test'):
+                SkillsAnalyzer({})._extract_skills("Python and Docker")
+            assert any(name.startswith('test-') and name.endswith('.prof') for name in os.listdir(tmp))
+            try:
+                with metrics.span('resume_parse', format='pdf'):
+                    raise ValueError("corrupt file")
+            except ValueError:
+                pass
+            metrics.increment('jobs_scraped_total', 5, source='indeed')
+            
+            # A forked child starts from an empty registry, while the parent keeps its own
+            if hasattr(os, 'fork'):
+                process = registry.process
+                pid = os.fork()
+                if pid == 0:
+                    os._exit(0 if not registry.snapshot()['counters'] and registry.process != process else 1)
+                assert os.waitpid(pid, 0)[1] == 0
+            
+            # Another process's flushed snapshot is merged into the export
+            other = metrics.MetricsRegistry(config['METRICS_PATH'], flush_interval=0)
+            other.increment('jobs_scraped_total', 3, {'source': 'indeed'})
+            other.close()
+            
+            app = create_app(config)
+            response = app.test_client().get('/metrics')
+            text = response.get_data(as_text=True)
+            assert response.status_code == 200
+            assert 'skill_extraction_seconds_count 1' in text
+            assert 'skill_extraction_seconds_bucket{le="+Inf"} 1' in text
+            assert 'resume_parse_errors_total{format="pdf"} 1' in text
+            assert 'jobs_scraped_total{source="indeed"} 8' in text
+            assert 'db_query_seconds_count{database="dashboard",operation="SELECT"}' in text
+            with app.app_context():
+                db.engine.dispose()
+            
+            metrics.configure({'METRICS_ENABLED': False})
+            assert app.test_client().get('/metrics').status_code == 404
+        print("✓ Metrics test passed")
+        return True
+    except Exception as e:
+        print(f"✗ Metrics test failed: {e}")
+        return False
+
 def run_all_tests():
     """Run all tests and report results."""
     print("Running tests for Automated Job Search System...\n")
     
     tests = [
         test_config_loading,
+        test_lazy_startup,
         test_job_aggregator,
+        test_concurrent_job_search,
+        test_connector_registry,
+        test_streaming_job_search,
+        test_page_cache,
+        test_job_deduplication,
+        test_rate_limiter,
+        test_job_store,
+        test_job_index,
         test_skills_analyzer,
-        test_application_bot
+        test_skill_matcher,
+        test_batch_skill_matching,
+        test_lazy_nlp_loading,
+        test_resume_cache,
+        test_semantic_skill_matching,
+        test_application_bot,
+        test_application_pool,
+        test_adaptive_waits,
+        test_form_strategies,
+        test_application_form_fixture,
+        test_task_queue,
+        test_parallel_analysis,
+        test_pipeline_daemon,
+        test_dashboard_applications_api,
+        test_dashboard_stats_rollups,
+        test_dashboard_events,
+        test_metrics
     ]
     
     passed = 0
     total = len(tests)
     
     for test in tests:
-        if test():
+        try:
+            ok = test()
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            ok = False
+        if ok:
             passed += 1
     
     print(f"\nTests completed: {passed}/{total} passed")